@@ -1,5 +1,9 @@
 """
 This module gathers the most important classes and helper functions used for scripting.
+
+To reduce the startup time, the objects exported by this module are imported lazily
+i.e. the module in which an object is defined is imported only when the object
+is accessed for the first time (e.g. ``abilab.GsrFile``).
 """
 from __future__ import print_function, division, unicode_literals
 
@@ -12,61 +16,70 @@ import collections
 ####################
 from monty.os.path import which
 
-#######################
-### Pymatgen import ###
-#######################
-# Tools for unit conversion
-import pymatgen.core.units as units
-FloatWithUnit = units.FloatWithUnit
-ArrayWithUnit = units.ArrayWithUnit
-
 ####################
 ### Abipy import ###
 ####################
-from abipy.flowtk import Pseudo, PseudoTable, Mrgscr, Mrgddb, Mrggkk, Flow, Work, TaskManager, AbinitBuild, flow_main
 from abipy.core.release import __version__, min_abinit_version
 from abipy.core.globals import enable_notebook, in_notebook, disable_notebook
-from abipy.core import restapi
-from abipy.core.structure import (Lattice, Structure, StructureModifier, dataframes_from_structures,
-  mp_match_structure, mp_search, cod_search)
-from abipy.core.mixins import CubeFile
-from abipy.core.func1d import Function1D
-from abipy.core.kpoints import set_atol_kdiff
-from abipy.abio.robots import Robot
-from abipy.abio.inputs import AbinitInput, MultiDataset, AnaddbInput, OpticInput
-from abipy.abio.abivars import AbinitInputFile
-from abipy.abio.outputs import AbinitLogFile, AbinitOutputFile, OutNcFile, AboRobot #, CubeFile
-#from abipy.tools.plotting import DirTreePlotter
-from abipy.tools.printing import print_dataframe
-from abipy.tools.notebooks import print_source
-from abipy.abio.factories import *
-from abipy.electrons.ebands import (ElectronBands, ElectronBandsPlotter, ElectronDos, ElectronDosPlotter,
-    dataframe_from_ebands)
-from abipy.electrons.gsr import GsrFile, GsrRobot
-from abipy.electrons.psps import PspsFile
-from abipy.electrons.ddk import DdkFile
-from abipy.electrons.gw import SigresFile, SigresPlotter, SigresRobot
-from abipy.electrons.bse import MdfFile, MdfRobot
-from abipy.electrons.scissors import ScissorsBuilder
-from abipy.electrons.scr import ScrFile
-from abipy.electrons.denpot import (DensityNcFile, VhartreeNcFile, VxcNcFile, VhxcNcFile, PotNcFile,
-    DensityFortranFile, Cut3dDenPotNcFile)
-from abipy.electrons.fatbands import FatBandsFile
-from abipy.electrons.optic import OpticNcFile, OpticRobot
-from abipy.electrons.fold2bloch import Fold2BlochNcfile
-from abipy.dfpt.phonons import (PhbstFile, PhbstRobot, PhononBands, PhononBandsPlotter, PhdosFile, PhononDosPlotter,
-    PhdosReader, phbands_gridplot)
-from abipy.dfpt.ddb import DdbFile, DdbRobot
-from abipy.dfpt.anaddbnc import AnaddbNcFile
-from abipy.dfpt.gruneisen import GrunsNcFile
-from abipy.dynamics.hist import HistFile, HistRobot
-from abipy.waves import WfkFile
-# TODO Change name. A2f?
-from abipy.eph.eph import EphFile, EphRobot
-from abipy.eph.sigeph import SigEPhFile, SigEPhRobot
-
-# Abinit Documentation.
-from abipy.abio.abivars_db import get_abinit_variables, abinit_help, docvar
+from abipy.core.lazyimport import import_object, install_lazy_imports
+
+# Objects imported on demand: module --> names defined in the module.
+# If the name is equal to the last part of the module, the module itself is exported.
+_LAZY_IMPORTS = collections.OrderedDict([
+    # Tools for unit conversion
+    ("pymatgen.core.units", ["units", "FloatWithUnit", "ArrayWithUnit"]),
+    ("abipy.flowtk", ["Pseudo", "PseudoTable", "Mrgscr", "Mrgddb", "Mrggkk", "Flow", "Work", "TaskManager",
+                      "AbinitBuild", "flow_main"]),
+    ("abipy.core.restapi", ["restapi"]),
+    ("abipy.core.structure", ["Lattice", "Structure", "StructureModifier", "dataframes_from_structures",
+                              "mp_match_structure", "mp_search", "cod_search"]),
+    ("abipy.core.mixins", ["CubeFile"]),
+    ("abipy.core.func1d", ["Function1D"]),
+    ("abipy.core.kpoints", ["set_atol_kdiff"]),
+    ("abipy.abio.robots", ["Robot", "RobotIndex"]),
+    ("abipy.abio.inputs", ["AbinitInput", "MultiDataset", "AnaddbInput", "OpticInput"]),
+    ("abipy.abio.abivars", ["AbinitInputFile"]),
+    ("abipy.abio.outputs", ["AbinitLogFile", "AbinitOutputFile", "OutNcFile", "AboRobot"]),
+    ("abipy.tools.printing", ["print_dataframe"]),
+    ("abipy.tools.notebooks", ["print_source"]),
+    ("abipy.abio.factories", ["gs_input", "ebands_input", "phonons_from_gsinput", "g0w0_with_ppmodel_inputs",
+                              "g0w0_convergence_inputs", "bse_with_mdf_inputs", "ion_ioncell_relax_input",
+                              "ion_ioncell_relax_and_ebands_input", "scf_phonons_inputs",
+                              "piezo_elastic_inputs_from_gsinput", "scf_piezo_elastic_inputs", "scf_for_phonons",
+                              "dte_from_gsinput"]),
+    ("abipy.electrons.ebands", ["ElectronBands", "ElectronBandsPlotter", "ElectronDos", "ElectronDosPlotter",
+                                "dataframe_from_ebands"]),
+    ("abipy.electrons.gsr", ["GsrFile", "GsrRobot"]),
+    ("abipy.electrons.psps", ["PspsFile"]),
+    ("abipy.electrons.ddk", ["DdkFile"]),
+    ("abipy.electrons.gw", ["SigresFile", "SigresPlotter", "SigresRobot"]),
+    ("abipy.electrons.bse", ["MdfFile", "MdfRobot"]),
+    ("abipy.electrons.scissors", ["ScissorsBuilder"]),
+    ("abipy.electrons.scr", ["ScrFile"]),
+    ("abipy.electrons.denpot", ["DensityNcFile", "VhartreeNcFile", "VxcNcFile", "VhxcNcFile", "PotNcFile",
+                                "DensityFortranFile", "Cut3dDenPotNcFile"]),
+    ("abipy.electrons.fatbands", ["FatBandsFile"]),
+    ("abipy.electrons.optic", ["OpticNcFile", "OpticRobot"]),
+    ("abipy.electrons.fold2bloch", ["Fold2BlochNcfile"]),
+    ("abipy.dfpt.phonons", ["PhbstFile", "PhbstRobot", "PhononBands", "PhononBandsPlotter", "PhdosFile",
+                            "PhononDosPlotter", "PhdosReader", "phbands_gridplot"]),
+    ("abipy.dfpt.ddb", ["DdbFile", "DdbRobot", "merge_ddb_files"]),
+    ("abipy.dfpt.anaddbnc", ["AnaddbNcFile"]),
+    ("abipy.dfpt.gruneisen", ["GrunsNcFile"]),
+    ("abipy.dynamics.hist", ["HistFile", "HistRobot"]),
+    ("abipy.waves", ["WfkFile"]),
+    # TODO Change name. A2f?
+    ("abipy.eph.eph", ["EphFile", "EphRobot"]),
+    ("abipy.eph.sigeph", ["SigEPhFile", "SigEPhRobot"]),
+    # Abinit Documentation.
+    ("abipy.abio.abivars_db", ["get_abinit_variables", "abinit_help", "docvar"]),
+])
+
+def get_robot_classes():
+    """Return list with all the Robot subclasses exported by abilab. Import the modules if needed."""
+    this = sys.modules[__name__]
+    names = sorted(name for names in _LAZY_IMPORTS.values() for name in names)
+    return [getattr(this, name) for name in names if name.endswith("Robot") and name != "Robot"]
 
 
 def _straceback():
@@ -75,50 +88,51 @@ def _straceback():
     return traceback.format_exc()
 
 # Abinit text files. Use OrderedDict for nice output in show_abiopen_exc2class.
+# Classes are specified with "module:name" strings and imported only when needed.
 ext2file = collections.OrderedDict([
-    (".abi", AbinitInputFile),
-    (".in", AbinitInputFile),
-    (".abo", AbinitOutputFile),
-    (".out", AbinitOutputFile),
-    (".log", AbinitLogFile),
-    (".cif", Structure),
-    ("POSCAR", Structure),
-    (".cssr", Structure),
-    (".cube", CubeFile),
-    ("anaddb.nc", AnaddbNcFile),
-    ("DEN", DensityFortranFile),
-    (".psp8", Pseudo),
-    (".pspnc", Pseudo),
-    (".fhi", Pseudo),
-    ("JTH.xml", Pseudo),
+    (".abi", "abipy.abio.abivars:AbinitInputFile"),
+    (".in", "abipy.abio.abivars:AbinitInputFile"),
+    (".abo", "abipy.abio.outputs:AbinitOutputFile"),
+    (".out", "abipy.abio.outputs:AbinitOutputFile"),
+    (".log", "abipy.abio.outputs:AbinitLogFile"),
+    (".cif", "abipy.core.structure:Structure"),
+    ("POSCAR", "abipy.core.structure:Structure"),
+    (".cssr", "abipy.core.structure:Structure"),
+    (".cube", "abipy.core.mixins:CubeFile"),
+    ("anaddb.nc", "abipy.dfpt.anaddbnc:AnaddbNcFile"),
+    ("DEN", "abipy.electrons.denpot:DensityFortranFile"),
+    (".psp8", "abipy.flowtk:Pseudo"),
+    (".pspnc", "abipy.flowtk:Pseudo"),
+    (".fhi", "abipy.flowtk:Pseudo"),
+    ("JTH.xml", "abipy.flowtk:Pseudo"),
 ])
 
 # Abinit files require a special treatment.
 abiext2ncfile = collections.OrderedDict([
-    ("GSR.nc", GsrFile),
-    ("DEN.nc", DensityNcFile),
-    ("OUT.nc", OutNcFile),
-    ("DDK.nc", DdkFile),
-    ("VHA.nc", VhartreeNcFile),
-    ("VXC.nc", VxcNcFile),
-    ("VHXC.nc", VhxcNcFile),
-    ("POT.nc", PotNcFile),
-    ("WFK.nc", WfkFile),
-    ("HIST.nc", HistFile),
-    ("PSPS.nc", PspsFile),
-    ("DDB", DdbFile),
-    ("PHBST.nc", PhbstFile),
-    ("PHDOS.nc", PhdosFile),
-    ("SCR.nc", ScrFile),
-    ("SIGRES.nc", SigresFile),
-    ("GRUNS.nc", GrunsNcFile),
-    ("MDF.nc", MdfFile),
-    ("FATBANDS.nc", FatBandsFile),
-    ("FOLD2BLOCH.nc", Fold2BlochNcfile),
-    ("CUT3DDENPOT.nc", Cut3dDenPotNcFile),
-    ("OPTIC.nc", OpticNcFile),
-    ("EPH.nc", EphFile),
-    ("SIGEPH.nc", SigEPhFile),
+    ("GSR.nc", "abipy.electrons.gsr:GsrFile"),
+    ("DEN.nc", "abipy.electrons.denpot:DensityNcFile"),
+    ("OUT.nc", "abipy.abio.outputs:OutNcFile"),
+    ("DDK.nc", "abipy.electrons.ddk:DdkFile"),
+    ("VHA.nc", "abipy.electrons.denpot:VhartreeNcFile"),
+    ("VXC.nc", "abipy.electrons.denpot:VxcNcFile"),
+    ("VHXC.nc", "abipy.electrons.denpot:VhxcNcFile"),
+    ("POT.nc", "abipy.electrons.denpot:PotNcFile"),
+    ("WFK.nc", "abipy.waves:WfkFile"),
+    ("HIST.nc", "abipy.dynamics.hist:HistFile"),
+    ("PSPS.nc", "abipy.electrons.psps:PspsFile"),
+    ("DDB", "abipy.dfpt.ddb:DdbFile"),
+    ("PHBST.nc", "abipy.dfpt.phonons:PhbstFile"),
+    ("PHDOS.nc", "abipy.dfpt.phonons:PhdosFile"),
+    ("SCR.nc", "abipy.electrons.scr:ScrFile"),
+    ("SIGRES.nc", "abipy.electrons.gw:SigresFile"),
+    ("GRUNS.nc", "abipy.dfpt.gruneisen:GrunsNcFile"),
+    ("MDF.nc", "abipy.electrons.bse:MdfFile"),
+    ("FATBANDS.nc", "abipy.electrons.fatbands:FatBandsFile"),
+    ("FOLD2BLOCH.nc", "abipy.electrons.fold2bloch:Fold2BlochNcfile"),
+    ("CUT3DDENPOT.nc", "abipy.electrons.denpot:Cut3dDenPotNcFile"),
+    ("OPTIC.nc", "abipy.electrons.optic:OpticNcFile"),
+    ("EPH.nc", "abipy.eph.eph:EphFile"),
+    ("SIGEPH.nc", "abipy.eph.sigeph:SigEPhFile"),
 ])
 
 
@@ -130,8 +144,8 @@ def abiopen_ext2class_table():
     from tabulate import tabulate
     table = []
 
-    for ext, cls in chain(ext2file.items(), abiext2ncfile.items()):
-        table.append((ext, str(cls)))
+    for ext, path in chain(ext2file.items(), abiext2ncfile.items()):
+        table.append((ext, path.replace(":", ".")))
 
     return tabulate(table, headers=["Extension", "Class"])
 
@@ -140,18 +154,19 @@ def abifile_subclass_from_filename(filename):
     """
     Returns the appropriate class associated to the given filename.
     """
-    if os.path.basename(filename) == Flow.PICKLE_FNAME:
+    if os.path.basename(filename) == "__AbinitFlow__.pickle":
+        from abipy.flowtk import Flow
         return Flow
 
-    for ext, cls in ext2file.items():
-        if filename.endswith(ext): return cls
+    for ext, path in ext2file.items():
+        if filename.endswith(ext): return import_object(path)
 
     ext = filename.split("_")[-1]
     try:
-        return abiext2ncfile[ext]
+        return import_object(abiext2ncfile[ext])
     except KeyError:
-        for ext, cls in abiext2ncfile.items():
-            if filename.endswith(ext): return cls
+        for ext, path in abiext2ncfile.items():
+            if filename.endswith(ext): return import_object(path)
 
     msg = ("No class has been registered for file:\n\t%s\n\nFile extensions supported:\n%s" %
         (filename, abiopen_ext2class_table()))
@@ -202,6 +217,7 @@ def abiopen(filepath):
         filepath: string with the filename.
     """
     if os.path.basename(filepath) == "__AbinitFlow__.pickle":
+        from abipy.flowtk import Flow
         return Flow.pickle_load(filepath)
 
     # Handle old output files produced by Abinit.
@@ -209,6 +225,7 @@ def abiopen(filepath):
     outnum = re.compile(r".+\.out[\d]+")
     abonum = re.compile(r".+\.abo[\d]+")
     if outnum.match(filepath) or abonum.match(filepath):
+        from abipy.abio.outputs import AbinitOutputFile
         return AbinitOutputFile.from_file(filepath)
 
     cls = abifile_subclass_from_filename(filepath)
@@ -234,6 +251,7 @@ def display_structure(obj, **kwargs):
                           "See also https://github.com/gmatteo/nbjsmol.")
 
     # Cast to structure, get string with cif data and pass it to nbjsmol.
+    from abipy.core.structure import Structure
     structure = Structure.as_structure(obj)
     return nbjsmol_display(structure.to(fmt="cif"), ext=".cif", **kwargs)
 
@@ -276,6 +294,7 @@ def abicheck(verbose=0):
     at run-time can be imported. Return string with error messages, empty if success.
     """
     from monty.termcolor import cprint
+    from abipy.flowtk import TaskManager, AbinitBuild
     err_lines = []
     app = err_lines.append
 
@@ -367,3 +386,7 @@ o-  o/   oo`       ss    /y..y/    ss ss +y`   -y::y-    yo          -o/  .o- -o
    `  ..` `:-                            :+              /:         --` `-` `
             `.`                                                   ..`
 """
+
+
+# Objects are imported on first access.
+install_lazy_imports(__name__, _LAZY_IMPORTS)
@@ -3,12 +3,18 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 
 import sys
 import os
+import re
 import json
+import hashlib
+import tempfile
 import yaml
 import html2text
 
 from collections import OrderedDict, defaultdict
-from six.moves import cPickle as pickle
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 from monty.string import is_string, list_strings
 from monty.functools import lazy_property
 from monty.termcolor import cprint
@@ -268,6 +274,14 @@ class MultipleValue(yaml.YAMLObject):
 
 __VARS_DATABASE = None
 
+# Directory with the YAML files and the prebuilt database.
+# Don't use abipy.data.var_file here as abipy.data imports pymatgen.
+_VARIABLES_DIRPATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "variables")
+
+# Version of the format used in the prebuilt database and in the cache.
+# Increase it if the layout of the file or the encoding of the objects is changed.
+DB_FORMAT_VERSION = 1
+
 
 ##############
 # Public API #
@@ -275,74 +289,282 @@ __VARS_DATABASE = None
 
 
 def get_abinit_variables():
-    """Returns the database with the description of the ABINIT variables."""
+    """
+    Returns the database with the description of the ABINIT variables.
+
+    The database is read from the prebuilt file shipped with abipy (abipy/data/variables/abinit_vars.db).
+    If this file is not available, has been produced with a different format version or from a different
+    version of the YAML file, the database is built from the YAML file and saved in ~/.abinit/abipy
+    so that the next calls are fast.
+    """
     global __VARS_DATABASE
 
     if __VARS_DATABASE is None:
-        pickle_file = os.path.join(os.getenv("HOME"), ".abinit", "abipy", "abinit_vars.pickle")
+        yaml_path = os.path.join(_VARIABLES_DIRPATH, "abinit_vars.yml")
+        with open(yaml_path, "rb") as fh:
+            yaml_sha1 = hashlib.sha1(fh.read()).hexdigest()
 
-        if os.path.exists(pickle_file):
+        cache_path = os.path.join(os.path.expanduser("~"), ".abinit", "abipy", "abinit_vars_v%d.db" % DB_FORMAT_VERSION)
+        for db_path in (os.path.join(_VARIABLES_DIRPATH, "abinit_vars.db"), cache_path):
+            if not os.path.exists(db_path): continue
             try:
-                with open(pickle_file, "rb") as fh:
-                    __VARS_DATABASE = pickle.load(fh)
-            except Exception as exc:
-                cprint("Error while trying to read variables from pickle file: %s" % pickle_file, "red")
-                cprint("Please remove the file and rerun.", "red")
-                raise exc
-
-        else:
-            # Make directory and file if not present.
-            if not os.path.exists(os.path.dirname(pickle_file)):
-                os.makedirs(os.path.dirname(pickle_file))
+                database = VariableDatabase.from_dbfile(db_path)
+                # Use the database only if it has been produced from the current YAML file.
+                if database.yaml_sha1 == yaml_sha1:
+                    __VARS_DATABASE = database
+                    return __VARS_DATABASE
+            except (IOError, OSError, ValueError) as exc:
+                cprint("Ignoring corrupted database %s:\n%s" % (db_path, str(exc)), "yellow")
+
+        #print("Reading database from YAML file and generating cached version. It may take a while...")
+        __VARS_DATABASE = VariableDatabase.from_file(yaml_path)
+        try:
+            __VARS_DATABASE.to_dbfile(cache_path, yaml_sha1=yaml_sha1)
+        except (IOError, OSError) as exc:
+            cprint("Cannot write database to %s:\n%s" % (cache_path, str(exc)), "yellow")
 
-            #print("Reading database from YAML file and generating pickle version. It may take a while...")
-            from abipy import data as abidata
-            yaml_path = abidata.var_file('abinit_vars.yml')
-            __VARS_DATABASE = VariableDatabase.from_file(yaml_path)
+    return __VARS_DATABASE
 
-            # Save object to pickle file so that can we can reload it from pickle instead of yaml (slower)
-            with open(pickle_file, "wb") as fh:
-                pickle.dump(__VARS_DATABASE, fh)
 
-    return __VARS_DATABASE
+def _encode_obj(obj):
+    """
+    Convert ``obj`` to a JSON-serializable object.
+    The YAML objects are stored as dictionaries with the name of the class and the list of (name, value) attributes.
+    """
+    if isinstance(obj, (list, tuple)):
+        return [_encode_obj(o) for o in obj]
+    if isinstance(obj, dict):
+        return {k: _encode_obj(v) for k, v in obj.items()}
+    if isinstance(obj, yaml.YAMLObject):
+        return {"@class": obj.__class__.__name__,
+                "@attrs": [[k, _encode_obj(v)] for k, v in obj.__dict__.items()]}
+    return obj
+
+
+_YAML_CLASSES = None
+
+
+def _decode_obj(obj):
+    """Inverse of :func:`_encode_obj`."""
+    if isinstance(obj, list):
+        return [_decode_obj(o) for o in obj]
+    if isinstance(obj, dict):
+        if "@class" not in obj:
+            return {k: _decode_obj(v) for k, v in obj.items()}
+        global _YAML_CLASSES
+        if _YAML_CLASSES is None:
+            _YAML_CLASSES = {cls.__name__: cls for cls in (Variable, ValueWithUnit, Range, ValueWithConditions, MultipleValue)}
+        # Same approach used by the YAML loader: __init__ is not called.
+        cls = _YAML_CLASSES[obj["@class"]]
+        new = cls.__new__(cls)
+        for k, v in obj["@attrs"]:
+            new.__dict__[k] = _decode_obj(v)
+        return new
+    return obj
+
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _get_search_tokens(var):
+    """Set with the words used in :meth:`VariableDatabase.apropos` to find the variables related to ``var``."""
+    strings = [var.text, var.requires, var.excludes]
+    if var.dimensions is not None: strings.append(str(var.dimensions))
+    tokens = set()
+    for s in strings:
+        if s: tokens.update(_WORD_RE.findall(s))
+    return tokens
+
+
+class VariableDatabase(Mapping):
+    """
+    Stores the mapping varname --> variable object.
+    Variables are ordered alphabetically.
 
+    The database can be saved in a file with :meth:`to_dbfile` and read with :meth:`from_dbfile`.
+    The file consists of a JSON header with the list of variable names, the offsets of the records and
+    the info needed to group variables by section, followed by one JSON record per variable and by the
+    inverted index used by :meth:`apropos`. The variables and the index are read from file only when needed.
+    """
 
-class VariableDatabase(OrderedDict):
-    """Stores the mapping varname --> variable object."""
+    def __init__(self, variables):
+        """
+        Args:
+            variables: List of :class:`Variable` objects.
+        """
+        variables = sorted(variables, key=lambda v: v.varname)
+        self._varnames = [v.varname for v in variables]
+        self._vars = {v.varname: v for v in variables}
+        self._name2index = {name: i for i, name in enumerate(self._varnames)}
+        self._filepath = None
+        self._header = {}
 
     @classmethod
     def from_file(cls, yaml_path):
+        """Build the database from the YAML file ``yaml_path``."""
         with open(yaml_path, "rt") as fh:
-            var_list = yaml.load(fh)
+            var_list = yaml.load(fh, Loader=yaml.Loader)
+
+        new = cls(var_list)
+        # Sections and characteristics are stored in the same directory.
+        dirpath = os.path.dirname(os.path.abspath(yaml_path))
+        for key in ("sections", "characteristics"):
+            path = os.path.join(dirpath, key + ".yml")
+            if os.path.exists(path):
+                with open(path, "rt") as fh:
+                    new._header[key] = yaml.load(fh, Loader=yaml.Loader)
+
+        return new
+
+    @classmethod
+    def from_dbfile(cls, filepath):
+        """
+        Read the database from the file ``filepath`` produced by :meth:`to_dbfile`.
+        Only the header is read here.
+
+        Raises:
+            ValueError if the file is corrupted or has been written with a different format version.
+        """
+        with open(filepath, "rb") as fh:
+            header = json.loads(fh.readline().decode("utf-8"))
+            if header.get("format_version") != DB_FORMAT_VERSION:
+                raise ValueError("%s: expecting format version %s, found %s" % (
+                    filepath, DB_FORMAT_VERSION, header.get("format_version")))
+            header["records_start"] = fh.tell()
+
+        new = cls([])
+        new._filepath = os.path.abspath(filepath)
+        new._header = header
+        new._varnames = header["varnames"]
+        new._name2index = {name: i for i, name in enumerate(new._varnames)}
+        return new
+
+    def to_dbfile(self, filepath, yaml_sha1=None):
+        """
+        Write the database to ``filepath``. The file is written atomically so that
+        concurrent processes never read a partially written file.
+
+        Args:
+            filepath: Path of the output file.
+            yaml_sha1: SHA1 of the YAML file used to build the database (used to detect outdated caches).
+        """
+        records, offsets, pos = [], [], 0
+        for name in self._varnames:
+            rec = json.dumps(_encode_obj(self[name]), separators=(",", ":")).encode("utf-8") + b"\n"
+            offsets.append(pos)
+            records.append(rec)
+            pos += len(rec)
+
+        index = json.dumps(self.apropos_index, separators=(",", ":")).encode("utf-8") + b"\n"
+        header = OrderedDict([
+            ("format_version", DB_FORMAT_VERSION),
+            ("yaml_sha1", yaml_sha1),
+            ("varnames", self._varnames),
+            ("offsets", offsets),
+            ("index_offset", pos),
+            ("sections", self.sections),
+            ("characteristics", self.characteristics),
+            ("name2section", self.name2section),
+        ])
+
+        filepath = os.path.abspath(os.path.expanduser(filepath))
+        dirname = os.path.dirname(filepath)
+        if not os.path.exists(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                # Directory created by another process.
+                if not os.path.isdir(dirname): raise
+
+        # Write to a temporary file in the same directory and rename it.
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, prefix=".abinit_vars")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n")
+                for rec in records:
+                    fh.write(rec)
+                fh.write(index)
+            # mkstemp creates files readable only by the owner.
+            os.chmod(tmp_path, 0o644)
+            if hasattr(os, "replace"):
+                os.replace(tmp_path, filepath)
+            else:
+                # py2: rename is atomic on posix.
+                os.rename(tmp_path, filepath)
+        except Exception:
+            if os.path.exists(tmp_path): os.remove(tmp_path)
+            raise
+
+    @property
+    def yaml_sha1(self):
+        """SHA1 of the YAML file used to build the database. None if not available."""
+        return self._header.get("yaml_sha1")
 
-        # Build ordered dict with variables in alphabetical order.
-        var_list = sorted(var_list, key=lambda v: v.varname)
-        return cls([(v.varname, v) for v in var_list])
+    def _read_line(self, offset):
+        """Read the line starting at ``offset`` bytes after the header."""
+        with open(self._filepath, "rb") as fh:
+            fh.seek(self._header["records_start"] + offset)
+            return fh.readline().decode("utf-8")
+
+    def __getitem__(self, name):
+        try:
+            return self._vars[name]
+        except KeyError:
+            if name not in self._name2index: raise
+            var = _decode_obj(json.loads(self._read_line(self._header["offsets"][self._name2index[name]])))
+            self._vars[name] = var
+            return var
+
+    def __iter__(self):
+        return iter(self._varnames)
+
+    def __len__(self):
+        return len(self._varnames)
+
+    def __contains__(self, name):
+        return name in self._name2index
 
     @lazy_property
     def characteristics(self):
         """List of characteristics."""
-        from abipy import data as abidata
-        with open(abidata.var_file('characteristics.yml'), 'rt') as f:
-            return yaml.load(f)
+        if "characteristics" in self._header: return self._header["characteristics"]
+        with open(os.path.join(_VARIABLES_DIRPATH, "characteristics.yml"), "rt") as f:
+            return yaml.load(f, Loader=yaml.Loader)
 
     @lazy_property
     def sections(self):
         """List of sections"""
-        from abipy import data as abidata
-        with open(abidata.var_file('sections.yml'), 'rt') as f:
-            return yaml.load(f)
+        if "sections" in self._header: return self._header["sections"]
+        with open(os.path.join(_VARIABLES_DIRPATH, "sections.yml"), "rt") as f:
+            return yaml.load(f, Loader=yaml.Loader)
 
     @lazy_property
     def name2section(self):
         """
         Dictionary mapping the name of the variable to the section.
         """
+        if "name2section" in self._header: return self._header["name2section"]
         d = {}
         for name, var in self.items():
             d[name] = var.section
         return d
 
+    @lazy_property
+    def apropos_index(self):
+        """
+        Inverted index used by :meth:`apropos`.
+        Dictionary mapping the words found in the documentation of the variables
+        to the (sorted) list of indices of the variables in which they appear.
+        """
+        if "index_offset" in self._header:
+            return json.loads(self._read_line(self._header["index_offset"]))
+
+        d = defaultdict(list)
+        for i, name in enumerate(self._varnames):
+            for token in _get_search_tokens(self[name]):
+                d[token].append(i)
+        return dict(d)
+
     def group_by_section(self, names):
         """
         Group a list of variable in sections.
@@ -362,21 +584,25 @@ class VariableDatabase(OrderedDict):
                 d[sec].append(name)
             except KeyError as exc:
                 raise KeyError("{}\n\nIf the key is a valid Abinit variable, try to remove\n"
-                               "~/.abinit/abipy/abinit_vars.pickle and rerun.".format(exc))
+                               "the files in ~/.abinit/abipy/abinit_vars_v*.db and rerun.".format(exc))
 
         return OrderedDict([(sec, d[sec]) for sec in self.sections if d[sec]])
 
     def apropos(self, varname):
         """Return the list of :class:`Variable` objects that are related` to the given varname"""
-        var_list = []
-        for v in self.values():
-            if (v.text and varname in v.text or
-               (v.dimensions is not None and varname in str(v.dimensions)) or
-               (v.requires is not None and varname in v.requires) or
-               (v.excludes is not None and varname in v.excludes)):
-                var_list.append(v)
+        if _WORD_RE.findall(varname) != [varname]:
+            # The inverted index contains words only, fall back to a linear search.
+            return [v for v in self.values() if varname in (v.text or "") or
+                    (v.dimensions is not None and varname in str(v.dimensions)) or
+                    (v.requires is not None and varname in v.requires) or
+                    (v.excludes is not None and varname in v.excludes)]
+
+        # varname is a substring of the text iff it is a substring of one of its words.
+        inds = set()
+        for token, token_inds in self.apropos_index.items():
+            if varname in token: inds.update(token_inds)
 
-        return var_list
+        return [self[self._varnames[i]] for i in sorted(inds)]
 
     def vars_with_section(self, sections):
         """
@@ -384,11 +610,7 @@ class VariableDatabase(OrderedDict):
         sections can be a string or a list of strings.
         """
         sections = set(list_strings(sections))
-        varlist = []
-        for v in self.values():
-            if v.section in sections:
-                varlist.append(v)
-        return varlist
+        return [self[name] for name in self._varnames if self.name2section[name] in sections]
 
     def vars_with_char(self, chars):
         """
@@ -439,21 +661,65 @@ def abinit_help(varname, info=True, stream=sys.stdout):
     stream.write("\n")
 
 
+def _trie_regex(words):
+    """
+    Build a regular expression matching the strings in ``words``.
+    The pattern is derived from the trie of the words so that the regex engine never backtracks
+    over alternatives sharing the same prefix. The longest word is matched if several words start
+    at the same position e.g. "kptopt" is preferred over "kpt".
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        # The empty string marks the end of a word.
+        node[""] = None
+
+    def pattern(node):
+        alts = [re.escape(char) + pattern(child) for char, child in sorted(node.items()) if char]
+        if not alts: return ""
+        if len(alts) == 1 and "" not in node: return alts[0]
+        pat = "(?:" + "|".join(alts) + ")"
+        return pat + "?" if "" in node else pat
+
+    return re.compile(pattern(trie))
+
+
+class _HtmlLinker(object):
+    """
+    Replace the names of the variables with HTML links.
+    The regular expression is compiled once and the links are cached.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self.regex = _trie_regex(database.keys())
+        self.links = {}
+
+    def _get_link(self, match):
+        name = match.group(0)
+        try:
+            return self.links[name]
+        except KeyError:
+            link = self.links[name] = self.database[name].html_link(label=name)
+            return link
+
+    def sub(self, text):
+        return self.regex.sub(self._get_link, text)
+
+
+__HTML_LINKER = None
+
+
 def repr_html_from_abinit_string(text):
     """
     Given a string `text` with an Abinit input file, replace all variables
     with HTML links pointing to the official documentation. Return new string.
     """
+    global __HTML_LINKER
     var_database = get_abinit_variables()
+    if __HTML_LINKER is None or __HTML_LINKER.database is not var_database:
+        __HTML_LINKER = _HtmlLinker(var_database)
 
-    # https://stackoverflow.com/questions/6116978/python-replace-multiple-strings
-    # define desired replacements here e.g. rep = {"condition1": "", "condition2": "text"}
-    # ordered dict and sort by length is needed because variable names can overlap e.g. kpt, kptopt pair
-    import re
-    rep = {vname: var.html_link(label=vname) for vname, var in var_database.items()}
-    rep = OrderedDict([(re.escape(k), rep[k]) for k in sorted(rep.keys(), key=lambda n: len(n), reverse=True)])
-
-    # Use these three lines to do the replacement
-    pattern = re.compile("|".join(rep.keys()))
-    text = pattern.sub(lambda m: rep[re.escape(m.group(0))], text)
-    return text.replace("\n", "<br>")
+    return __HTML_LINKER.sub(text).replace("\n", "<br>")
@@ -440,7 +440,7 @@ class AbinitInput(six.with_metaclass(abc.ABCMeta, AbstractInput, MSONable, Has_S
 
         if not is_abivar(key) and self.spell_check:
             raise self.Error("%s is not a valid ABINIT variable.\n" % key +
-                             "If the name is correct, try to remove ~/.abinit/abipy/abinit_vars.pickle\n"
+                             "If the name is correct, try to remove ~/.abinit/abipy/abinit_vars_v*.db\n"
                              "and rerun the code. If the problems persists, contact the abipy developers\n"
                              "or use input.set_spell_check(False)\n"
                              "or add the variable to ~abipy/data/variables/abinit_vars.json\n")
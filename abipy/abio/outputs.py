@@ -4,9 +4,16 @@ Objects used to extract and plot results from output files in text format.
 from __future__ import print_function, division, unicode_literals, absolute_import
 
 import os
+import re
+import mmap
+import itertools
 import numpy as np
 
 from collections import OrderedDict
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 from monty.string import is_string
 from monty.functools import lazy_property
 from monty.termcolor import cprint
@@ -18,7 +25,7 @@ from abipy.core.mixins import TextFile, AbinitNcFile, NotebookWriter
 from abipy.abio.inputs import GEOVARS
 from abipy.abio.timer import AbinitTimerParser
 from abipy.abio.robots import Robot
-from abipy.flowtk import EventsParser, NetcdfReader, GroundStateScfCycle, D2DEScfCycle
+from abipy.flowtk import EventsParser, NetcdfReader, GroundStateScfCycle, D2DEScfCycle, Relaxation
 
 
 class AbinitTextFile(TextFile):
@@ -89,92 +96,173 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
         self.debug_level = 0
         self._parse()
 
+    # Regular expression used to find the lines marking the beginning of the sections in a single pass.
+    # The tags must be at the beginning of the line (leading whitespaces are allowed).
+    # The match starts with a newline so that the regex engine can use a fast search for the first character.
+    _MARKERS = br"\.Version|- Proc\.|\+Overall time|Calculation completed\.|== DATASET|== END DATASET\(S\) |" + \
+               br"iter   Etot\(hartree\)|iter   2DEtotal\(Ha\)"
+    _MARKERS_RE = re.compile(br"\n[ \t]*(" + _MARKERS + br")")
+    _FIRST_MARKER_RE = re.compile(br"[ \t]*(" + _MARKERS + br")")
+
+    # Map tags to the keys used in self._offsets.
+    _TAG2KEY = {
+        b"== END DATASET(S) ": "footer",
+        b"iter   Etot(hartree)": "gs_scf_cycles",
+        b"iter   2DEtotal(Ha)": "d2de_scf_cycles",
+    }
+
     def _parse(self):
         """
+        Scan the (memory-mapped) file once and record the byte offsets of the dataset sections
+        and of the SCF cycles. The content of the sections is read and parsed only when the corresponding
+        property is accessed.
+
         header: String with the input variables
         footer: String with the output variables
-        datasets: Dictionary mapping dataset index to list of strings.
+        datasets: Dictionary mapping dataset index to string.
         """
         # Get code version and find magic line signaling that the output file is completed.
         self.version, self.run_completed = None, False
         self.overall_cputime, self.overall_walltime = 0.0, 0.0
         self.proc0_cputime, self.proc0_walltime = 0.0, 0.0
 
-        with open(self.filepath) as fh:
-            for line in fh:
-                if self.version is None and line.startswith(".Version"):
-                    self.version = line.split()[1]
+        # Byte offsets of the lines marking the beginning of the sections.
+        # "datasets" contains (dtindex, offset) tuples.
+        self._offsets = offsets = OrderedDict([(k, []) for k in ("datasets", "footer", "gs_scf_cycles",
+            "d2de_scf_cycles")])
 
-                if line.startswith("- Proc."):
-                    #- Proc.   0 individual time (sec): cpu=         25.5  wall=         26.1
-                    tokens = line.split()
-                    self.proc0_walltime = float(tokens[-1])
-                    self.proc0_cputime = float(tokens[-3])
+        with open(self.filepath, "rb") as fh:
+            self._filesize = os.fstat(fh.fileno()).st_size
+            # Empty files cannot be mapped.
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if self._filesize else b""
+            try:
+                first = self._FIRST_MARKER_RE.match(buf)
+                matches = self._MARKERS_RE.finditer(buf)
+                if first is not None: matches = itertools.chain([first], matches)
+
+                for match in matches:
+                    tag, pos = match.group(1), match.start(1)
+                    start = buf.rfind(b"\n", 0, pos) + 1
+                    stop = buf.find(b"\n", pos)
+                    if stop == -1: stop = len(buf)
+                    line = buf[start:stop].decode("utf-8", "replace")
+
+                    if tag == b".Version":
+                        if self.version is None and pos == start: self.version = line.split()[1]
+                    elif tag == b"- Proc.":
+                        #- Proc.   0 individual time (sec): cpu=         25.5  wall=         26.1
+                        if pos == start:
+                            tokens = line.split()
+                            self.proc0_walltime = float(tokens[-1])
+                            self.proc0_cputime = float(tokens[-3])
+                    elif tag == b"+Overall time":
+                        #+Overall time at end (sec) : cpu=         25.5  wall=         26.1
+                        if pos == start:
+                            tokens = line.split()
+                            self.overall_cputime = float(tokens[-3])
+                            self.overall_walltime = float(tokens[-1])
+                    elif tag == b"Calculation completed.":
+                        self.run_completed = True
+                    elif tag == b"== DATASET":
+                        # Save dataset number
+                        # == DATASET  1 ==================================================================
+                        dtindex = int(line.replace("=", "").split()[-1])
+                        assert dtindex not in [t[0] for t in offsets["datasets"]]
+                        offsets["datasets"].append((dtindex, start))
+                    else:
+                        offsets[self._TAG2KEY[tag]].append(start)
+
+                # Output files produced in dryrun_mode contain the following line in the header:
+                # abinit : before driver, prtvol=0, debugging mode => will skip driver
+                header_stop = min([t[1] for t in offsets["datasets"]] + offsets["footer"] + [self._filesize])
+                self.dryrun_mode = buf.find(b"debugging mode => will skip driver", 0, header_stop) != -1
+            finally:
+                if self._filesize: buf.close()
+
+        self.ndtset = max(len(offsets["datasets"]), 1)
+
+    def _read_string(self, start, stop=None):
+        """Return the string stored in the file between the byte offsets ``start`` and ``stop``."""
+        with open(self.filepath, "rb") as fh:
+            fh.seek(start)
+            data = fh.read() if stop is None else fh.read(stop - start)
+        s = data.decode("utf-8", "replace")
+        # Same behaviour as universal newlines mode (files with CTRL+M).
+        if "\r" in s: s = s.replace("\r\n", "\n").replace("\r", "\n")
+        return s
 
-                if line.startswith("+Overall time"):
-                    #+Overall time at end (sec) : cpu=         25.5  wall=         26.1
-                    tokens = line.split()
-                    self.overall_cputime = float(tokens[-3])
-                    self.overall_walltime = float(tokens[-1])
+    @lazy_property
+    def _sections_bounds(self):
+        """
+        Tuple (header_bounds, datasets_bounds, footer_bounds) with the (start, stop) byte offsets of the sections.
+        datasets_bounds is a dictionary dataset_index --> (start, stop), footer_bounds a list of (start, stop).
+        Each section ends where the next one starts.
+        """
+        markers = [(pos, dtindex) for dtindex, pos in self._offsets["datasets"]]
+        markers.extend((pos, "footer") for pos in self._offsets["footer"])
+        markers.sort()
+
+        header = (0, markers[0][0] if markers else self._filesize)
+        datasets, footer = OrderedDict(), []
+        for i, (start, key) in enumerate(markers):
+            stop = markers[i + 1][0] if i + 1 < len(markers) else self._filesize
+            if key == "footer":
+                footer.append((start, stop))
+            else:
+                datasets[key] = (start, stop)
 
-                if " Calculation completed." in line:
-                    self.run_completed = True
+        return header, datasets, footer
 
-        # Parse header to get important dimensions and variables
-        self.header, self.footer, self.datasets = [], [], OrderedDict()
-        where = "in_header"
+    @lazy_property
+    def header(self):
+        """String with the input variables."""
+        return self._read_string(*self._sections_bounds[0])
 
-        with open(self.filepath, "rt") as fh:
-            for line in fh:
-                if "== DATASET" in line:
-                    # Save dataset number
-                    # == DATASET  1 ==================================================================
-                    where = int(line.replace("=", "").split()[-1])
-                    assert where not in self.datasets
-                    self.datasets[where] = []
-                elif "== END DATASET(S) " in line:
-                    where = "in_footer"
-
-                if where == "in_header":
-                    self.header.append(line)
-                elif where == "in_footer":
-                    self.footer.append(line)
-                else:
-                    # dataset number --> lines
-                    self.datasets[where].append(line)
-
-        self.header = "".join(self.header)
-        if self.debug_level: print("header:\n", self.header)
-        # Output files produced in dryrun_mode contain the following line:
-        # abinit : before driver, prtvol=0, debugging mode => will skip driver
-        self.dryrun_mode = "debugging mode => will skip driver" in self.header
-        #print("dryrun_mode:", self.dryrun_mode)
-
-        #if " jdtset " in self.header: raise NotImplementedError("jdtset is not supported")
-        #if " udtset " in self.header: raise NotImplementedError("udtset is not supported")
-
-        self.ndtset = len(self.datasets)
-        if not self.datasets:
-            #raise NotImplementedError("Empty dataset sections.")
-            self.ndtset = 1
-            self.datasets[1] = "Empty dataset"
-
-        for key, data in self.datasets.items():
-            if self.debug_level: print("data")
-            self.datasets[key] = "".join(data)
-            if self.debug_level: print(self.datasets[key])
-
-        self.footer = "".join(self.footer)
-        if self.debug_level: print("footer:\n", self.footer)
-
-        self.initial_vars_global, self.initial_vars_dataset = self._parse_variables("header")
-        self.final_vars_global, self.final_vars_dataset = None, None
-        if self.run_completed:
-            if self.dryrun_mode:
-                # footer is not present. Copy values from header.
-                self.final_vars_global, self.final_vars_dataset = self.initial_vars_global, self.initial_vars_dataset
-            else:
-                self.final_vars_global, self.final_vars_dataset = self._parse_variables("footer")
+    @lazy_property
+    def footer(self):
+        """String with the output variables."""
+        return "".join(self._read_string(start, stop) for start, stop in self._sections_bounds[2])
+
+    @lazy_property
+    def datasets(self):
+        """
+        Dictionary mapping dataset index to string.
+        The strings are read from file when the dataset is accessed for the first time.
+        """
+        bounds = self._sections_bounds[1]
+        if not bounds: return OrderedDict([(1, "Empty dataset")])
+        return _LazyFileStrings(self, bounds)
+
+    @lazy_property
+    def _initial_vars(self):
+        return self._parse_variables("header")
+
+    @property
+    def initial_vars_global(self):
+        """Dictionary with the global input variables reported in the header."""
+        return self._initial_vars[0]
+
+    @property
+    def initial_vars_dataset(self):
+        """Dictionary dataset index --> input variables reported in the header."""
+        return self._initial_vars[1]
+
+    @lazy_property
+    def _final_vars(self):
+        if not self.run_completed: return None, None
+        # footer is not present in dryrun mode. Copy values from header.
+        if self.dryrun_mode: return self._initial_vars
+        return self._parse_variables("footer")
+
+    @property
+    def final_vars_global(self):
+        """Dictionary with the global variables reported in the footer. None if run is not completed."""
+        return self._final_vars[0]
+
+    @property
+    def final_vars_dataset(self):
+        """Dictionary dataset index --> variables reported in the footer. None if run is not completed."""
+        return self._final_vars[1]
 
     def _parse_variables(self, what):
         vars_global = OrderedDict()
@@ -609,6 +697,79 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
         """
         return D2DEScfCycle.from_stream(self)
 
+    @property
+    def num_gs_scf_cycles(self):
+        """Number of GS SCF cycles in the file."""
+        return len(self._offsets["gs_scf_cycles"])
+
+    @property
+    def num_d2de_scf_cycles(self):
+        """Number of DFPT SCF cycles in the file."""
+        return len(self._offsets["d2de_scf_cycles"])
+
+    def get_gs_scf_cycle(self, i):
+        """
+        Return the i-th :class:`GroundStateScfCycle` in the file (negative indices are supported).
+        Uses the offsets computed when the file is opened so there's no need to scan the previous cycles.
+        """
+        return self._read_scf_cycles(GroundStateScfCycle, [self._offsets["gs_scf_cycles"][i]])[0]
+
+    def get_d2de_scf_cycle(self, i):
+        """
+        Return the i-th :class:`D2DEScfCycle` in the file (negative indices are supported).
+        """
+        return self._read_scf_cycles(D2DEScfCycle, [self._offsets["d2de_scf_cycles"][i]])[0]
+
+    def get_gs_scf_cycles(self):
+        """List with all the :class:`GroundStateScfCycle` in the file."""
+        return self._read_scf_cycles(GroundStateScfCycle, self._offsets["gs_scf_cycles"])
+
+    def get_d2de_scf_cycles(self):
+        """List with all the :class:`D2DEScfCycle` in the file."""
+        return self._read_scf_cycles(D2DEScfCycle, self._offsets["d2de_scf_cycles"])
+
+    def get_relaxation(self):
+        """
+        Return :class:`Relaxation` object with the GS SCF cycles performed during the structural relaxation.
+        None if the file does not contain SCF cycles.
+        """
+        cycles = self.get_gs_scf_cycles()
+        return Relaxation(cycles) if cycles else None
+
+    def _read_scf_cycles(self, cls, offsets):
+        """
+        Read the SCF cycles starting at ``offsets``. Return list of ``cls`` instances.
+
+        Example (SCF cycle, similar format is used for phonons):
+
+            iter   Etot(hartree)      deltaE(h)  residm     vres2
+            ETOT  1  -8.8604027880849    -8.860E+00 2.458E-02 3.748E+00
+
+            At SCF step    5       vres2   =  3.53E-08 < tolvrs=  1.00E-06 =>converged.
+        """
+        cycles = []
+        with open(self.filepath, "rb") as fh:
+            for offset in offsets:
+                fh.seek(offset)
+                keys = fh.readline().decode("utf-8", "replace").split()
+                # The table ends at the first empty line. Remove the label at the beginning of the line.
+                lines = []
+                for line in fh:
+                    tokens = line.split(None, 1)
+                    if not tokens: break
+                    lines.append(tokens[1] if len(tokens) > 1 else b"")
+
+                # Convert all the numbers with a single call.
+                values = np.array(b" ".join(lines).split(), dtype=np.float64)
+                if values.size != len(lines) * len(keys):
+                    raise ValueError("%s: wrong number of entries in SCF cycle at offset %s" % (self.filepath, offset))
+                values.shape = (len(lines), len(keys))
+
+                fields = OrderedDict([(k, values[:, ik].copy()) for ik, k in enumerate(keys) if k != "iter"])
+                cycles.append(cls(fields))
+
+        return cycles
+
     # TODO: Use header and vars to understand if we have SCF/DFFT/Relaxation
     def plot(self, tight_layout=True, with_timer=False, show=True):
         """
@@ -617,24 +778,13 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
         Args:
             with_timer: True if timer section should be plotted
         """
-        self.seek(0)
-        icycle = -1
-        while True:
-            gs_cycle = self.next_gs_scf_cycle()
-            if gs_cycle is None: break
-            icycle += 1
+        for icycle, gs_cycle in enumerate(self.get_gs_scf_cycles()):
             gs_cycle.plot(title="SCF cycle no %d" % icycle, tight_layout=tight_layout, show=show)
 
-        self.seek(0)
-        icycle = -1
-        while True:
-            d2de_cycle = self.next_d2de_scf_cycle()
-            if d2de_cycle is None: break
-            icycle += 1
+        for icycle, d2de_cycle in enumerate(self.get_d2de_scf_cycles()):
             d2de_cycle.plot(title="DFPT cycle no %d" % icycle, tight_layout=tight_layout, show=show)
 
         if with_timer:
-            self.seek(0)
             self.get_timer().plot_all(tight_layout=tight_layout, show=show)
 
     def compare_gs_scf_cycles(self, others, show=True):
@@ -646,35 +796,7 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
             others: list of :class:`AbinitOutputFile` objects or strings with paths to output files.
             show: True to diplay plots.
         """
-        # Open file here if we receive a string. Files will be closed before returning
-        close_files = []
-        for i, other in enumerate(others):
-            if is_string(other):
-                others[i] = self.__class__.from_file(other)
-                close_files.append(i)
-
-        fig, figures = None, []
-        while True:
-            cycle = self.next_gs_scf_cycle()
-            if cycle is None: break
-
-            fig = cycle.plot(show=False)
-            for i, other in enumerate(others):
-                other_cycle = other.next_gs_scf_cycle()
-                if other_cycle is None: break
-                last = (i == len(others) - 1)
-                fig = other_cycle.plot(ax_list=fig.axes, show=show and last)
-                if last:
-                    fig.tight_layout()
-                    figures.append(fig)
-
-        self.seek(0)
-        for other in others: other.seek(0)
-
-        if close_files:
-            for i in close_files: others[i].close()
-
-        return figures
+        return self._compare_scf_cycles(others, "gs", show=show)
 
     def compare_d2de_scf_cycles(self, others, show=True):
         """
@@ -685,6 +807,10 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
             others: list of :class:`AbinitOutputFile` objects or strings with paths to output files.
             show: True to diplay plots.
         """
+        return self._compare_scf_cycles(others, "d2de", show=show)
+
+    def _compare_scf_cycles(self, others, kind, show=True):
+        """Implementation of compare_gs_scf_cycles and compare_d2de_scf_cycles."""
         # Open file here if we receive a string. Files will be closed before returning
         close_files = []
         for i, other in enumerate(others):
@@ -692,24 +818,20 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
                 others[i] = self.__class__.from_file(other)
                 close_files.append(i)
 
-        fig, figures = None, []
-        while True:
-            cycle = self.next_d2de_scf_cycle()
-            if cycle is None: break
+        getter = "get_%s_scf_cycles" % kind
+        other_cycles = [getattr(other, getter)() for other in others]
 
+        fig, figures = None, []
+        for icycle, cycle in enumerate(getattr(self, getter)()):
             fig = cycle.plot(show=False)
-            for i, other in enumerate(others):
-                other_cycle = other.next_d2de_scf_cycle()
-                if other_cycle is None: break
+            for i, cycles in enumerate(other_cycles):
+                if icycle >= len(cycles): break
                 last = (i == len(others) - 1)
-                fig = other_cycle.plot(ax_list=fig.axes, show=show and last)
+                fig = cycles[icycle].plot(ax_list=fig.axes, show=show and last)
                 if last:
                     fig.tight_layout()
                     figures.append(fig)
 
-        self.seek(0)
-        for other in others: other.seek(0)
-
         if close_files:
             for i in close_files: others[i].close()
 
@@ -731,6 +853,31 @@ class AbinitOutputFile(AbinitTextFile, NotebookWriter):
         return self._write_nb_nbpath(nb, nbpath)
 
 
+class _LazyFileStrings(Mapping):
+    """
+    Read-only mapping key --> string. The string is read from the (start, stop) byte range
+    of the file associated to ``abifile`` when the key is accessed for the first time.
+    """
+
+    def __init__(self, abifile, bounds):
+        self.abifile = abifile
+        self.bounds = bounds
+        self._cache = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            s = self._cache[key] = self.abifile._read_string(*self.bounds[key])
+            return s
+
+    def __iter__(self):
+        return iter(self.bounds)
+
+    def __len__(self):
+        return len(self.bounds)
+
+
 def validate_output_parser(abitests_dir=None, output_files=None):  # pragma: no cover
     """
     Validate/test Abinit output parser.
@@ -897,6 +1044,28 @@ class AboRobot(Robot):
         import pandas as pd
         return pd.DataFrame(rows, index=row_names, columns=list(rows[0].keys()))
 
+    def get_gs_scf_cycles(self, num_workers=1, executor="threads"):
+        """
+        Extract the GS SCF cycles from all the output files.
+        Return list of lists with the :class:`GroundStateScfCycle` objects of each file (same order as ``abifiles``).
+
+        Args:
+            num_workers: Number of workers used to parse the files. None to use all the CPUs.
+            executor: "threads" or "processes".
+        """
+        return self._get_summaries("gs_scf_cycles", _get_gs_scf_cycles, num_workers=num_workers, executor=executor)
+
+    def get_d2de_scf_cycles(self, num_workers=1, executor="threads"):
+        """
+        Extract the DFPT SCF cycles from all the output files.
+        Return list of lists with the :class:`D2DEScfCycle` objects of each file (same order as ``abifiles``).
+
+        Args:
+            num_workers: Number of workers used to parse the files. None to use all the CPUs.
+            executor: "threads" or "processes".
+        """
+        return self._get_summaries("d2de_scf_cycles", _get_d2de_scf_cycles, num_workers=num_workers, executor=executor)
+
     # TODO
     #def gridplot_timer(self)
 
@@ -921,6 +1090,16 @@ class AboRobot(Robot):
         return self._write_nb_nbpath(nb, nbpath)
 
 
+def _get_gs_scf_cycles(abo):
+    """Return the list of GS SCF cycles in ``abo``. Must be picklable, see Robot._map_abifiles."""
+    return abo.get_gs_scf_cycles()
+
+
+def _get_d2de_scf_cycles(abo):
+    """Return the list of DFPT SCF cycles in ``abo``. Must be picklable, see Robot._map_abifiles."""
+    return abo.get_d2de_scf_cycles()
+
+
 class OutNcFile(AbinitNcFile):
     """
     Class representing the _OUT.nc file containing the dataset results
@@ -10,9 +10,11 @@ import os
 import six
 import inspect
 import itertools
+import threading
 
 from collections import OrderedDict, deque
-from functools import wraps
+from functools import wraps, partial
+from contextlib import contextmanager
 from monty.string import is_string, list_strings
 from monty.termcolor import cprint
 from abipy.core.mixins import NotebookWriter
@@ -21,6 +23,41 @@ from abipy.tools.plotting import (plot_xy_with_hue, add_fig_kwargs, get_ax_fig_p
     rotate_ticklabels, set_visible)
 
 
+# The netcdf4/HDF5 libraries are not thread-safe. The threads used by the robots
+# access netcdf files only while holding this lock.
+_NCLOCK = threading.RLock()
+
+
+class _NoLock(object):
+    """Context manager that does nothing. Used for files that can be accessed concurrently."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def _get_file_lock(filepath):
+    """Return the lock that must be acquired by the robot threads before accessing ``filepath``."""
+    return _NCLOCK if filepath.endswith(".nc") else _NoLock()
+
+
+# Magic numbers of the netcdf classic, 64-bit offset, CDF-5 and netcdf4 (HDF5) formats.
+_NETCDF_MAGICS = (b"CDF\x01", b"CDF\x02", b"CDF\x05", b"\x89HDF\r\n\x1a\n")
+
+
+def _check_netcdf_header(filepath):
+    """
+    Read the first bytes of the netcdf file ``filepath`` and raise ValueError if the format is not recognized.
+    The netcdf library is not used so the check can be executed concurrently by the robot threads.
+    """
+    with open(filepath, "rb") as fh:
+        head = fh.read(8)
+    if not any(head.startswith(magic) for magic in _NETCDF_MAGICS):
+        raise ValueError("%s is not a netcdf file" % filepath)
+
+
 class Robot(NotebookWriter):
     """
     This is the base class from which all Robot subclasses should derive.
@@ -38,6 +75,13 @@ class Robot(NotebookWriter):
     # filepaths are relative to `start`. None for asbolute paths. This flag is set in trim_paths
     start = None
 
+    # OpenFilesLRU used to open the files on demand. None if files are kept open (default).
+    _lru = None
+
+    # RobotIndex used to store the data extracted from the files. None to disable the index (default).
+    # Can be set at the class level to activate the index for all robots.
+    metadata_index = None
+
     # Used in iter_lineopt to generate matplotlib linestyles.
     _LINE_COLORS = ["b", "r", "g", "m", "y", "k", "c"]
     _LINE_STYLES = ["-", ":", "--", "-.",]
@@ -57,13 +101,16 @@ class Robot(NotebookWriter):
     @classmethod
     def get_supported_extensions(self):
         """List of strings with extensions supported by Robot subclasses."""
-        # This is needed to have all subclasses.
-        from abipy.abilab import Robot
+        # This is needed to have all subclasses (abilab imports the modules lazily).
+        from abipy.abilab import get_robot_classes
+        get_robot_classes()
         return sorted([cls.EXT for cls in Robot.__subclasses__()])
 
     @classmethod
     def class_for_ext(cls, ext):
         """Return the Robot subclass associated to the given extension."""
+        from abipy.abilab import get_robot_classes
+        get_robot_classes()
         for subcls in cls.__subclasses__():
             if subcls.EXT in (ext, ext.upper()):
                 return subcls
@@ -73,7 +120,7 @@ class Robot(NotebookWriter):
                          str(cls.get_supported_extensions()))
 
     @classmethod
-    def from_dir(cls, top, walk=True, abspath=False):
+    def from_dir(cls, top, walk=True, abspath=False, num_workers=1, max_open_files=None):
         """
         This class method builds a robot by scanning all files located within directory `top`.
         This method should be invoked with a concrete robot class, for example:
@@ -82,31 +129,40 @@ class Robot(NotebookWriter):
 
         Args:
             top (str): Root directory
-	    walk: if True, directories inside `top` are included as well.
+            walk: if True, directories inside `top` are included as well.
             abspath: True if paths in index should be absolute. Default: Relative to `top`.
+            num_workers: Number of threads used to open the files. None to use all the CPUs.
+                Netcdf files are opened one at a time (see :meth:`_open_files`).
+            max_open_files: If not None, files are opened on demand and at most ``max_open_files``
+                files are kept open at the same time. See :class:`OpenFilesLRU`.
         """
-        new = cls(*cls._open_files_in_dir(top, walk))
+        new = cls._from_filepaths(cls._find_files_in_dir(top, walk), num_workers=num_workers,
+                                  max_open_files=max_open_files)
         if not abspath: new.trim_paths(start=top)
         return new
 
     @classmethod
-    def from_dirs(cls, dirpaths, walk=True, abspath=False):
+    def from_dirs(cls, dirpaths, walk=True, abspath=False, num_workers=1, max_open_files=None):
         """
         Similar to `from_dir` but accepts a list of directories instead of a single directory.
 
         Args:
-	    walk: if True, directories inside `top` are included as well.
+            walk: if True, directories inside `top` are included as well.
             abspath: True if paths in index should be absolute. Default: Relative to `top`.
+            num_workers: Number of threads used to open the files. None to use all the CPUs.
+                Netcdf files are opened one at a time (see :meth:`_open_files`).
+            max_open_files: If not None, files are opened on demand and at most ``max_open_files``
+                files are kept open at the same time. See :class:`OpenFilesLRU`.
         """
-        items = []
+        filepaths = []
         for top in list_strings(dirpaths):
-            items.extend(cls._open_files_in_dir(top, walk))
-        new = cls(*items)
+            filepaths.extend(cls._find_files_in_dir(top, walk))
+        new = cls._from_filepaths(filepaths, num_workers=num_workers, max_open_files=max_open_files)
         if not abspath: new.trim_paths(start=os.getcwd())
         return new
 
     @classmethod
-    def from_dir_glob(cls, pattern, walk=True, abspath=False):
+    def from_dir_glob(cls, pattern, walk=True, abspath=False, num_workers=1, max_open_files=None):
         """
         This class method builds a robot by scanning all files located within the directories
         matching `pattern` as implemented by glob.glob
@@ -116,37 +172,121 @@ class Robot(NotebookWriter):
 
         Args:
             pattern: Pattern string
-	    walk: if True, directories inside `top` are included as well.
+            walk: if True, directories inside `top` are included as well.
             abspath: True if paths in index should be absolute. Default: Relative to getcwd().
+            num_workers: Number of threads used to open the files. None to use all the CPUs.
+                Netcdf files are opened one at a time (see :meth:`_open_files`).
+            max_open_files: If not None, files are opened on demand and at most ``max_open_files``
+                files are kept open at the same time. See :class:`OpenFilesLRU`.
         """
         import glob
-        items = []
-        for top in filter(os.path.isdir, glob.iglob(pattern)):
-            items += cls._open_files_in_dir(top, walk=walk)
-        new = cls(*items)
+        filepaths = []
+        for top in sorted(filter(os.path.isdir, glob.iglob(pattern))):
+            filepaths.extend(cls._find_files_in_dir(top, walk=walk))
+        new = cls._from_filepaths(filepaths, num_workers=num_workers, max_open_files=max_open_files)
         if not abspath: new.trim_paths(start=os.getcwd())
         return new
 
     @classmethod
-    def _open_files_in_dir(cls, top, walk):
-        """Open files in directory tree starting from `top`. Return list of Abinit files."""
+    def _find_files_in_dir(cls, top, walk):
+        """
+        Find the files handled by the robot in the directory tree starting from `top`.
+        Return list of paths. Directories and files are visited in alphabetical order
+        so that the order of the labels does not depend on the file system.
+        """
         if not os.path.isdir(top):
             raise ValueError("%s: no such directory" % str(top))
-        from abipy.abilab import abiopen
-        items = []
+        filepaths = []
         if walk:
             for dirpath, dirnames, filenames in os.walk(top):
-                filenames = [f for f in filenames if cls.class_handles_filename(f)]
-                for f in filenames:
-                    abifile = abiopen(os.path.join(dirpath, f))
-                    if abifile is not None: items.append((abifile.filepath, abifile))
+                dirnames.sort()
+                filepaths.extend(os.path.join(dirpath, f) for f in sorted(filenames)
+                                 if cls.class_handles_filename(f))
         else:
-            filenames = [f for f in os.listdir(top) if cls.class_handles_filename(f)]
-            for f in filenames:
-                abifile = abiopen(os.path.join(top, f))
-                if abifile is not None: items.append((abifile.filepath, abifile))
+            filepaths = [os.path.join(top, f) for f in sorted(os.listdir(top)) if cls.class_handles_filename(f)]
+
+        return filepaths
 
-        return items
+    @classmethod
+    def _from_filepaths(cls, filepaths, num_workers=1, max_open_files=None):
+        """
+        Build a robot from a list of filepaths. Labels are given by the absolute paths.
+        If ``max_open_files`` is not None, the files are not opened here but on demand.
+        """
+        if max_open_files is None:
+            items, exceptions = cls._open_files(filepaths, num_workers=num_workers)
+            new = cls(*items)
+            new._exceptions.extend(exceptions)
+            # Files opened here --> have to close them.
+            for _, abifile in items:
+                new._do_close[abifile.filepath] = True
+            return new
+
+        lru = OpenFilesLRU(max_open_files)
+        items = [(os.path.abspath(path), LazyAbiFile(path, lru)) for path in filepaths]
+        new = cls(*items)
+        new._lru = lru
+        # The handles are owned by the robot.
+        for _, lazyfile in items:
+            new._do_close[lazyfile.filepath] = True
+        return new
+
+    @classmethod
+    def _open_files(cls, filepaths, num_workers=1):
+        """
+        Open the files in `filepaths` with abiopen using a pool of `num_workers` threads.
+        The netcdf library is not thread-safe hence netcdf files are still opened one at a time (see _NCLOCK).
+        The threads read and validate the header of the netcdf files without holding the lock
+        (so that invalid files are rejected and the latency of the first read is overlapped)
+        and open the text files (e.g. DDB or abo files) concurrently.
+        See :func:`benchmark_open_files`.
+
+        Return:
+            (items, exceptions) where items is a list of (filepath, abifile) tuples
+            in the same order as `filepaths` and exceptions is a list of strings with
+            the errors raised by the files that could not be opened.
+        """
+        from abipy.abilab import abiopen
+
+        def open_file(path):
+            try:
+                if path.endswith(".nc"): _check_netcdf_header(path)
+                with _get_file_lock(path):
+                    return abiopen(path), None
+            except Exception as exc:
+                return None, "Cannot open %s:\n%s" % (path, str(exc))
+
+        if num_workers is None:
+            from monty.dev import get_ncpus
+            num_workers = get_ncpus()
+        num_workers = max(1, min(num_workers, len(filepaths)))
+
+        if num_workers == 1:
+            results = [open_file(path) for path in filepaths]
+        else:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(num_workers)
+            try:
+                # map preserves the order of filepaths.
+                results = pool.map(open_file, filepaths, chunksize=1)
+            finally:
+                pool.close()
+                pool.join()
+
+        items, exceptions = [], []
+        for abifile, exc in results:
+            if exc is not None:
+                cprint(exc, "red")
+                exceptions.append(exc)
+            elif abifile is not None:
+                items.append((abifile.filepath, abifile))
+
+        return items, exceptions
+
+    @classmethod
+    def _open_files_in_dir(cls, top, walk, num_workers=1):
+        """Open files in directory tree starting from `top`. Return list of Abinit files."""
+        return cls._open_files(cls._find_files_in_dir(top, walk), num_workers=num_workers)[0]
 
     @classmethod
     def class_handles_filename(cls, filename):
@@ -155,17 +295,27 @@ class Robot(NotebookWriter):
                 filename.endswith("." + cls.EXT))  # This for .abo
 
     @classmethod
-    def from_files(cls, filenames, labels=None, abspath=False):
+    def from_files(cls, filenames, labels=None, abspath=False, max_open_files=None):
         """
         Build a Robot from a list of `filenames`.
         if labels is None, labels are automatically generated from absolute paths.
 
         Args:
             abspath: True if paths in index should be absolute. Default: Relative to `top`.
+            max_open_files: If not None, files are opened on demand and at most ``max_open_files``
+                files are kept open at the same time. See :class:`OpenFilesLRU`.
         """
         filenames = list_strings(filenames)
         from abipy.abilab import abiopen
         filenames = [f for f in filenames if cls.class_handles_filename(f)]
+        if max_open_files is not None:
+            new = cls()
+            new._lru = OpenFilesLRU(max_open_files)
+            for i, f in enumerate(filenames):
+                new.add_file(os.path.abspath(f) if labels is None else labels[i], f)
+            if labels is None and not abspath: new.trim_paths(start=None)
+            return new
+
         items = []
         for i, f in enumerate(filenames):
             try:
@@ -276,23 +426,32 @@ class Robot(NotebookWriter):
 
             self.add_file(label, filepath)
 
-    def scan_dir(self, top, walk=True):
+    def scan_dir(self, top, walk=True, num_workers=1):
         """
         Scan directory tree starting from ``top``. Add files to the robot instance.
 
         Args:
             top (str): Root directory
             walk: if True, directories inside ``top`` are included as well.
+            num_workers: Number of threads used to open the files. None to use all the CPUs.
+                Netcdf files are opened one at a time (see :meth:`_open_files`).
 
         Return:
             Number of files found.
-	"""
-        count = 0
-        for filepath, abifile in self.__class__._open_files_in_dir(top, walk):
-            count += 1
+        """
+        filepaths = self._find_files_in_dir(top, walk)
+        if self._lru is not None:
+            # Files are opened on demand.
+            for filepath in filepaths:
+                self.add_file(os.path.abspath(filepath), filepath)
+            return len(filepaths)
+
+        items, exceptions = self.__class__._open_files(filepaths, num_workers=num_workers)
+        self._exceptions.extend(exceptions)
+        for filepath, abifile in items:
             self.add_file(filepath, abifile)
 
-        return count
+        return len(items)
 
     def add_file(self, label, abifile, filter_abifile=None):
         """
@@ -305,7 +464,14 @@ class Robot(NotebookWriter):
             filter_abifile: Function that receives an ``abifile`` object and returns
                 True if the file should be added to the plotter.
         """
-        if is_string(abifile):
+        if is_string(abifile) and self._lru is not None:
+            abifile = LazyAbiFile(abifile, self._lru)
+            if filter_abifile is not None and not filter_abifile(abifile):
+                abifile.close()
+                return
+            self._do_close[abifile.filepath] = True
+
+        elif is_string(abifile):
             from abipy.abilab import abiopen
             abifile = abiopen(abifile)
             if filter_abifile is not None and not filter_abifile(abifile):
@@ -663,10 +829,12 @@ Expecting callable or attribute name or key in abifile.params""" % (type(hue), s
             if self._do_close.pop(abifile.filepath, False):
                 try:
                     abifile.close()
-                except:
+                except Exception as exc:
                     print("Exception while closing: ", abifile.filepath)
                     print(exc)
 
+        if self._lru is not None: self._lru.close()
+
     #@classmethod
     #def open(cls, obj, nids=None, **kwargs):
     #    """
@@ -711,15 +879,8 @@ Expecting callable or attribute name or key in abifile.params""" % (type(hue), s
         """
         Execute list of callable functions. Each function receives arg as argument.
         """
-        if not isinstance(funcs, (list, tuple)): funcs = [funcs]
-        d = {}
-        for func in funcs:
-            try:
-                key, value = func(arg)
-                d[key] = value
-            except Exception as exc:
-                cprint("Exception: %s" % str(exc), "red")
-                self._exceptions.append(str(exc))
+        d, exceptions = _exec_funcs_with_arg(funcs, arg)
+        self._exceptions.extend(exceptions)
         return d
 
     @staticmethod
@@ -755,21 +916,122 @@ Expecting callable or attribute name or key in abifile.params""" % (type(hue), s
         dfs = self.get_structure_dataframes(**kwargs)
         return dfs.coords
 
-    def get_params_dataframe(self, abspath=False):
+    def _map_abifiles(self, func, abifiles, num_workers=1, executor=None):
+        """
+        Apply ``func`` to the files in ``abifiles`` and return the list of results in the same order.
+
+        Args:
+            func: Function that receives an ``abifile`` object.
+            abifiles: List of files.
+            num_workers: Number of workers. 1 for serial execution, None to use all the CPUs.
+            executor: "threads" to use a pool of threads, "processes" to use a pool of processes.
+                None to use processes if ``abifiles`` contains netcdf files and threads otherwise.
+                The netcdf library is not thread-safe hence the threads process netcdf files one at a time
+                (see _NCLOCK). Threads are useful only for text files (e.g. abo files).
+                With processes, ``func`` must be picklable (e.g. module-level function or functools.partial)
+                and each worker reopens the file from its path.
+        """
+        if executor is None:
+            executor = "processes" if any(f.filepath.endswith(".nc") for f in abifiles) else "threads"
+        if executor not in ("threads", "processes"):
+            raise ValueError("Invalid executor: %s" % str(executor))
+        if num_workers is None:
+            from monty.dev import get_ncpus
+            num_workers = get_ncpus()
+        num_workers = max(1, min(num_workers, len(abifiles)))
+
+        def call(abifile):
+            # Lazy files are pinned so that the LRU does not remove them while func is running.
+            with _get_file_lock(abifile.filepath):
+                if not isinstance(abifile, LazyAbiFile): return func(abifile)
+                with abifile.pinned() as real_abifile:
+                    return func(real_abifile)
+
+        if num_workers == 1:
+            return [call(abifile) for abifile in abifiles]
+
+        if executor == "threads":
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(num_workers)
+            target, args = call, abifiles
+        else:
+            from multiprocessing import Pool
+            pool = Pool(num_workers)
+            target, args = _call_with_abifile, [(func, abifile.filepath) for abifile in abifiles]
+
+        try:
+            # map preserves the order of the input list.
+            return pool.map(target, args, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _get_summaries(self, key, func, num_workers=1, executor=None):
+        """
+        Return list with the output of ``func(abifile)`` for all the files in the robot.
+        If ``metadata_index`` is set, the values computed for files that have not been changed
+        are taken from the index and ``func`` is called only for the new/modified files.
+
+        Args:
+            key: String identifying the quantity computed by ``func`` (must be different
+                if the function returns different data e.g. if it depends on arguments).
+            func: Function that receives an ``abifile`` object. Must return a picklable object.
+            num_workers, executor: Options passed to :meth:`_map_abifiles`.
+        """
+        abifiles = self.abifiles
+        index = self.metadata_index
+        if index is None:
+            return self._map_abifiles(func, abifiles, num_workers=num_workers, executor=executor)
+
+        key = "%s.%s" % (self.__class__.__name__, key)
+        summaries, todo = [], []
+        for i, abifile in enumerate(abifiles):
+            try:
+                summaries.append(index.get(abifile.filepath, key))
+            except KeyError:
+                summaries.append(None)
+                todo.append(i)
+
+        values = self._map_abifiles(func, [abifiles[i] for i in todo], num_workers=num_workers, executor=executor)
+        try:
+            for i, value in zip(todo, values):
+                index.put(abifiles[i].filepath, key, value)
+                summaries[i] = value
+        finally:
+            index.commit()
+
+        return summaries
+
+    def _exec_funcs_map(self, funcs, num_workers=1, executor=None):
+        """
+        Execute :meth:`_exec_funcs` for all the files in the robot with ``num_workers`` workers
+        (see :meth:`_map_abifiles` for ``executor``). With processes, ``funcs`` must be picklable.
+        Return list of dictionaries in the same order as ``self.abifiles``.
+        """
+        results = self._map_abifiles(partial(_exec_funcs_with_arg, funcs), self.abifiles,
+                                     num_workers=num_workers, executor=executor)
+        dicts = []
+        for d, exceptions in results:
+            self._exceptions.extend(exceptions)
+            dicts.append(d)
+
+        return dicts
+
+    def get_params_dataframe(self, abspath=False, num_workers=1, executor=None):
         """
         Return |pandas-DataFrame| with the most important parameters.
         that are usually subject to convergence studies.
 
         Args:
             abspath: True if paths in index should be absolute. Default: Relative to `top`.
+            num_workers: Number of workers used to extract the data. None to use all the CPUs.
+            executor: "threads" or "processes". None to use processes for netcdf files.
         """
+        summaries = self._get_summaries("params", _get_params, num_workers=num_workers, executor=executor)
         rows, row_names = [], []
-        for label, abifile in self.items():
-            if not hasattr(abifile, "params"):
-                import warnings
-                warnings.warn("%s does not have `params` attribute" % type(abifile))
-                break
-            rows.append(abifile.params)
+        for label, params in zip(self.labels, summaries):
+            if params is None: break
+            rows.append(params)
             row_names.append(label)
 
         row_names = row_names if abspath else self._to_relpaths(row_names)
@@ -1038,6 +1300,87 @@ Expecting callable or attribute name or key in abifile.params""" % (type(hue), s
         ]
 
 
+def benchmark_open_files(robot_cls, filepath, nfiles=100, num_workers=(1, 2, 4), repeat=1):
+    """
+    Benchmark :meth:`Robot.from_dir` with different numbers of threads.
+    ``nfiles`` copies of ``filepath`` are written in a temporary directory (one subdirectory per file).
+
+    Args:
+        robot_cls: Robot subclass e.g. GsrRobot.
+        filepath: File used to generate the copies. Must be handled by ``robot_cls``.
+        nfiles: Number of copies.
+        num_workers: List with the number of threads.
+        repeat: The wall-time is the minimum over ``repeat`` executions.
+
+    Return: |pandas-DataFrame| with the wall-time in seconds.
+    """
+    import time
+    import shutil
+    import tempfile
+    import pandas as pd
+
+    top = tempfile.mkdtemp()
+    try:
+        basename = os.path.basename(filepath)
+        for i in range(nfiles):
+            dirpath = os.path.join(top, "w%d" % i)
+            os.mkdir(dirpath)
+            shutil.copy(filepath, os.path.join(dirpath, basename))
+
+        rows = []
+        for nw in num_workers:
+            times = []
+            for i in range(repeat):
+                start = time.time()
+                robot = robot_cls.from_dir(top, num_workers=nw)
+                times.append(time.time() - start)
+                nopen = len(robot)
+                robot.close()
+            rows.append(dict(robot=robot_cls.__name__, nfiles=nfiles, num_workers=nw, nopen=nopen, time=min(times)))
+    finally:
+        shutil.rmtree(top)
+
+    return pd.DataFrame(rows, columns=["robot", "nfiles", "num_workers", "nopen", "time"])
+
+
+def _get_params(abifile):
+    """Return the parameters of the file. None if the file does not have `params`."""
+    if not hasattr(abifile, "params"):
+        import warnings
+        warnings.warn("%s does not have `params` attribute" % type(abifile))
+        return None
+    return abifile.params
+
+
+def _exec_funcs_with_arg(funcs, arg):
+    """
+    Execute list of callable functions. Each function receives arg as argument and returns (key, value).
+    Return (dict, exceptions) where exceptions is a list of strings with the errors.
+    Used by Robot._exec_funcs and Robot._exec_funcs_map.
+    """
+    if not isinstance(funcs, (list, tuple)): funcs = [funcs]
+    d, exceptions = {}, []
+    for func in funcs:
+        try:
+            key, value = func(arg)
+            d[key] = value
+        except Exception as exc:
+            cprint("Exception: %s" % str(exc), "red")
+            exceptions.append(str(exc))
+    return d, exceptions
+
+
+def _call_with_abifile(args):
+    """
+    Open the file with abiopen and return func(abifile).
+    Used by Robot._map_abifiles to execute func in a different process.
+    """
+    func, filepath = args
+    from abipy.abilab import abiopen
+    with abiopen(filepath) as abifile:
+        return func(abifile)
+
+
 class HueGroup(object):
     """
     This small object is used by ``group_and_sortby`` to store information abouth the group.
@@ -1064,4 +1407,283 @@ class HueGroup(object):
 
     def __iter__(self):
         """Iterate over (label, abifile, xvalue)."""
-        return six.moves.zip(self.labels, self.abifiles, self.xvalues)
\ No newline at end of file
+        return six.moves.zip(self.labels, self.abifiles, self.xvalues)
+
+class OpenFilesLRU(object):
+    """
+    Least-recently-used cache of open abipy files.
+    At most ``maxsize`` files are kept in the cache: when a new file is requested
+    and the cache is full, the file that has not been used for the longest time is removed.
+    Used by :class:`Robot` to handle thousands of files without hitting the limit
+    on the number of file descriptors.
+
+    A file removed from the cache is closed so the objects that depend on the open file
+    (e.g. the netcdf reader) cannot be used anymore. Files used inside a ``with lru.pinned(filepath)``
+    block are never removed.
+    """
+
+    def __init__(self, maxsize):
+        """
+        Args:
+            maxsize: Maximum number of files kept open.
+        """
+        self.maxsize = max(1, int(maxsize))
+        self._files = OrderedDict()
+        # filepath --> number of pins.
+        self._pins = {}
+        # Files are opened and closed while holding the lock used for netcdf files.
+        self._lock = _NCLOCK
+        self.num_opens = 0
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, filepath):
+        return filepath in self._files
+
+    def get(self, filepath):
+        """Return the file associated to ``filepath``. Open it if not already in the cache."""
+        with self._lock:
+            abifile = self._files.pop(filepath, None)
+            if abifile is None:
+                from abipy.abilab import abiopen
+                abifile = abiopen(filepath)
+                self.num_opens += 1
+            self._files[filepath] = abifile
+            self._evict()
+
+            return abifile
+
+    @contextmanager
+    def pinned(self, filepath):
+        """
+        Context manager that returns the file associated to ``filepath``.
+        The file is not removed from the cache until the block is exited.
+        """
+        with self._lock:
+            abifile = self.get(filepath)
+            self._pins[filepath] = self._pins.get(filepath, 0) + 1
+        try:
+            yield abifile
+        finally:
+            with self._lock:
+                self._pins[filepath] -= 1
+                if not self._pins[filepath]: self._pins.pop(filepath)
+                self._evict()
+
+    def _evict(self):
+        """
+        Close the least recently used files that are not pinned until the size of the cache is <= maxsize.
+        The most recently used file is never removed.
+        """
+        for filepath in list(self._files.keys())[:-1]:
+            if len(self._files) <= self.maxsize: break
+            if filepath in self._pins: continue
+            self._files.pop(filepath).close()
+
+    def discard(self, filepath):
+        """Close the file associated to ``filepath`` if open."""
+        with self._lock:
+            abifile = self._files.pop(filepath, None)
+            if abifile is not None: abifile.close()
+
+    def close(self):
+        """Close all the files in the cache."""
+        with self._lock:
+            while self._files:
+                self._files.popitem(last=False)[1].close()
+
+
+class LazyAbiFile(object):
+    """
+    Proxy for an abipy file opened on demand through a :class:`OpenFilesLRU`.
+    Attribute access is delegated to the real file object so that the robot methods work unchanged.
+    Note that the file is closed when it is removed from the LRU so the objects computed by the file
+    (e.g. lazy properties) are lost and the objects that read data from the file (e.g. the reader)
+    become invalid. Use ``pinned`` to keep the file open.
+    """
+
+    def __init__(self, filepath, lru):
+        self._filepath = os.path.abspath(filepath)
+        self._lru = lru
+
+    @property
+    def filepath(self):
+        """Absolute path of the file."""
+        return self._filepath
+
+    @property
+    def relpath(self):
+        """Relative path."""
+        try:
+            return os.path.relpath(self.filepath)
+        except OSError:
+            return self.filepath
+
+    @property
+    def basename(self):
+        """Basename of the file."""
+        return os.path.basename(self.filepath)
+
+    @property
+    def is_open(self):
+        """True if the file is currently in the LRU."""
+        return self._filepath in self._lru
+
+    def get_abifile(self):
+        """Return the real abipy file. Open it if needed."""
+        return self._lru.get(self._filepath)
+
+    def pinned(self):
+        """
+        Context manager that returns the real abipy file and keeps it in the LRU until the block is exited.
+
+        .. code-block:: python
+
+            with lazyfile.pinned() as abifile:
+                print(abifile.ebands)
+        """
+        return self._lru.pinned(self._filepath)
+
+    def __getattr__(self, name):
+        # Invoked only if name is not found with the usual mechanism.
+        if name.startswith("__") or name in ("_filepath", "_lru"): raise AttributeError(name)
+        return getattr(self.get_abifile(), name)
+
+    def __repr__(self):
+        return "<%s, %s>" % (self.__class__.__name__, self.relpath)
+
+    def __str__(self):
+        return str(self.get_abifile())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the underlying file. It will be reopened on demand."""
+        self._lru.discard(self._filepath)
+
+
+class RobotIndex(object):
+    """
+    Persistent index with the data extracted by the robots from the files (e.g. the rows of the dataframes).
+    Entries are stored in a SQLite database and are keyed by the absolute path of the file
+    and by a string identifying the quantity. An entry is automatically invalidated
+    if the size or the modification time of the file change so that rebuilding
+    a dataframe only requires reading the files that have been changed.
+
+    Usage example:
+
+    .. code-block:: python
+
+        with GsrRobot.from_dir(".", max_open_files=10) as robot:
+            robot.metadata_index = RobotIndex()
+            df = robot.get_dataframe()
+    """
+    # Increase this number if the format of the entries changes.
+    VERSION = 1
+
+    def __init__(self, filepath=None):
+        """
+        Args:
+            filepath: Path of the SQLite database. Default: ~/.abinit/abipy/robot_index.db
+        """
+        import sqlite3
+        import threading
+        if filepath is None:
+            filepath = os.path.join(os.path.expanduser("~"), ".abinit", "abipy", "robot_index.db")
+        self.filepath = os.path.abspath(os.path.expanduser(filepath))
+        dirname = os.path.dirname(self.filepath)
+        if not os.path.exists(dirname): os.makedirs(dirname)
+
+        self._conn = sqlite3.connect(self.filepath, timeout=60, check_same_thread=False)
+        self._conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+            path TEXT NOT NULL, key TEXT NOT NULL, size INTEGER, mtime REAL, version INTEGER, value BLOB,
+            PRIMARY KEY (path, key))""")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.num_hits, self.num_misses = 0, 0
+
+    @classmethod
+    def from_flow(cls, flow):
+        """Build an index stored in the working directory of the |Flow|."""
+        return cls(os.path.join(flow.workdir, "robot_index.db"))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __str__(self):
+        return self.to_string()
+
+    def to_string(self, verbose=0):
+        """String representation."""
+        lines = ["Robot index: %s" % self.filepath,
+                 "Number of entries: %d" % len(self),
+                 "Hits: %d, Misses: %d" % (self.num_hits, self.num_misses)]
+        return "\n".join(lines)
+
+    def get(self, filepath, key):
+        """
+        Return the value associated to (``filepath``, ``key``).
+        Raise KeyError if the entry is not present or if the file has been modified.
+        """
+        from six.moves import cPickle as pickle
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime, version, value FROM entries WHERE path=? AND key=?",
+                                     (filepath, key)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime and row[2] == self.VERSION:
+            try:
+                value = pickle.loads(bytes(row[3]))
+                self.num_hits += 1
+                return value
+            except Exception:
+                pass
+
+        self.num_misses += 1
+        raise KeyError("%s: %s" % (filepath, key))
+
+    def put(self, filepath, key, value):
+        """
+        Store ``value`` for (``filepath``, ``key``). Changes are written to disk by :meth:`commit`.
+        """
+        import sqlite3
+        from six.moves import cPickle as pickle
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        # Protocol 2 so that the database can be shared by py2 and py3.
+        blob = sqlite3.Binary(pickle.dumps(value, protocol=2))
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                               (filepath, key, stat.st_size, stat.st_mtime, self.VERSION, blob))
+
+    def commit(self):
+        """Write pending changes to disk."""
+        with self._lock:
+            self._conn.commit()
+
+    def remove_stale(self):
+        """Remove the entries associated to files that do not exist anymore. Return number of entries removed."""
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT DISTINCT path FROM entries")]
+            stale = [(p,) for p in paths if not os.path.exists(p)]
+            self._conn.executemany("DELETE FROM entries WHERE path=?", stale)
+            self._conn.commit()
+        return len(stale)
+
+    def clear(self):
+        """Remove all the entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        """Commit pending changes and close the database."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -1,8 +1,12 @@
 """Tests for htc.FilesFile."""
 from __future__ import print_function, division, unicode_literals
 
+import os
+import tempfile
+
 from abipy.core.testing import AbipyTest
-from abipy.abio.abivars_db import get_abinit_variables, abinit_help, docvar
+from abipy.abio.abivars_db import (get_abinit_variables, abinit_help, docvar, VariableDatabase, DB_FORMAT_VERSION,
+    repr_html_from_abinit_string)
 
 
 class AbinitVariableDatabaseTest(AbipyTest):
@@ -62,3 +66,91 @@ class AbinitVariableDatabaseTest(AbipyTest):
 
         ecut_var = docvar("ecut")
         assert ecut_var.name == "ecut"
+
+    def test_dbfile(self):
+        """Testing prebuilt database file."""
+        database = get_abinit_variables()
+        tmpdir = tempfile.mkdtemp()
+        dbpath = os.path.join(tmpdir, "abinit_vars.db")
+        database.to_dbfile(dbpath, yaml_sha1="foo")
+        assert os.listdir(tmpdir) == ["abinit_vars.db"]
+
+        new = VariableDatabase.from_dbfile(dbpath)
+        assert new.yaml_sha1 == "foo"
+        assert len(new) == len(database) and list(new.keys()) == list(database.keys())
+        assert "ecut" in new and "foobar" not in new
+        # Variables are read only when needed.
+        assert not new._vars
+        ecut_var = new["ecut"]
+        assert list(new._vars.keys()) == ["ecut"]
+        assert ecut_var.name == "ecut" and ecut_var.info == database["ecut"].info
+        assert repr(new["spinat"].dimensions) == repr(database["spinat"].dimensions)
+        with self.assertRaises(KeyError):
+            new["foobar"]
+
+        assert new.sections == database.sections
+        assert new.name2section == database.name2section
+
+        # apropos uses the inverted index. Results should be equal to those obtained with a linear search.
+        for varname in ("ecut", "natom", "[[nband]]"):
+            vlist = new.apropos(varname)
+            assert [v.name for v in vlist] == [v.name for v in database.values() if
+                (v.text and varname in v.text or
+                (v.dimensions is not None and varname in str(v.dimensions)) or
+                (v.requires is not None and varname in v.requires) or
+                (v.excludes is not None and varname in v.excludes))]
+        assert "ecut" in [v.name for v in new.apropos("ecutsm")]
+
+        # Files with a different format version are rejected.
+        with open(dbpath, "rb") as fh:
+            lines = fh.readlines()
+        lines[0] = lines[0].replace(b'"format_version":%d' % DB_FORMAT_VERSION, b'"format_version":-1')
+        with open(dbpath, "wb") as fh:
+            fh.writelines(lines)
+        with self.assertRaises(ValueError):
+            VariableDatabase.from_dbfile(dbpath)
+
+    def test_prebuilt_dbfile(self):
+        """Testing that the prebuilt database is used only if it matches the YAML file."""
+        import hashlib
+        import shutil
+        from abipy.abio import abivars_db
+        dirpath = abivars_db._VARIABLES_DIRPATH
+        with open(os.path.join(dirpath, "abinit_vars.yml"), "rb") as fh:
+            yaml_sha1 = hashlib.sha1(fh.read()).hexdigest()
+        # The database shipped with abipy must be regenerated (see update.py) when the YAML file changes.
+        assert VariableDatabase.from_dbfile(os.path.join(dirpath, "abinit_vars.db")).yaml_sha1 == yaml_sha1
+
+        # A stale prebuilt database is ignored and the database is rebuilt from the YAML file.
+        tmpdir = tempfile.mkdtemp()
+        for basename in ("abinit_vars.yml", "sections.yml", "characteristics.yml"):
+            shutil.copy(os.path.join(dirpath, basename), tmpdir)
+        get_abinit_variables().to_dbfile(os.path.join(tmpdir, "abinit_vars.db"), yaml_sha1="foo")
+        old_database, old_home = abivars_db.__dict__["__VARS_DATABASE"], os.environ.get("HOME")
+        try:
+            abivars_db._VARIABLES_DIRPATH = tmpdir
+            abivars_db.__dict__["__VARS_DATABASE"] = None
+            os.environ["HOME"] = tmpdir
+            database = get_abinit_variables()
+            assert database.yaml_sha1 != "foo" and "ecut" in database
+            # The rebuilt database is cached with the SHA1 of the YAML file.
+            cache_path = os.path.join(tmpdir, ".abinit", "abipy", "abinit_vars_v%d.db" % DB_FORMAT_VERSION)
+            assert VariableDatabase.from_dbfile(cache_path).yaml_sha1 == yaml_sha1
+        finally:
+            abivars_db._VARIABLES_DIRPATH = dirpath
+            abivars_db.__dict__["__VARS_DATABASE"] = old_database
+            if old_home is not None: os.environ["HOME"] = old_home
+            shutil.rmtree(tmpdir)
+
+    def test_repr_html_from_abinit_string(self):
+        """Testing repr_html_from_abinit_string."""
+        database = get_abinit_variables()
+        html = repr_html_from_abinit_string("ecut 10\nkptopt 1\nkpt 0 0 0\nfoo 1")
+        assert html.count("<br>") == 3
+        assert database["ecut"].html_link(label="ecut") in html
+        # The longest name should be matched.
+        assert database["kptopt"].html_link(label="kptopt") in html
+        assert database["kpt"].html_link(label="kpt") + " 0 0 0" in html
+        assert html.endswith("<br>foo 1")
+        # The matcher is reused.
+        assert repr_html_from_abinit_string("ecut 10\nkptopt 1\nkpt 0 0 0\nfoo 1") == html
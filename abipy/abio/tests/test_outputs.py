@@ -35,6 +35,13 @@ class AbinitOutputTest(AbipyTest):
             assert abo.run_completed
             assert not abo.dryrun_mode
             assert abo.ndtset == 2
+            assert list(abo.datasets.keys()) == [1, 2]
+            assert abo.datasets[1].startswith("== DATASET  1 ")
+            assert abo.datasets[2].startswith("== DATASET  2 ")
+            assert abo.footer.startswith("== END DATASET(S) ")
+            assert "-outvars: echo values of preprocessed input variables" in abo.header
+            assert abo.header + abo.datasets[1] + abo.datasets[2] + abo.footer == open(abo_path).read()
+            assert abo.initial_vars_global["ecut"] == "6.00000000E+00 Hartree"
             assert abo.has_same_initial_structures
             assert abo.has_same_final_structures
             assert len(abo.initial_structures) == 2
@@ -70,6 +77,20 @@ class AbinitOutputTest(AbipyTest):
             abo.seek(0)
             assert abo.next_d2de_scf_cycle() is None
 
+            # Indexed access to the SCF cycles.
+            assert abo.num_gs_scf_cycles == 1 and abo.num_d2de_scf_cycles == 0
+            cycle0 = abo.get_gs_scf_cycle(0)
+            assert cycle0.num_iterations == gs_cycle.num_iterations
+            for key, values in gs_cycle.items():
+                self.assert_equal(cycle0[key], values)
+            assert "iter" not in cycle0
+            assert abo.get_gs_scf_cycle(-1).num_iterations == cycle0.num_iterations
+            assert len(abo.get_gs_scf_cycles()) == 1
+            assert not abo.get_d2de_scf_cycles()
+            assert len(abo.get_relaxation()) == 1
+            with self.assertRaises(IndexError):
+                abo.get_gs_scf_cycle(1)
+
             timer = abo.get_timer()
             assert len(timer) == 1
             assert str(timer.summarize())
@@ -105,6 +126,11 @@ class AbinitOutputTest(AbipyTest):
              assert gs_cycle is not None
              ph_cycle = abo.next_d2de_scf_cycle()
              assert ph_cycle is not None
+             assert abo.num_gs_scf_cycles == 1 and abo.num_d2de_scf_cycles == 3
+             for key, values in ph_cycle.items():
+                 self.assert_equal(abo.get_d2de_scf_cycle(0)[key], values)
+             assert [c.num_iterations for c in abo.get_d2de_scf_cycles()] == \
+                    [abo.get_d2de_scf_cycle(i).num_iterations for i in range(3)]
              if self.has_matplotlib():
                 assert ph_cycle.plot(show=False)
                 assert abo.compare_d2de_scf_cycles([abo_path], show=False)
@@ -191,5 +217,9 @@ class AbinitOutputTest(AbipyTest):
             time_df = robot.get_time_dataframe()
             self.assert_equal(time_df["overall_walltime"].values, [4.0, 26.1])
 
+            gs_cycles = robot.get_gs_scf_cycles()
+            assert [len(cycles) for cycles in gs_cycles] == [1, 1]
+            assert [len(cycles) for cycles in robot.get_d2de_scf_cycles(num_workers=2)] == [0, 3]
+
             if self.has_nbformat():
                 robot.write_notebook(nbpath=self.get_tmpname(text=True))
@@ -4,11 +4,20 @@ from __future__ import unicode_literals, division, print_function
 
 import sys
 import os
+import shutil
 import abipy.data as abidata
 import abipy.abilab as abilab
 
 from abipy.core.testing import AbipyTest
-from abipy.abio.robots import Robot
+from abipy.abio.robots import Robot, RobotIndex, benchmark_open_files
+
+
+def _get_nband(gsr):
+    return "nband", gsr.ebands.nband
+
+
+def _raise_error(gsr):
+    raise ValueError("func failed")
 
 
 class RobotTest(AbipyTest):
@@ -36,3 +45,169 @@ class RobotTest(AbipyTest):
 
         if self.has_nbformat():
             assert robot.get_baserobot_code_cells()
+
+    def test_from_dir_with_threads(self):
+        """Testing Robot.from_dir with num_workers > 1 and files that cannot be opened."""
+        top = self.mkdtemp()
+        src = abidata.ref_file("si_scf_GSR.nc")
+        for i in range(6):
+            dirpath = os.path.join(top, "w%d" % (5 - i))
+            os.mkdir(dirpath)
+            shutil.copy(src, os.path.join(dirpath, "out_GSR.nc"))
+        # Add a corrupted file.
+        with open(os.path.join(top, "w0", "broken_GSR.nc"), "wt") as fh:
+            fh.write("This is not a netcdf file")
+
+        with abilab.GsrRobot.from_dir(top) as serial_robot, \
+             abilab.GsrRobot.from_dir(top, num_workers=4) as robot:
+            assert len(robot) == 6
+            assert robot.labels == serial_robot.labels
+            assert robot.labels == [os.path.join("w%d" % i, "out_GSR.nc") for i in range(6)]
+            assert len(robot.exceptions) == 1 and "broken_GSR.nc" in robot.exceptions[0]
+
+        with abilab.GsrRobot.from_dir_glob(os.path.join(top, "w*"), num_workers=None) as robot:
+            assert len(robot) == 6 and len(robot.exceptions) == 1
+
+        with abilab.GsrRobot() as robot:
+            assert robot.scan_dir(os.path.join(top, "w1"), num_workers=2) == 1
+
+        # Netcdf files are accessed by one thread at a time.
+        from abipy.abio.robots import _get_file_lock, _NCLOCK
+        assert _get_file_lock(src) is _NCLOCK
+        assert _get_file_lock("run.abo") is not _NCLOCK
+
+        # The header of the netcdf files is validated without the netcdf library.
+        from abipy.abio.robots import _check_netcdf_header
+        _check_netcdf_header(src)
+        with self.assertRaises(ValueError):
+            _check_netcdf_header(os.path.join(top, "w0", "broken_GSR.nc"))
+
+    def test_benchmark_open_files(self):
+        """Testing the benchmark of Robot.from_dir."""
+        df = benchmark_open_files(abilab.GsrRobot, abidata.ref_file("si_scf_GSR.nc"), nfiles=4, num_workers=[1, 2])
+        assert list(df["num_workers"]) == [1, 2]
+        assert all(df["nopen"] == 4) and all(df["time"] > 0)
+
+    def test_robot_with_max_open_files(self):
+        """Testing robot with lazy files and LRU of open files."""
+        from abipy.abio.robots import LazyAbiFile
+        filepaths = [abidata.ref_file("si_scf_GSR.nc"), abidata.ref_file("si_nscf_GSR.nc")]
+
+        with abilab.GsrRobot.from_files(filepaths) as ref_robot, \
+             abilab.GsrRobot.from_files(filepaths, max_open_files=1) as robot:
+            assert robot.labels == ref_robot.labels
+            assert all(isinstance(abifile, LazyAbiFile) for abifile in robot.abifiles)
+            assert robot._lru.num_opens == 0
+            for ref, abifile in zip(ref_robot.abifiles, robot.abifiles):
+                assert abifile.filepath == ref.filepath
+                assert abifile.energy == ref.energy
+                assert len(robot._lru) == 1 and abifile.is_open
+            assert not robot.abifiles[0].is_open
+            assert robot._lru.num_opens == 2
+            assert robot.abifiles[0].structure == ref_robot.abifiles[0].structure
+            assert robot._lru.num_opens == 3
+
+            df = robot.get_dataframe()
+            ref_df = ref_robot.get_dataframe()
+            self.assert_equal(df["energy"].values, ref_df["energy"].values)
+
+        assert len(robot._lru) == 0
+
+    def test_lru_eviction(self):
+        """Testing that files removed from the LRU are closed unless they are pinned."""
+        filepaths = [abidata.ref_file("si_scf_GSR.nc"), abidata.ref_file("si_nscf_GSR.nc")]
+
+        with abilab.GsrRobot.from_files(filepaths, max_open_files=1) as robot:
+            lazy0, lazy1 = robot.abifiles
+            gsr0 = lazy0.get_abifile()
+            nband = gsr0.reader.read_dimvalue("max_number_of_states")
+            # Opening the second file closes the first one even if it is still referenced.
+            assert lazy1.energy is not None
+            assert not lazy0.is_open and len(robot._lru) == 1
+            num_opens = robot._lru.num_opens
+            assert lazy0.get_abifile() is not gsr0 and robot._lru.num_opens == num_opens + 1
+
+            # Pinned files are not removed from the LRU.
+            with lazy1.pinned() as gsr1:
+                assert lazy0.energy is not None
+                assert len(robot._lru) == 2 and lazy1.is_open
+                assert gsr1.reader.read_dimvalue("max_number_of_states") == nband
+            assert len(robot._lru) == 1 and lazy0.is_open
+
+        assert len(robot._lru) == 0
+
+    def test_robot_index(self):
+        """Testing RobotIndex."""
+        top = self.mkdtemp()
+        filepaths = []
+        for i, basename in enumerate(["si_scf_GSR.nc", "si_nscf_GSR.nc"]):
+            filepaths.append(os.path.join(top, "w%d_GSR.nc" % i))
+            shutil.copy(abidata.ref_file(basename), filepaths[-1])
+
+        index = RobotIndex(os.path.join(top, "index.db"))
+        assert len(index) == 0
+        with self.assertRaises(KeyError):
+            index.get(filepaths[0], "foo")
+        index.put(filepaths[0], "foo", {"bar": 1})
+        index.commit()
+        assert index.get(filepaths[0], "foo") == {"bar": 1}
+
+        with abilab.GsrRobot.from_files(filepaths) as robot:
+            ref_df = robot.get_dataframe()
+            robot.metadata_index = index
+            df = robot.get_dataframe()
+            assert index.num_misses == 3 and index.num_hits == 1
+            df = robot.get_dataframe()
+            assert index.num_misses == 3 and index.num_hits == 3
+            self.assert_equal(df["energy"].values, ref_df["energy"].values)
+            assert list(df.index) == list(ref_df.index)
+            params_df = robot.get_params_dataframe()
+            assert index.num_misses == 5
+
+        # Modify the mtime of one file. The entry must be recomputed.
+        os.utime(filepaths[1], (1, 1))
+        with abilab.GsrRobot.from_files(filepaths, max_open_files=1) as robot:
+            robot.metadata_index = index
+            robot.get_dataframe()
+            assert index.num_misses == 6 and index.num_hits == 4
+            assert not robot.abifiles[0].is_open
+
+        os.remove(filepaths[0])
+        assert index.remove_stale() == 3
+        index.clear()
+        assert len(index) == 0
+        index.close()
+
+    def test_parallel_dataframes(self):
+        """Testing robot dataframes built with num_workers > 1."""
+        filepaths = [abidata.ref_file("si_scf_GSR.nc"), abidata.ref_file("si_nscf_GSR.nc")]
+        # funcs must be picklable since the netcdf files are processed with processes by default.
+        funcs = _get_nband
+
+        with abilab.GsrRobot.from_files(filepaths) as robot:
+            ref_df = robot.get_dataframe(funcs=funcs)
+            for executor in (None, "threads", "processes"):
+                df = robot.get_dataframe(funcs=funcs, num_workers=2, executor=executor)
+                assert list(df.index) == list(ref_df.index)
+                assert list(df.columns) == list(ref_df.columns)
+                self.assert_equal(df["energy"].values, ref_df["energy"].values)
+                self.assert_equal(df["nband"].values, ref_df["nband"].values)
+
+            pdf = robot.get_params_dataframe(num_workers=2)
+            assert list(pdf.index) == list(robot.get_params_dataframe().index)
+
+            with self.assertRaises(ValueError):
+                robot.get_dataframe(num_workers=2, executor="foo")
+
+            # The exceptions raised by funcs in the workers are collected by the robot.
+            dicts = robot._exec_funcs_map([_get_nband, _raise_error], num_workers=2)
+            assert [d["nband"] for d in dicts] == list(ref_df["nband"].values)
+            assert robot.exceptions.count("func failed") == 2
+
+        # Threads with lazy files. The files are pinned in the LRU while they are used.
+        with abilab.GsrRobot.from_files(filepaths, max_open_files=1) as robot:
+            df = robot.get_dataframe(funcs=funcs, num_workers=2, executor="threads")
+            assert list(df.index) == list(ref_df.index)
+            self.assert_equal(df["energy"].values, ref_df["energy"].values)
+            self.assert_equal(df["nband"].values, ref_df["nband"].values)
+            assert len(robot._lru) == 1
@@ -1,7 +1,15 @@
 """Core objects."""
-from .kpoints import *
-from .structure import *
-from .symmetries import *
-from .gsphere import *
-from .mesh3d import *
-from .fields import *
+from abipy.core.lazyimport import install_lazy_imports
+
+# The objects are imported on first access (e.g. ``from abipy.core import Structure``)
+# so that importing abipy does not import pymatgen.
+install_lazy_imports(__name__, {
+    "abipy.core.kpoints": ["issamek", "wrap_to_ws", "wrap_to_bz", "as_kpoints", "Kpoint", "KpointList", "KpointStar",
+                           "Kpath", "IrredZone", "rc_list", "kmesh_from_mpdivs", "Ktables", "find_points_along_path"],
+    "abipy.core.structure": ["mp_match_structure", "mp_search", "cod_search", "Structure",
+                             "dataframes_from_structures"],
+    "abipy.core.symmetries": ["LatticeRotation", "AbinitSpaceGroup"],
+    "abipy.core.gsphere": ["GSphere"],
+    "abipy.core.mesh3d": ["Mesh3D", "set_fft_backend", "get_fft_backend"],
+    "abipy.core.fields": ["Density", "VxcPotential", "VhartreePotential", "VhxcPotential", "VksPotential"],
+})
@@ -24,7 +24,8 @@ class GSphere(collections.Sequence):
             lattice: Reciprocal lattice.
             kpoint: Reduced coordinates of the k-point.
             gvecs: Array with the reduced coordinates of the G-vectors.
-            istwfk: Storage option (time-reversal symmetry, see abinit variable)
+            istwfk: Storage option (time-reversal symmetry, see abinit variable).
+                If istwfk > 1, only half of the sphere is stored since :math:`c(-G-2k) = c(G)^*`.
         """
         self.ecut = ecut
         self.lattice = lattice
@@ -33,9 +34,20 @@ class GSphere(collections.Sequence):
         self._gvecs = np.reshape(np.array(gvecs), (-1, 3))
         self.npw = self.gvecs.shape[0]
 
+        # Cache with the indices of the G-vectors in the FFT meshes.
+        self._fft_indices = {}
+        # Lookup table G --> index and indices of -G (built when needed)
+        self._gtable, self._minus_gindices = None, None
+        # Indices of the G-vectors that are equal to -G-2k if istwfk > 1.
+        self._self_partners = None
+
         self.istwfk = istwfk
         if istwfk != 1:
-            raise NotImplementedError("istwfk %d is not implemented" % self.istwfk)
+            # Time-reversal storage is possible only if -k = k + G0 with G0 = -2k.
+            g0 = 2 * np.asarray(self.kpoint.frac_coords)
+            if not np.allclose(g0, np.rint(g0)):
+                raise ValueError("istwfk %d is not compatible with kpoint %s" % (istwfk, self.kpoint))
+            self._g0 = np.rint(g0).astype(np.int)
 
     @property
     def gvecs(self):
@@ -60,23 +72,65 @@ class GSphere(collections.Sequence):
         return self.gvecs.__iter__()
 
     def __contains__(self, gvec):
-        return np.asarray(gvec) in self.gvecs
+        return self._lookup(gvec)[0] != -1
 
     def index(self, gvec):
         """
         return the index of the G-vector ``gvec`` in self.
         Raises: `ValueError` if the value is not present.
         """
-        gvec = np.asarray(gvec)
-        for i, g in enumerate(self):
-            if np.all(g == gvec):
-                return i
-        else:
+        idx = self._lookup(gvec)[0]
+        if idx == -1:
             raise ValueError("Cannot find %s in Gsphere" % str(gvec))
+        return int(idx)
+
+    def indices(self, gvecs):
+        """
+        Return |numpy-array| with the indices of the G-vectors ``gvecs`` (array of shape [n, 3]) in self.
+        Raises: `ValueError` if one of the vectors is not present.
+        """
+        inds = self._lookup(gvecs)
+        if np.any(inds == -1):
+            raise ValueError("Cannot find %s in Gsphere" % str(np.reshape(gvecs, (-1, 3))[inds == -1]))
+        return inds
 
     def count(self, gvec):
         """Return number of occurrences of gvec."""
-        return np.count_nonzero(np.all(g == gvec) for g in self)
+        return int(np.count_nonzero(np.all(self.gvecs == np.asarray(gvec), axis=1)))
+
+    @property
+    def minus_gindices(self):
+        """
+        |numpy-array| with the index of -G for all the G-vectors in the sphere.
+        -1 if -G does not belong to the sphere.
+        """
+        if self._minus_gindices is None:
+            self._minus_gindices = self._lookup(-self.gvecs)
+        return self._minus_gindices
+
+    def _lookup(self, gvecs):
+        """
+        Return the indices of ``gvecs`` in the sphere, -1 if not found.
+        Uses a dense table over the box enclosing the sphere that is built the first time.
+        """
+        gvecs = np.reshape(np.asarray(gvecs, dtype=np.intp), (-1, 3))
+        if self._gtable is None:
+            if self.npw:
+                gmin, gmax = self.gvecs.min(axis=0), self.gvecs.max(axis=0)
+            else:
+                gmin, gmax = np.zeros(3, dtype=np.intp), -np.ones(3, dtype=np.intp)
+            table = np.full(gmax - gmin + 1, -1, dtype=np.intp)
+            shift = np.asarray(self.gvecs, dtype=np.intp) - gmin
+            table[shift[:, 0], shift[:, 1], shift[:, 2]] = np.arange(self.npw)
+            self._gtable = (gmin, table)
+
+        gmin, table = self._gtable
+        shift = gvecs - gmin
+        inbox = np.all((shift >= 0) & (shift < table.shape), axis=1)
+        inds = np.full(len(gvecs), -1, dtype=np.intp)
+        shift = shift[inbox]
+        inds[inbox] = table[shift[:, 0], shift[:, 1], shift[:, 2]]
+        return inds
 
     def __str__(self):
         return self.to_string()
@@ -149,77 +203,176 @@ class GSphere(collections.Sequence):
     #  """Returns the number of divisions of the FFT box enclosing the sphere."""
     #  #return ndivs
 
+    @property
+    def has_timrev_storage(self):
+        """True if only half of the G-vectors are stored (istwfk > 1)."""
+        return self.istwfk != 1
+
+    @property
+    def timrev_gvecs(self):
+        """
+        |numpy-array| with the G-vectors -G-2k that are not stored if istwfk > 1.
+        The coefficient of timrev_gvecs[i] is the complex conjugate of the coefficient of gvecs[i].
+        """
+        if not self.has_timrev_storage:
+            raise ValueError("timrev_gvecs are defined only if istwfk > 1")
+        return -self.gvecs - self._g0
+
+    def get_fft_indices(self, mesh):
+        """
+        Return |numpy-array| with the indices of the G-vectors in the flattened FFT ``mesh``
+        i.e. arr_on_mesh.ravel()[indices] gives the values on the sphere.
+        The indices depend only on the divisions of the mesh and are cached.
+        """
+        shape = tuple(mesh.shape)
+        if shape in self._fft_indices: return self._fft_indices[shape]
+
+        #do ipw=1,npw
+        #  i1=kg_k(1,ipw); if(i1<0)i1=i1+n1; i1=i1+1
+        #  i2=kg_k(2,ipw); if(i2<0)i2=i2+n2; i2=i2+1
+        #  i3=kg_k(3,ipw); if(i3<0)i3=i3+n3; i3=i3+1
+        #end do
+        indices = np.ravel_multi_index(_gvecs_to_ijk(self.gvecs, shape), shape)
+        self._fft_indices[shape] = indices
+        return indices
+
+    def get_fft_timrev_indices(self, mesh):
+        """
+        Return |numpy-array| with the indices of the vectors in ``timrev_gvecs`` in the flattened FFT ``mesh``.
+        Cached.
+        """
+        key = tuple(mesh.shape) + ("timrev",)
+        if key in self._fft_indices: return self._fft_indices[key]
+        shape = tuple(mesh.shape)
+        indices = np.ravel_multi_index(_gvecs_to_ijk(self.timrev_gvecs, shape), shape)
+        self._fft_indices[key] = indices
+        return indices
+
+    def get_rfft_indices(self, mesh):
+        """
+        Positions of the G-vectors (stored and time-reversal partners if istwfk > 1) in the flattened
+        array with shape [n1, n2, n3//2 + 1] used by the real-to-complex FFTs.
+
+        Return: (mask, indices, tr_mask, tr_indices) where mask selects the G-vectors that belong
+            to the half mesh and indices gives their positions. tr_mask, tr_indices refer to timrev_gvecs.
+            tr_mask and tr_indices are None if istwfk == 1.
+        """
+        key = tuple(mesh.shape) + ("rfft",)
+        if key in self._fft_indices: return self._fft_indices[key]
+        shape = tuple(mesh.shape)
+        half_shape = shape[:2] + (shape[2] // 2 + 1,)
+
+        def half_indices(gvecs):
+            ijk = _gvecs_to_ijk(gvecs, shape)
+            mask = ijk[2] < half_shape[2]
+            return mask, np.ravel_multi_index([i[mask] for i in ijk], half_shape)
+
+        ret = half_indices(self.gvecs)
+        ret += half_indices(self.timrev_gvecs) if self.has_timrev_storage else (None, None)
+        self._fft_indices[key] = ret
+        return ret
+
     def tofftmesh(self, mesh, arr_on_sphere):
         """
         Insert the array ``arr_on_sphere`` given on the sphere inside the FFT mesh.
 
         Args:
-            mesh:
-            arr_on_sphere:
+            mesh: |Mesh3D| object.
+            arr_on_sphere: Array of shape [..., npw]. Extra dimensions (e.g. bands, spinors) are
+                transferred at once and are reported in the output array.
+
+        Return: Array of shape [..., n1, n2, n3]. The extra dimensions are removed if
+            ``arr_on_sphere`` contains a single array.
         """
         arr_on_sphere = np.atleast_2d(arr_on_sphere)
         ishape = arr_on_sphere.shape
-        s0 = ishape[0]
         assert self.npw == ishape[-1]
+        indices = self.get_fft_indices(mesh)
 
-        arr_on_mesh = np.zeros((s0,) + mesh.shape, dtype=arr_on_sphere.dtype)
-
-        if self.istwfk == 1:
-            #do ipw=1,npw
-            #  i1=kg_k(1,ipw); if(i1<0)i1=i1+n1; i1=i1+1
-            #  i2=kg_k(2,ipw); if(i2<0)i2=i2+n2; i2=i2+1
-            #  i3=kg_k(3,ipw); if(i3<0)i3=i3+n3; i3=i3+1
-            #end do
-
-            n1, n2, n3 = mesh.shape
-            for sph_idx, gvec in enumerate(self.gvecs):
-                i1 = gvec[0]
-                if i1 < 0: i1 = i1 + n1
-                i2 = gvec[1]
-                if i2 < 0: i2 = i2 + n2
-                i3 = gvec[2]
-                if i3 < 0: i3 = i3 + n3
-                arr_on_mesh[..., i1, i2, i3] = arr_on_sphere[..., sph_idx]
-
-        else:
-            raise NotImplementedError("istwfk = %s not implemented" % self.istwfk)
+        arr_on_sphere = arr_on_sphere.reshape(-1, self.npw)
+        s0 = arr_on_sphere.shape[0]
+        arr_on_mesh = np.zeros((s0, mesh.size), dtype=arr_on_sphere.dtype)
+        if self.has_timrev_storage:
+            arr_on_mesh[:, self.get_fft_timrev_indices(mesh)] = arr_on_sphere.conj()
+        arr_on_mesh[:, indices] = arr_on_sphere
 
         if s0 == 1:
             # Reinstate input shape
-            arr_on_mesh.shape = mesh.shape
+            return arr_on_mesh.reshape(mesh.shape)
+
+        return arr_on_mesh.reshape(ishape[:-1] + tuple(mesh.shape))
+
+    def tohalfmesh(self, mesh, arr_on_sphere):
+        """
+        Insert the array ``arr_on_sphere`` in the array of shape [..., n1, n2, n3//2 + 1]
+        used by the real-to-complex FFTs (see :meth:`Mesh3D.rfft_g2r`).
+        The values of the G-vectors that are not stored are obtained from time-reversal symmetry if istwfk > 1.
+
+        Return: Array of shape [..., n1, n2, n3//2 + 1]. The extra dimensions are removed if
+            ``arr_on_sphere`` contains a single array.
+        """
+        arr_on_sphere = np.atleast_2d(arr_on_sphere)
+        ishape = arr_on_sphere.shape
+        assert self.npw == ishape[-1]
+        mask, indices, tr_mask, tr_indices = self.get_rfft_indices(mesh)
+
+        arr_on_sphere = arr_on_sphere.reshape(-1, self.npw)
+        s0 = arr_on_sphere.shape[0]
+        half_shape = tuple(mesh.shape[:2]) + (mesh.shape[2] // 2 + 1,)
+        arr_on_mesh = np.zeros((s0, np.prod(half_shape)), dtype=np.complex)
+        if self.has_timrev_storage:
+            arr_on_mesh[:, tr_indices] = arr_on_sphere[:, tr_mask].conj()
+        arr_on_mesh[:, indices] = arr_on_sphere[:, mask]
+
+        if s0 == 1:
+            return arr_on_mesh.reshape(half_shape)
+
+        return arr_on_mesh.reshape(ishape[:-1] + half_shape)
 
-        return arr_on_mesh
+    def fft_g2r(self, mesh, arr_on_sphere):
+        """
+        FFT transform of ``arr_on_sphere`` [..., npw] to real space on ``mesh``.
+        If istwfk == 2 (Gamma point with time-reversal), the function is real in real space
+        and the transform is computed with real FFTs (half of the memory and operations).
+
+        Return: Array of shape [..., n1, n2, n3]. The extra dimensions are removed if
+            ``arr_on_sphere`` contains a single array.
+        """
+        if self.istwfk == 2:
+            return mesh.rfft_g2r(self.tohalfmesh(mesh, arr_on_sphere))
+        else:
+            return mesh.fft_g2r(self.tofftmesh(mesh, arr_on_sphere))
+
+    def vdot(self, arr1, arr2):
+        """
+        Scalar product <arr1|arr2> of two arrays given on the sphere.
+        If istwfk > 1, the contribution of the G-vectors that are not stored is included.
+        """
+        cdot = np.vdot(arr1, arr2)
+        if not self.has_timrev_storage: return cdot
+
+        # Sum over the full sphere is 2 Re(sum) - the G-vectors that are equal to their partner.
+        if self._self_partners is None:
+            self._self_partners = np.nonzero(np.all(self.timrev_gvecs == self.gvecs, axis=1))[0]
+        arr1, arr2 = np.reshape(arr1, (-1, self.npw)), np.reshape(arr2, (-1, self.npw))
+        sp = self._self_partners
+        return 2 * cdot.real - np.vdot(arr1[:, sp], arr2[:, sp]).real
 
     def fromfftmesh(self, mesh, arr_on_mesh):
         """
         Transfer ``arr_on_mesh`` given on the FFT mesh to the G-sphere.
+
+        Args:
+            mesh: |Mesh3D| object.
+            arr_on_mesh: Array of shape [..., n1, n2, n3].
+
+        Return: Array of shape [s0, npw] where s0 is the product of the extra dimensions.
         """
-        indim =  arr_on_mesh.ndim
+        indim = arr_on_mesh.ndim
         arr_on_mesh = mesh.reshape(arr_on_mesh)
-        ishape = arr_on_mesh.shape
-        s0 = ishape[0]
-
-        arr_on_sphere = np.empty((s0,) + (self.npw,), dtype=arr_on_mesh.dtype)
-
-        if self.istwfk == 1:
-            #do ig=1,npwout
-            #  i1=kg_kout(1,ig); if (i1<0) i1=i1+n1; i1=i1+1
-            #  i2=kg_kout(2,ig); if (i2<0) i2=i2+n2; i2=i2+1
-            #  i3=kg_kout(3,ig); if (i3<0) i3=i3+n3; i3=i3+1
-            #end do
-            n1, n2, n3 = mesh.shape
-
-            for sph_idx, gvec in enumerate(self.gvecs):
-                i1 = gvec[0]
-                if i1 < 0: i1 = i1 + n1
-                i2 = gvec[1]
-                if i2 < 0: i2 = i2 + n2
-                i3 = gvec[2]
-                if i3 < 0: i3 = i3 + n3
-                arr_on_sphere[..., sph_idx] = arr_on_mesh[..., i1, i2, i3]
+        s0 = arr_on_mesh.shape[0]
 
-        else:
-            raise NotImplementedError("istwfk %s is not implemented" % self.istwfk)
+        arr_on_sphere = np.take(arr_on_mesh.reshape(s0, -1), self.get_fft_indices(mesh), axis=1)
 
         if s0 == 1 and indim == 1:
             # Reinstate input shape
@@ -255,6 +408,11 @@ class GSphere(collections.Sequence):
     #    return new
 
 
+def _gvecs_to_ijk(gvecs, shape):
+    """Return the indices (i, j, k) of the G-vectors ``gvecs`` in the FFT box with divisions ``shape``."""
+    return [np.where(gvecs[:, i] < 0, gvecs[:, i] + n, gvecs[:, i]) for i, n in enumerate(shape)]
+
+
 #def kpg_sphere(lattice, kcoords, ecut):
 #    """
 #    Set up the list of G vectors inside a sphere out to $ (1/2)*(2*\pi*(k+G))^2=ecut $
@@ -0,0 +1,96 @@
+# coding: utf-8
+"""
+Tools to import the objects exported by a module only when they are accessed for the first time.
+Used to reduce the startup time of abipy.abilab and of the scripts.
+This module must import only modules of the python standard library.
+"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+
+import sys
+import types
+import importlib
+
+__all__ = [
+    "import_object",
+    "install_lazy_imports",
+]
+
+
+def import_object(path):
+    """
+    Import and return the object specified by ``path``, a string in the form "module:name".
+    If ``path`` does not contain ":", the module is returned.
+    """
+    if ":" not in path:
+        return importlib.import_module(path)
+    modname, name = path.split(":")
+    return getattr(importlib.import_module(modname), name)
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module subclass that imports the objects listed in ``_lazy_name2path`` on first access.
+    The object is then stored in the module namespace so that __getattr__ is not called anymore.
+    """
+
+    def __getattr__(self, name):
+        # Invoked only if name is not already in the module namespace.
+        name2path = self.__dict__.get("_lazy_name2path", {})
+        if name.startswith("__") or name not in name2path:
+            raise AttributeError("module %s has no attribute %s" % (self.__name__, name))
+
+        try:
+            value = import_object(name2path[name])
+        except AttributeError as exc:
+            # An AttributeError raised here would be reported as "module has no attribute name"
+            # hence we raise an ImportError chained to the original exception.
+            new_exc = ImportError("Cannot import %s from %s: %s" % (name, name2path[name], str(exc)))
+            new_exc.__cause__ = exc
+            raise new_exc
+
+        setattr(self, name, value)
+        # In py2, the functions defined in the module use the namespace of the original module.
+        original = self.__dict__.get("_lazy_original_module")
+        if original is not None: setattr(original, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__.keys()) | set(self.__dict__.get("_lazy_name2path", {}).keys()))
+
+
+def install_lazy_imports(module_name, lazy_imports):
+    """
+    Export the objects listed in ``lazy_imports`` from module ``module_name`` without importing them.
+    Should be called at the end of the module.
+
+    Args:
+        module_name: Name of the module (usually ``__name__``).
+        lazy_imports: Dictionary mapping the name of a module to the list of names imported from that module.
+            If a name is equal to the last part of the module name, the module itself is exported.
+
+    Return: The module.
+    """
+    name2path = {}
+    for modname, names in lazy_imports.items():
+        for name in names:
+            name2path[name] = modname if modname.split(".")[-1] == name else "%s:%s" % (modname, name)
+
+    module = sys.modules[module_name]
+    if sys.version_info >= (3, 5):
+        module.__class__ = LazyModule
+    else:
+        # Module objects do not support __class__ assignment in py2.
+        # Keep a reference to the original module otherwise its namespace is cleared when it's deallocated.
+        new = LazyModule(module_name, module.__doc__)
+        new.__dict__.update(module.__dict__)
+        new._lazy_original_module = module
+        sys.modules[module_name] = new
+        module = new
+
+    module._lazy_name2path = name2path
+    if not hasattr(module, "__all__"):
+        # Star imports should export the lazy objects as well.
+        public = [k for k in module.__dict__ if not k.startswith("_")]
+        module.__all__ = sorted(set(public) | set(name2path))
+
+    return module
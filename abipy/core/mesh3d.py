@@ -8,15 +8,140 @@ from itertools import product as iproduct
 from collections import deque
 from monty.functools import lazy_property
 from numpy.random import random
-from numpy.fft import fftn, ifftn, fftshift, ifftshift, fftfreq
+from numpy.fft import fftshift, ifftshift, fftfreq
 from abipy.tools import duck
 
 
 __all__ = [
     "Mesh3D",
+    "set_fft_backend",
+    "get_fft_backend",
 ]
 
 
+class _NumpyFFT(object):
+    """FFT backend based on numpy.fft. Single-threaded, plans are not used."""
+    name = "numpy"
+
+    def __init__(self, nthreads=None):
+        self.nthreads = 1
+
+    def fftn(self, arr, axes):
+        return np.fft.fftn(arr, axes=axes)
+
+    def ifftn(self, arr, axes):
+        return np.fft.ifftn(arr, axes=axes)
+
+    def rfftn(self, arr, axes):
+        return np.fft.rfftn(arr, axes=axes)
+
+    def irfftn(self, arr, axes, shape):
+        return np.fft.irfftn(arr, s=shape, axes=axes)
+
+
+class _ScipyFFT(object):
+    """
+    FFT backend based on scipy.fft (scipy >= 1.4).
+    Batched transforms are distributed over ``nthreads`` workers (-1 means all the CPUs).
+    scipy caches the plans internally.
+    """
+    name = "scipy"
+
+    def __init__(self, nthreads=None):
+        import scipy.fft
+        self._fft = scipy.fft
+        self.nthreads = -1 if nthreads is None else nthreads
+
+    def fftn(self, arr, axes):
+        return self._fft.fftn(arr, axes=axes, workers=self.nthreads)
+
+    def ifftn(self, arr, axes):
+        return self._fft.ifftn(arr, axes=axes, workers=self.nthreads)
+
+    def rfftn(self, arr, axes):
+        return self._fft.rfftn(arr, axes=axes, workers=self.nthreads)
+
+    def irfftn(self, arr, axes, shape):
+        return self._fft.irfftn(arr, s=shape, axes=axes, workers=self.nthreads)
+
+
+class _PyfftwFFT(object):
+    """
+    FFT backend based on pyfftw. The FFTW plans are built with FFTW_MEASURE and
+    cached for each (kind, shape, dtype, axes) so that the planning is done only once.
+    """
+    name = "pyfftw"
+
+    def __init__(self, nthreads=None):
+        import pyfftw
+        self._builders = pyfftw.builders
+        if nthreads is None or nthreads < 1:
+            import multiprocessing
+            nthreads = multiprocessing.cpu_count()
+        self.nthreads = nthreads
+        self._plans = {}
+
+    def _get_plan(self, kind, arr, axes, shape=None):
+        key = (kind, arr.shape, arr.dtype.str, tuple(axes), shape)
+        plan = self._plans.get(key)
+        if plan is None:
+            builder = getattr(self._builders, kind)
+            kwargs = {} if shape is None else dict(s=shape)
+            plan = builder(arr, axes=axes, threads=self.nthreads, planner_effort="FFTW_MEASURE", **kwargs)
+            self._plans[key] = plan
+        return plan
+
+    def fftn(self, arr, axes):
+        # The output array belongs to the plan and is overwritten by the next call.
+        return self._get_plan("fftn", arr, axes)(arr).copy()
+
+    def ifftn(self, arr, axes):
+        return self._get_plan("ifftn", arr, axes)(arr).copy()
+
+    def rfftn(self, arr, axes):
+        return self._get_plan("rfftn", arr, axes)(arr).copy()
+
+    def irfftn(self, arr, axes, shape):
+        return self._get_plan("irfftn", arr, axes, shape=tuple(shape))(arr).copy()
+
+
+_FFT_BACKEND_CLASSES = {cls.name: cls for cls in (_NumpyFFT, _ScipyFFT, _PyfftwFFT)}
+
+# Backend objects indexed by (name, nthreads). Shared by all the meshes so that the plans are reused.
+_FFT_BACKENDS = {}
+
+# Name and number of threads of the backend used when Mesh3D does not specify it.
+_DEFAULT_FFT_BACKEND = ["numpy", None]
+
+
+def set_fft_backend(name, nthreads=None):
+    """
+    Set the FFT library used by default in |Mesh3D|.
+
+    Args:
+        name: "numpy" (default), "scipy" or "pyfftw".
+        nthreads: Number of threads. None to use all the CPUs (ignored by the numpy backend).
+    """
+    get_fft_backend(name, nthreads=nthreads)
+    _DEFAULT_FFT_BACKEND[:] = [name, nthreads]
+
+
+def get_fft_backend(name=None, nthreads=None):
+    """
+    Return the FFT backend with the given name and number of threads.
+    If ``name`` is None, the default backend is returned. Raises ImportError if the library is not installed.
+    """
+    if name is None:
+        name, nthreads = _DEFAULT_FFT_BACKEND
+    key = (name, nthreads)
+    backend = _FFT_BACKENDS.get(key)
+    if backend is None:
+        if name not in _FFT_BACKEND_CLASSES:
+            raise ValueError("Invalid FFT backend: `%s`. Choose among: %s" % (name, list(_FFT_BACKEND_CLASSES.keys())))
+        backend = _FFT_BACKENDS[key] = _FFT_BACKEND_CLASSES[name](nthreads=nthreads)
+    return backend
+
+
 class Mesh3D(object):
     r"""
     Descriptor-class for uniform 3D meshes.
@@ -41,13 +166,16 @@ class Mesh3D(object):
            0-----4      +-----x
 
     """
-    def __init__(self, shape, vectors):
+    def __init__(self, shape, vectors, fft_backend=None, fft_nthreads=None):
         """
         Construct ``Mesh3D`` object.
 
         Args:
             shape: 3 int's Number of grid points along axes.
             vectors: unit cell vectors in real space.
+            fft_backend: Name of the FFT library ("numpy", "scipy", "pyfftw").
+                None to use the default backend (see :func:`set_fft_backend`).
+            fft_nthreads: Number of threads used by the FFT backend.
 
         Attributes:
 
@@ -66,6 +194,8 @@ class Mesh3D(object):
         self.dvy = self.vectors[1] / self.ny
         self.dvz = self.vectors[2] / self.nz
 
+        self.fft_backend, self.fft_nthreads = fft_backend, fft_nthreads
+
     def __len__(self):
         return self.size
 
@@ -195,6 +325,8 @@ class Mesh3D(object):
     def fft_r2g(self, fr, shift_fg=False):
         """
         FFT of array ``fr`` given in real space.
+        ``fr`` can have extra leading dimensions e.g. [nband, nx, ny, nz],
+        in this case the transforms are performed in a single batched call.
         """
         ndim, shape = fr.ndim, fr.shape
 
@@ -202,25 +334,23 @@ class Mesh3D(object):
             fr = np.reshape(fr, self.shape)
             return self.fft_r2g(fr, shift_fg=shift_fg).flatten()
 
-        elif ndim == 3:
+        elif ndim >= 3:
             assert self.size == np.prod(shape[-3:])
-            fg = fftn(fr)
-            if shift_fg: fg = fftshift(fg)
-
-        elif ndim > 3:
-            assert self.size == np.prod(shape[-3:])
-            axes = np.arange(ndim)[-3:]
-            fg = fftn(fr, axes=axes)
+            axes = tuple(range(ndim - 3, ndim))
+            fg = get_fft_backend(self.fft_backend, self.fft_nthreads).fftn(fr, axes)
             if shift_fg: fg = fftshift(fg, axes=axes)
 
         else:
             raise NotImplementedError("ndim < 3 are not supported")
 
-        return fg / self.size
+        fg /= self.size
+        return fg
 
     def fft_g2r(self, fg, fg_ishifted=False):
         """
         FFT of array ``fg`` given in G-space.
+        ``fg`` can have extra leading dimensions e.g. [nband, nx, ny, nz],
+        in this case the transforms are performed in a single batched call.
         """
         ndim, shape = fg.ndim, fg.shape
 
@@ -228,21 +358,46 @@ class Mesh3D(object):
             fg = np.reshape(fg, self.shape)
             return self.fft_g2r(fg, fg_ishifted=fg_ishifted).flatten()
 
-        if ndim == 3:
-            assert self.size == np.prod(shape[-3:])
-            if fg_ishifted: fg = ifftshift(fg)
-            fr = ifftn(fg)
-
-        elif ndim > 3:
+        elif ndim >= 3:
             assert self.size == np.prod(shape[-3:])
-            axes = np.arange(ndim)[-3:]
+            axes = tuple(range(ndim - 3, ndim))
             if fg_ishifted: fg = ifftshift(fg, axes=axes)
-            fr = ifftn(fg, axes=axes)
+            fr = get_fft_backend(self.fft_backend, self.fft_nthreads).ifftn(fg, axes)
 
         else:
             raise NotImplementedError("ndim < 3 are not supported")
 
-        return fr * self.size
+        fr *= self.size
+        return fr
+
+    def rfft_r2g(self, fr):
+        """
+        Real-to-complex FFT of the real array ``fr`` with shape [..., nx, ny, nz].
+        Return array of shape [..., nx, ny, nz//2 + 1]. The other coefficients are given by
+        :math:`f(-G) = f(G)^*`.
+        """
+        ndim = fr.ndim
+        if ndim < 3:
+            raise NotImplementedError("ndim < 3 are not supported")
+        assert self.size == np.prod(fr.shape[-3:])
+        axes = tuple(range(ndim - 3, ndim))
+        fg = get_fft_backend(self.fft_backend, self.fft_nthreads).rfftn(fr, axes)
+        fg /= self.size
+        return fg
+
+    def rfft_g2r(self, fg):
+        """
+        Complex-to-real FFT of the array ``fg`` with shape [..., nx, ny, nz//2 + 1]
+        (see :meth:`rfft_r2g`). Return real array of shape [..., nx, ny, nz].
+        """
+        ndim = fg.ndim
+        if ndim < 3:
+            raise NotImplementedError("ndim < 3 are not supported")
+        assert fg.shape[-3:] == self.shape[:2] + (self.nz // 2 + 1,)
+        axes = tuple(range(ndim - 3, ndim))
+        fr = get_fft_backend(self.fft_backend, self.fft_nthreads).irfftn(fg, axes, self.shape)
+        fr *= self.size
+        return fr
 
     #def fourier_interp(self, data, new_mesh, inspace="r"):
     #    """
@@ -284,6 +439,55 @@ class Mesh3D(object):
         else:
             raise NotImplementedError("ndim < 3 are not supported")
 
+    def symmetrize_fr(self, fr, symrel, tnons, signs=None):
+        r"""
+        Symmetrize the real-space array ``fr`` by averaging over the symmetry operations:
+        :math:`f_{sym}(r) = \frac{1}{N} \sum_S f(S r + \tau)`.
+        The average is computed in G-space so that the fractional translations
+        do not need to be commensurate with the mesh. In this case, the Fourier components
+        whose star is not contained in the FFT box (e.g. the Nyquist planes of even meshes)
+        are set to zero so that the operation is a projector.
+
+        Args:
+            fr: Real array with shape [..., nx, ny, nz].
+            symrel: (nsym, 3, 3) array with the rotations in real space in reduced coordinates.
+            tnons: (nsym, 3) array with the fractional translations in reduced coordinates.
+            signs: (nsym) array with the sign acquired by the field under the operations
+                e.g. symafm for the magnetization. None if the field is invariant.
+
+        Return: Symmetrized array with the same shape as ``fr``.
+        """
+        symrel, tnons = np.reshape(symrel, (-1, 3, 3)), np.reshape(tnons, (-1, 3))
+        signs = np.ones(len(symrel)) if signs is None else signs
+        shape = fr.shape
+        fg = self.fft_r2g(np.reshape(fr, (-1,) + self.shape)).reshape(-1, self.size)
+        gvecs = self.gvecs
+
+        inv_rots = [np.rint(np.linalg.inv(rot)).astype(np.int) for rot in symrel]
+
+        # If the fractional translations are not commensurate with the mesh, the phase exp(i 2pi G.tau)
+        # depends on the representative of G in the FFT box (e.g. +G and -G on the Nyquist planes
+        # of even meshes) and the average is not a projector. The G-vectors whose star
+        # leaves the box are therefore set to zero.
+        ntau = tnons * np.reshape(self.shape, (1, 3))
+        gmask = None
+        if not np.allclose(ntau, np.rint(ntau)):
+            gmask = np.ones(self.size, dtype=bool)
+            for inv_rot in inv_rots:
+                gmask &= np.all(2 * np.abs(np.dot(gvecs, inv_rot)) < self.shape, axis=1)
+
+        sym_fg = np.zeros_like(fg)
+        for inv_rot, tau, sign in zip(inv_rots, tnons, signs):
+            # The coefficient of f(S r + tau) at G' = S^T G is f(G) exp(i 2pi G.tau)
+            rot_gvecs = np.dot(gvecs, inv_rot)
+            inds = np.ravel_multi_index(rot_gvecs.T % np.reshape(self.shape, (3, 1)), self.shape)
+            sym_fg += (sign * np.exp(2j * np.pi * np.dot(rot_gvecs, tau))) * fg[:, inds]
+
+        sym_fg /= len(symrel)
+        if gmask is not None: sym_fg[:, ~gmask] = 0
+        sym_fr = self.fft_g2r(sym_fg.reshape((-1,) + self.shape))
+        return sym_fr.real.reshape(shape) if not np.iscomplexobj(fr) else sym_fr.reshape(shape)
+
     @lazy_property
     def gvecs(self):
         """
@@ -751,8 +751,16 @@ class SkwInterpolator(ElectronInterpolator):
     belonging to the point group of the crystal. For readability reason,
     the names of the variables are chosen assuming we are interpolating electronic eigenvalues
     but the same object can be used to interpolate other quantities. Just set the first dimension to 1.
+
+    The star functions, the H(k,k') matrix and its factorization do not depend on the values
+    to interpolate, hence several functions defined on the same k-points (e.g. temperature-dependent
+    QP energies) can be fitted at once by stacking them along the band axis.
+    Each "band" is treated as an extra right-hand side of the same linear system.
     """
 
+    # Number of k-points evaluated at once in interp_kpts.
+    _KBLOCK_SIZE = 512
+
     def __init__(self, lpratio, kpts, eigens, fermie, nelect, cell, symrel, has_timrev,
                  filter_params=None, verbose=1):
         """
@@ -761,6 +769,7 @@ class SkwInterpolator(ElectronInterpolator):
                 5-10 should be OK in many systems, larger values may be required for accurate derivatives.
             kpts: numpy array with the [nkpt, 3] ab-initio k-points in reduced coordinates.
             eigens: numpy array with the ab-initio energies. shape [nsppol, nkpt, nband].
+                Use the last dimension to pack multiple right-hand sides e.g. [nsppol, nkpt, ntemp * nband].
             fermie: Fermi energy in eV.
             nelect: Number of electrons in the unit cell
             cell: (lattice, positions, numbers)
@@ -833,25 +842,16 @@ class SkwInterpolator(ElectronInterpolator):
 
         # Construct star functions for the ab-initio k-points.
         nsppol, nband, nkpt, nr = self.nsppol, self.nband, self.nkpt, self.nr
-        self.skr = np.empty((nkpt, nr), dtype=np.complex)
-        for ik, kpt in enumerate(kpts):
-            self.skr[ik] = self.get_stark(kpt)
+        self.skr = self.get_stark_kpts(kpts)
 
         # Build H(k,k') matrix (Hermitian)
-        hmat = np.empty((nkpt-1, nkpt-1), dtype=np.complex)
-        for jk in range(nkpt-1):
-            v_jkr = self.skr[jk, 1:] - self.skr[nkpt-1, 1:]
-            #for ik in range(jk + 1):
-            for ik in range(nkpt-1):
-                v_ikr = inv_rhor[1:] * (self.skr[ik, 1:] - self.skr[nkpt-1, 1:])
-                hmat[ik, jk] = np.vdot(v_jkr, v_ikr)
-                if ik == jk: hmat[ik, jk] = hmat[ik, jk].real
+        # H(k,k') = sum_R rho(R)^{-1} [S_k(R) - S_kn(R)] [S_k'(R) - S_kn(R)]^*
+        dskr = self.skr[:nkpt-1, 1:] - self.skr[nkpt-1, 1:]
+        hmat = np.matmul(inv_rhor[1:] * dskr, dskr.conj().T)
+        hmat[np.diag_indices(nkpt-1)] = hmat.diagonal().real
 
         # Solving system of linear equations to get lambda coeffients (eq. 10 of PRB 38 2721)..."
-        de_kbs = np.empty((nkpt-1, nband, nsppol), dtype=np.complex)
-        for spin in range(nsppol):
-            for ib in range(nband):
-                de_kbs[:, ib, spin] = eigens[spin, 0:nkpt-1, ib] - eigens[spin, nkpt-1, ib]
+        de_kbs = np.transpose(eigens[:, 0:nkpt-1, :] - eigens[:, nkpt-1:nkpt, :], (1, 2, 0)).astype(np.complex)
 
         # Solve all bands and spins at once
         # FIXME: Portability problem with scipy 0.19 in which linalg.solve wraps the expert drivers
@@ -873,16 +873,10 @@ class SkwInterpolator(ElectronInterpolator):
 
         lmb_kbs = np.reshape(lmb_kbs, (-1, nband, nsppol))
 
-        # Compute coefficients.
+        # Compute coefficients for all spins and bands.
         self.coefs = np.empty((nsppol, nband, nr), dtype=np.complex)
-        for spin in range(nsppol):
-            for ib in range(nband):
-                for ir in range(1, nr):
-                    self.coefs[spin, ib, ir] = inv_rhor[ir] \
-                        * np.vdot(self.skr[:nkpt-1, ir] - self.skr[nkpt-1, ir], lmb_kbs[:nkpt-1, ib, spin])
-
-                self.coefs[spin, ib, 0] = eigens[spin, nkpt-1, ib] \
-                    - np.dot(self.coefs[spin, ib, 1:nr], self.skr[nkpt-1, 1:nr])
+        self.coefs[:, :, 1:] = inv_rhor[1:] * np.einsum("kr,kbs->sbr", dskr.conj(), lmb_kbs)
+        self.coefs[:, :, 0] = eigens[:, nkpt-1, :] - np.matmul(self.coefs[:, :, 1:], self.skr[nkpt-1, 1:])
 
         # Filter high-frequency.
         self.rcut, self.rsigma = None, None
@@ -901,16 +895,15 @@ class SkwInterpolator(ElectronInterpolator):
         self.cached_kpt_dk2 = np.ones(3) * np.inf
 
         # Compare ab-initio data with interpolated results.
-        mae = 0.0
-        for spin in range(nsppol):
-            for ik, kpt in enumerate(kpts):
-                skw_eb = self.eval_sk(spin, kpt)
-                mae += np.abs(eigens[spin, ik] - skw_eb).sum()
-                if self.verbose >= 10:
-                    # print interpolated eigenvales
+        skw_eigens = self._eval_skr(self.skr)
+        mae = np.abs(eigens - skw_eigens).sum()
+        if self.verbose >= 10:
+            # print interpolated eigenvales
+            for spin in range(nsppol):
+                for ik in range(nkpt):
                     for band in range(self.nband):
                         e0 = eigens[spin, ik, band]
-                        eskw = skw_eb[band]
+                        eskw = skw_eigens[spin, ik, band]
                         print("spin", spin, "band", band, "ikpt", ik, "e0", e0, "eskw", eskw, "diff", e0 - eskw)
 
         mae *= 1e3 / (nsppol * nkpt * nband)
@@ -964,17 +957,25 @@ class SkwInterpolator(ElectronInterpolator):
 
         kfrac_coords = np.reshape(kfrac_coords, (-1, 3))
         new_nkpt = len(kfrac_coords)
-        new_eigens = np.empty((self.nsppol, new_nkpt, self.nband))
 
         dedk = None if not dk1 else np.empty((self.nsppol, new_nkpt, self.nband, 3))
         dedk2 = None if not dk2 else np.empty((self.nsppol, new_nkpt, self.nband, 3, 3))
 
-        der1, der2 = None, None
-        for spin in range(self.nsppol):
-            for ik, newk in enumerate(kfrac_coords):
-                if dk1: der1 = dedk[spin, ik]
-                if dk2: der2 = dedk2[spin, ik]
-                new_eigens[spin, ik] = self.eval_sk(spin, newk, der1=der1, der2=der2)
+        if not (dk1 or dk2):
+            # Evaluate all spins, bands (and right-hand sides) in blocks of k-points.
+            new_eigens = np.empty((self.nsppol, new_nkpt, self.nband),
+                                  dtype=np.complex if self.iscomplexobj else np.float)
+            for k0 in range(0, new_nkpt, self._KBLOCK_SIZE):
+                kslice = slice(k0, k0 + self._KBLOCK_SIZE)
+                new_eigens[:, kslice] = self._eval_skr(self.get_stark_kpts(kfrac_coords[kslice]))
+        else:
+            new_eigens = np.empty((self.nsppol, new_nkpt, self.nband))
+            der1, der2 = None, None
+            for spin in range(self.nsppol):
+                for ik, newk in enumerate(kfrac_coords):
+                    if dk1: der1 = dedk[spin, ik]
+                    if dk2: der2 = dedk2[spin, ik]
+                    new_eigens[spin, ik] = self.eval_sk(spin, newk, der1=der1, der2=der2)
 
         if self.verbose:
             print("Interpolation completed", time.time() - start)
@@ -984,20 +985,29 @@ class SkwInterpolator(ElectronInterpolator):
         """
         Interpolate energies on an arbitrary set of k-points. Use `ref_eigens`
         to detect degeneracies and average the interpolated values in the degenerate subspace.
+
+        If the interpolator has been built with multiple right-hand sides packed along the band axis,
+        ``ref_eigens`` can be given with ``nb`` bands where ``nb`` divides ``self.nband``.
+        In this case, the interpolated values are assumed to be stored in blocks of ``nb`` bands
+        and the same degeneracies are enforced in each block.
         """
         kfrac_coords = np.reshape(kfrac_coords, (-1, 3))
         new_nkpt = len(kfrac_coords)
-        ref_eigens = np.reshape(ref_eigens, (self.nsppol, new_nkpt, self.nband))
+        ref_eigens = np.reshape(ref_eigens, (self.nsppol, new_nkpt, -1))
+        nb = ref_eigens.shape[-1]
+        if self.nband % nb != 0:
+            raise ValueError("Number of bands in ref_eigens: %d should divide nband: %d" % (nb, self.nband))
 
         # Interpolate eigenvales.
         new_eigens = self.interp_kpts(kfrac_coords).eigens
+        blocks = np.reshape(new_eigens, (self.nsppol, new_nkpt, self.nband // nb, nb))
 
         # Average interpolated values over degenerates bands.
         for spin in range(self.nsppol):
             for ik in range(new_nkpt):
                 for dgbs in find_degs_sk(ref_eigens[spin, ik], atol):
                     if len(dgbs) == 1: continue
-                    new_eigens[spin, ik, dgbs] = new_eigens[spin, ik, dgbs].sum() / len(dgbs)
+                    blocks[spin, ik, :, dgbs] = blocks[spin, ik, :, dgbs].mean(axis=0)
 
         return dict2namedtuple(eigens=new_eigens, dedk=None, dedk2=None)
 
@@ -1082,6 +1092,36 @@ class SkwInterpolator(ElectronInterpolator):
 
     #    return oeig, der1, der2
 
+    def _eval_skr(self, skr):
+        """
+        Evaluate the interpolant for all spins and bands from the star functions skr[nk, nr].
+        Return array of shape [nsppol, nk, nband].
+        """
+        # [NS, NB, NR] x [NR, NK] --> [NS, NK, NB]
+        oeigs = np.swapaxes(np.matmul(self.coefs, skr.T), 1, 2)
+        return oeigs if self.iscomplexobj else oeigs.real
+
+    def get_stark_kpts(self, kfrac_coords):
+        """
+        Return the star functions for a list of k-points.
+
+        Args:
+            kfrac_coords: K-points in reduced coordinates.
+
+        Return:
+            complex array of shape [len(kfrac_coords), self.nr]
+        """
+        kfrac_coords = np.reshape(kfrac_coords, (-1, 3))
+        two_pi = 2.0 * np.pi
+        skr = np.zeros((len(kfrac_coords), self.nr), dtype=np.complex)
+        for omat in self.ptg_symrel:
+            # S^T k for all k-points.
+            sk = two_pi * np.matmul(kfrac_coords, omat)
+            skr += np.exp(1.j * np.matmul(sk, self.rpts.T))
+        skr /= self.ptg_nsym
+
+        return skr
+
     def get_stark(self, kpt):
         """
         Return the star function for k-point `kpt`.
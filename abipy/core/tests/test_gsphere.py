@@ -1,6 +1,7 @@
 """Tests for gsphere"""
 from __future__ import print_function, division
 
+import itertools
 import numpy as np
 
 from abipy.core import Mesh3D
@@ -43,6 +44,27 @@ class TestGSphere(AbipyTest):
         assert len(gsphere.empty()) == len(gsphere)
         assert len(gsphere.cempty()) == len(gsphere)
 
+    def test_lookup(self):
+        """G-vector --> index lookup"""
+        rprimd = np.eye(3)
+        gvecs = np.array([[0, 0, 0], [1, 0, 0], [-1, 0, 0], [0, -2, 1], [2, 2, -2], [0, 2, -1]])
+        gsphere = GSphere(2, rprimd, [0, 0, 0], gvecs, istwfk=1)
+
+        for i, gvec in enumerate(gvecs):
+            assert gsphere.index(gvec) == i
+            assert gsphere.count(gvec) == 1
+            assert gvec in gsphere
+        assert [0, 1, 0] not in gsphere and [5, 0, 0] not in gsphere
+        assert gsphere.count([0, 1, 0]) == 0
+        with self.assertRaises(ValueError):
+            gsphere.index([0, 1, 0])
+
+        self.assert_equal(gsphere.indices(gvecs[::-1]), np.arange(len(gvecs))[::-1])
+        with self.assertRaises(ValueError):
+            gsphere.indices([[1, 0, 0], [-2, -2, 2]])
+
+        assert gsphere.minus_gindices.tolist() == [0, 2, 1, 5, -1, 3]
+
     def test_fft(self):
         """FFT transforms"""
         rprimd = np.array([1.,0,0, 0,1,0, 0,0,1])
@@ -64,3 +86,90 @@ class TestGSphere(AbipyTest):
                 int_r = mesh.integrate(fr)
                 int_g = fg[...,0,0,0]
                 self.assert_almost_equal(int_r, int_g)
+
+    def test_timrev_storage(self):
+        """G-spheres with istwfk > 1"""
+        rprimd = np.eye(3)
+        mesh = Mesh3D((8, 7, 6), rprimd)
+        with self.assertRaises(ValueError):
+            GSphere(2, rprimd, [0.25, 0, 0], [[0, 0, 0]], istwfk=2)
+
+        for kpoint, istwfk in [([0, 0, 0], 2), ([0.5, 0, 0], 3)]:
+            g0 = np.rint(2 * np.array(kpoint)).astype(int)
+            full_gvecs = np.array([g for g in np.ndindex(5, 5, 5) if np.sum((np.array(g) - 2 + kpoint) ** 2) <= 4]) - 2
+            # Random coefficients with c(-G-2k) = c(G)^* and the corresponding half sphere.
+            coeffs, half_gvecs = {}, []
+            for g in map(tuple, full_gvecs):
+                if g in coeffs: continue
+                c = np.random.rand() + 1j * np.random.rand()
+                partner = tuple(-np.array(g) - g0)
+                if partner == g: c = c.real
+                coeffs[g], coeffs[partner] = c, np.conj(c)
+                half_gvecs.append(g)
+
+            full = GSphere(2, rprimd, kpoint, full_gvecs, istwfk=1)
+            half = GSphere(2, rprimd, kpoint, half_gvecs, istwfk=istwfk)
+            assert half.has_timrev_storage and not full.has_timrev_storage
+            assert len(half) < len(full)
+            full_ug = np.array([coeffs[tuple(g)] for g in full_gvecs])
+            half_ug = np.array([coeffs[g] for g in half_gvecs])
+
+            self.assert_almost_equal(half.tofftmesh(mesh, half_ug), full.tofftmesh(mesh, full_ug))
+            self.assert_almost_equal(half.fromfftmesh(mesh, half.tofftmesh(mesh, half_ug))[0], half_ug)
+            self.assert_almost_equal(half.vdot(half_ug, half_ug), full.vdot(full_ug, full_ug))
+            ur = half.fft_g2r(mesh, np.array([half_ug, 2 * half_ug]))
+            self.assert_almost_equal(ur, full.fft_g2r(mesh, np.array([full_ug, 2 * full_ug])))
+            if istwfk == 2:
+                # Real FFTs
+                assert not np.iscomplexobj(ur)
+                self.assert_almost_equal(mesh.rfft_g2r(mesh.rfft_r2g(ur)), ur)
+
+    def test_fftmesh_transfer(self):
+        """Transfer of G-sphere arrays to/from the FFT mesh"""
+        rprimd = np.eye(3)
+        mesh = Mesh3D((6, 5, 4), rprimd)
+        gvecs = np.array([[0, 0, 0], [1, 0, 0], [-1, 0, 0], [0, -2, 1], [2, 2, -2], [-3, -1, 1]])
+        gsphere = GSphere(2, rprimd, [0, 0, 0], gvecs, istwfk=1)
+
+        indices = gsphere.get_fft_indices(mesh)
+        assert indices is gsphere.get_fft_indices(mesh)
+        assert indices.tolist() == [np.ravel_multi_index([g % n for g, n in zip(gvec, mesh.shape)], mesh.shape)
+                                    for gvec in gvecs]
+
+        # Single array.
+        ug = np.arange(len(gsphere)) + 1j
+        ug_mesh = gsphere.tofftmesh(mesh, ug)
+        assert ug_mesh.shape == mesh.shape
+        assert ug_mesh[0, 0, 0] == ug[0] and ug_mesh[5, 0, 0] == ug[2] and ug_mesh[3, 4, 1] == ug[5]
+        assert np.count_nonzero(ug_mesh) == len(gsphere)
+        self.assert_equal(gsphere.fromfftmesh(mesh, ug_mesh), ug[None, :])
+
+        # Stack of bands.
+        ug_stack = np.random.rand(3, len(gsphere)) + 1j * np.random.rand(3, len(gsphere))
+        mesh_stack = gsphere.tofftmesh(mesh, ug_stack)
+        assert mesh_stack.shape == (3,) + mesh.shape
+        for i in range(3):
+            self.assert_equal(mesh_stack[i], gsphere.tofftmesh(mesh, ug_stack[i]))
+        self.assert_equal(gsphere.fromfftmesh(mesh, mesh_stack), ug_stack)
+
+        # Compare with the loop over the G-vectors on a sphere with all the G-vectors such that |G|^2 <= 6.
+        mesh = Mesh3D((8, 7, 6), rprimd)
+        gvecs = np.array([g for g in itertools.product(range(-3, 4), repeat=3) if np.dot(g, g) <= 6])
+        gvecs = gvecs[np.random.permutation(len(gvecs))]
+        gsphere = GSphere(2, rprimd, [0, 0, 0], gvecs, istwfk=1)
+        ug_stack = np.random.rand(2, len(gsphere)) + 1j * np.random.rand(2, len(gsphere))
+
+        ref_mesh = np.zeros((2,) + mesh.shape, dtype=np.complex)
+        for ig, gvec in enumerate(gvecs):
+            i1, i2, i3 = [g + n if g < 0 else g for g, n in zip(gvec, mesh.shape)]
+            ref_mesh[:, i1, i2, i3] = ug_stack[:, ig]
+        self.assert_equal(gsphere.tofftmesh(mesh, ug_stack), ref_mesh)
+        self.assert_equal(gsphere.tofftmesh(mesh, ug_stack[1]), ref_mesh[1])
+
+        fg = mesh.crandom(extra_dims=2)
+        ref_sphere = np.empty((2, len(gsphere)), dtype=np.complex)
+        for ig, gvec in enumerate(gvecs):
+            i1, i2, i3 = [g + n if g < 0 else g for g, n in zip(gvec, mesh.shape)]
+            ref_sphere[:, ig] = fg[:, i1, i2, i3]
+        self.assert_equal(gsphere.fromfftmesh(mesh, fg), ref_sphere)
+        self.assert_equal(gsphere.fromfftmesh(mesh, fg[0]), ref_sphere[:1])
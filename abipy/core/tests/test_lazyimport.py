@@ -0,0 +1,40 @@
+"""Tests for core.lazyimport module"""
+from __future__ import print_function, division, unicode_literals, absolute_import
+
+import sys
+import types
+
+from abipy.core.testing import AbipyTest
+from abipy.core.lazyimport import import_object, install_lazy_imports
+
+
+class LazyImportTest(AbipyTest):
+
+    def setUp(self):
+        self.modname = str("_abipy_test_lazyimport")
+        sys.modules[self.modname] = types.ModuleType(self.modname)
+
+    def tearDown(self):
+        sys.modules.pop(self.modname, None)
+
+    def test_lazy_module(self):
+        """Testing install_lazy_imports"""
+        import os.path
+        assert import_object("os.path:join") is os.path.join
+        assert import_object("os.path") is os.path
+
+        module = install_lazy_imports(self.modname, {"os.path": ["join", "no_such_function"], "json": ["json"]})
+        assert "join" not in module.__dict__
+        assert "join" in dir(module) and "join" in module.__all__
+        assert module.join is os.path.join
+        assert "join" in module.__dict__
+        assert module.json is import_object("json")
+
+        with self.assertRaises(AttributeError):
+            module.foobar
+
+        # AttributeError raised while importing the object is reported as ImportError.
+        with self.assertRaises(ImportError) as cm:
+            module.no_such_function
+        if sys.version_info >= (3, 0):
+            assert isinstance(cm.exception.__cause__, AttributeError)
@@ -100,6 +100,52 @@ class TestMesh3D(AbipyTest):
                 int_g = fg[..., 0, 0, 0]
                 self.assert_almost_equal(int_r, int_g)
 
+    def test_fft_backends(self):
+        """Batched FFT transforms with the different backends"""
+        from abipy.core import set_fft_backend as core_set_fft_backend
+        assert core_set_fft_backend is set_fft_backend
+        rprimd = np.eye(3)
+        ref_mesh = Mesh3D((12, 3, 5), rprimd)
+        fg = ref_mesh.crandom(extra_dims=(2, 3))
+        ref_fr = ref_mesh.fft_g2r(fg)
+        ref_fg = ref_mesh.fft_r2g(ref_fr, shift_fg=True)
+
+        for backend in ("numpy", "scipy", "pyfftw"):
+            try:
+                get_fft_backend(backend)
+            except ImportError:
+                continue
+            mesh = Mesh3D((12, 3, 5), rprimd, fft_backend=backend, fft_nthreads=2)
+            fr = mesh.fft_g2r(fg)
+            self.assert_almost_equal(fr, ref_fr)
+            # Batched transforms must be equal to the transforms of the single arrays.
+            self.assert_almost_equal(fr[1, 2], mesh.fft_g2r(fg[1, 2]))
+            self.assert_almost_equal(mesh.fft_r2g(fr, shift_fg=True), ref_fg)
+            # Call it again to use the cached plans.
+            self.assert_almost_equal(mesh.fft_g2r(fg), ref_fr)
+
+        with self.assertRaises(ValueError):
+            get_fft_backend("foo")
+
+    def test_symmetrize_fr(self):
+        """Symmetrization of real-space arrays with non-commensurate fractional translations"""
+        mesh = Mesh3D((8, 8, 6), np.eye(3))
+        x, y, z = np.meshgrid(*[np.arange(n) / n for n in mesh.shape], indexing="ij")
+        # Inversion followed by tau = (1/3, 0, 0) that is not commensurate with nx = 8.
+        symrel = [np.eye(3, dtype=int), -np.eye(3, dtype=int)]
+        tnons = [[0, 0, 0], [1 / 3, 0, 0]]
+
+        # f(-r + tau) = f(r) --> the field must not change.
+        fr = np.cos(2 * np.pi * (x - 1 / 6))
+        self.assert_almost_equal(mesh.symmetrize_fr(fr, symrel, tnons), fr)
+
+        # The operation must be a projector (Nyquist planes of the even mesh included).
+        fr = np.exp(np.cos(2 * np.pi * x) + np.sin(2 * np.pi * (y + z)))
+        sym_fr = mesh.symmetrize_fr(fr, symrel, tnons)
+        assert not np.iscomplexobj(sym_fr) and sym_fr.shape == fr.shape
+        self.assert_almost_equal(mesh.symmetrize_fr(sym_fr, symrel, tnons), sym_fr)
+        self.assert_almost_equal(mesh.symmetrize_fr(np.array([fr, 2 * fr]), symrel, tnons)[1], 2 * sym_fr)
+
     #def test_trilinear_interp(self):
     #    rprimd = np.array([1.,0,0, 0,1,0, 0,0,1])
     #    rprimd.shape = (3,3)
@@ -52,6 +52,27 @@ class TestSkwInterpolator(AbipyTest):
         new_kcoords = [(0, 0, 0), (0.1, 0, 0), (0.12, 0.13, 0.14)]
         new_eigens = skw.interp_kpts(new_kcoords).eigens
         assert new_eigens.shape == (skw.nsppol, len(new_kcoords), skw.nband)
+        stark_kpts = skw.get_stark_kpts(new_kcoords)
+        for ik, kpt in enumerate(new_kcoords):
+            self.assert_almost_equal(stark_kpts[ik], skw.get_stark(kpt))
+            self.assert_almost_equal(new_eigens[0, ik], skw.eval_sk(0, kpt))
+
+        # Multiple right-hand sides packed along the band axis must give the same results as separated fits.
+        other_eigens = 2 * ebands.eigens + 1
+        multi = SkwInterpolator(lpratio, kcoords, np.concatenate([ebands.eigens, other_eigens], axis=-1),
+                                ebands.fermie, ebands.nelect, cell, fm_symrel, has_timrev, verbose=0)
+        assert multi.nband == 2 * skw.nband and multi.nr == skw.nr
+        other = SkwInterpolator(lpratio, kcoords, other_eigens, ebands.fermie, ebands.nelect, cell,
+                                fm_symrel, has_timrev, verbose=0)
+        multi_eigens = multi.interp_kpts(new_kcoords).eigens
+        self.assert_almost_equal(multi_eigens[..., :skw.nband], new_eigens)
+        self.assert_almost_equal(multi_eigens[..., skw.nband:], other.interp_kpts(new_kcoords).eigens)
+        # Degeneracies are enforced in each block of bands.
+        multi_eigens = multi.interp_kpts_and_enforce_degs(new_kcoords, new_eigens, atol=1e-4).eigens
+        self.assert_almost_equal(multi_eigens[..., :skw.nband],
+                                 skw.interp_kpts_and_enforce_degs(new_kcoords, new_eigens, atol=1e-4).eigens)
+        with self.assertRaises(ValueError):
+            multi.interp_kpts_and_enforce_degs(new_kcoords, new_eigens[..., :3], atol=1e-4)
 
         res1 = skw.interp_kpts(new_kcoords, dk1=True, dk2=False)
         print(res1.dedk)
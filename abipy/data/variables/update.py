@@ -42,8 +42,17 @@ import abipy.abio.abivars_db
 print("Updating name list in abinit_vars.yml ...")
 
 with open("abinit_vars.yml", "r") as fh:
-    varlist = yaml.load(fh)
+    varlist = yaml.load(fh, Loader=yaml.Loader)
     varnames = sorted([v.varname for v in varlist])
 
 with open("abinit_vars.json", "wt") as fh:
     json.dump(varnames, fh)
+
+# Build the prebuilt database used by get_abinit_variables.
+import hashlib
+print("Building abinit_vars.db ...")
+with open("abinit_vars.yml", "rb") as fh:
+    yaml_sha1 = hashlib.sha1(fh.read()).hexdigest()
+
+database = abipy.abio.abivars_db.VariableDatabase.from_file("abinit_vars.yml")
+database.to_dbfile("abinit_vars.db", yaml_sha1=yaml_sha1)
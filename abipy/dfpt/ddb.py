@@ -5,12 +5,13 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 import sys
 import os
 import tempfile
+import threading
 import itertools
 import numpy as np
 import pandas as pd
 
 from collections import OrderedDict
-from six.moves import map, zip, StringIO
+from six.moves import map, zip, StringIO, cPickle as pickle
 from monty.string import marquee
 from monty.collections import AttrDict, dict2namedtuple, tree
 from monty.functools import lazy_property
@@ -24,7 +25,8 @@ from abipy.core.kpoints import KpointList, Kpoint
 from abipy.core.tensor import Tensor
 from abipy.iotools import ETSF_Reader
 from abipy.abio.inputs import AnaddbInput
-from abipy.dfpt.phonons import PhononDosPlotter, PhononBandsPlotter, InteratomicForceConstants
+from abipy.dfpt.phonons import (PhononDosPlotter, PhononBandsPlotter, InteratomicForceConstants,
+    PhbstFile, PhdosFile)
 from abipy.dfpt.tensors import DielectricTensor
 from abipy.core.abinit_units import phfactor_ev2units, phunit_tag #Ha_cmm1,
 from pymatgen.analysis.elasticity.elastic import ElasticTensor
@@ -67,6 +69,178 @@ class AnaddbError(DdbError):
         return "\n".join(lines)
 
 
+class AnaddbCache(object):
+    """
+    Content-addressed store with the output files produced by anaddb.
+    Entries are indexed by the MD5 hash of the DDB file and by the normalized anaddb input
+    (variables in alphabetical order, comments are ignored) so that anaddb is not executed
+    again if the same DDB has already been processed with the same input.
+    The least recently used entries are removed when the number of entries exceeds ``max_entries``.
+
+    Usage example:
+
+    .. code-block:: python
+
+        DdbFile.anaddb_cache = AnaddbCache()
+        with abiopen("out_DDB") as ddb:
+            phbst_file, phdos_file = ddb.anaget_phbst_and_phdos_files()
+        print(DdbFile.anaddb_cache)
+    """
+    # Files copied from the anaddb workdir to the cache.
+    EXTS = (".nc", ".abo")
+
+    def __init__(self, cache_dir=None, max_entries=200):
+        """
+        Args:
+            cache_dir: Directory where the results are stored. Default: ~/.abinit/abipy/anaddb_cache
+            max_entries: Maximum number of entries in the cache.
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), ".abinit", "abipy", "anaddb_cache")
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        if not os.path.exists(self.cache_dir): os.makedirs(self.cache_dir)
+        self.max_entries = max_entries
+        self.num_hits, self.num_misses = 0, 0
+        # The cache is shared by the threads of run_anaddb_jobs.
+        self._lock = threading.RLock()
+
+    def __str__(self):
+        return self.to_string()
+
+    def to_string(self, verbose=0):
+        """String representation."""
+        lines = []
+        app = lines.append
+        app("Anaddb cache directory: %s" % self.cache_dir)
+        app("Number of entries: %d (max_entries: %d)" % (len(self.entries), self.max_entries))
+        app("Hits: %d, Misses: %d" % (self.num_hits, self.num_misses))
+        if verbose:
+            for path in self.entries:
+                app("    %s: %s" % (os.path.basename(path), sorted(os.listdir(path))))
+
+        return "\n".join(lines)
+
+    @property
+    def entries(self):
+        """List with the directories of the entries sorted by last access time (most recent last)."""
+        with self._lock:
+            paths = [os.path.join(self.cache_dir, d) for d in os.listdir(self.cache_dir)]
+            paths = [p for p in paths if os.path.isdir(p) and not os.path.basename(p).startswith(".")]
+            return sorted(paths, key=lambda p: os.stat(p).st_mtime)
+
+    def get_key(self, ddb, inp):
+        """Return the key associated to the |DdbFile| ``ddb`` and the |AnaddbInput| ``inp``."""
+        import hashlib
+        from abipy.abio.variable import InputVariable
+        sha1 = hashlib.sha1()
+        sha1.update(ddb.content_hash.encode("utf-8"))
+        for varname in sorted(inp.keys()):
+            sha1.update(str(InputVariable(varname, inp[varname])).encode("utf-8"))
+        return sha1.hexdigest()
+
+    def get(self, key):
+        """
+        Return the path of the directory with the output files associated to ``key``. None if not in cache.
+        Note that the directory may be removed by ``evict``. Use ``fetch`` to get a private copy of the files.
+        """
+        with self._lock:
+            path = os.path.join(self.cache_dir, key)
+            if not os.path.isdir(path):
+                self.num_misses += 1
+                return None
+
+            # Update the access time used by the LRU eviction policy.
+            os.utime(path, None)
+            self.num_hits += 1
+            return path
+
+    def fetch(self, key, workdir=None):
+        """
+        Copy the output files associated to ``key`` to ``workdir``. A temporary directory is created
+        if ``workdir`` is None. Return the path of the directory with the files, None if not in cache.
+        """
+        import shutil
+        with self._lock:
+            # Copy the files before releasing the lock so that the entry cannot be evicted meanwhile.
+            path = self.get(key)
+            if path is None: return None
+            if workdir is None: workdir = tempfile.mkdtemp()
+            if not os.path.exists(workdir): os.makedirs(workdir)
+            for fname in os.listdir(path):
+                shutil.copy(os.path.join(path, fname), workdir)
+            return workdir
+
+    def store(self, key, workdir):
+        """
+        Copy the output files in the anaddb ``workdir`` to the cache. Return path of the new entry.
+        """
+        import shutil
+        with self._lock:
+            path = os.path.join(self.cache_dir, key)
+            if os.path.isdir(path): return path
+
+            # Copy the files to a temporary directory and rename it so that other processes never see partial entries.
+            tmpdir = tempfile.mkdtemp(prefix=".", dir=self.cache_dir)
+            for fname in os.listdir(workdir):
+                if fname.endswith(self.EXTS) and os.path.isfile(os.path.join(workdir, fname)):
+                    shutil.copy(os.path.join(workdir, fname), tmpdir)
+
+            try:
+                os.rename(tmpdir, path)
+            except OSError:
+                # Entry has been created by another process.
+                shutil.rmtree(tmpdir, ignore_errors=True)
+
+            self.evict()
+            return path
+
+    def evict(self):
+        """Remove the least recently used entries. Return number of entries removed."""
+        import shutil
+        with self._lock:
+            entries = self.entries
+            num_remove = max(len(entries) - self.max_entries, 0)
+            for path in entries[:num_remove]:
+                shutil.rmtree(path, ignore_errors=True)
+            return num_remove
+
+    def clear(self):
+        """Remove all the entries."""
+        import shutil
+        with self._lock:
+            for path in self.entries:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+def _dump_cache_data(data, path):
+    """
+    Pickle ``data`` to ``path``. Write to a temporary file in the same directory and rename it
+    so that other processes never read a partial cache.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or None, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        if hasattr(os, "replace"):
+            os.replace(tmp_path, path)
+        else:
+            # py2: rename is atomic on posix.
+            os.rename(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+
+
+def _read_ddb_block_lines(fh, entry):
+    """
+    Read the lines of the DDB block described by ``entry`` (see DdbFile.block_index)
+    from the file object ``fh`` opened in binary mode. Empty lines are skipped.
+    """
+    fh.seek(entry["start"])
+    text = fh.read(entry["stop"] - entry["start"]).decode("utf-8")
+    return [line.rstrip() for line in text.splitlines() if line and not line.isspace()]
+
+
 class DdbFile(TextFile, Has_Structure, NotebookWriter):
     """
     This object provides an interface to the DDB_ file produced by ABINIT
@@ -89,10 +263,16 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
     Error = DdbError
     AnaddbError = AnaddbError
 
+    # AnaddbCache instance used to store the results of anaddb. None to disable the cache.
+    anaddb_cache = None
+
+    # Version of the format used for the binary cache. Increase it if the content of the cache changes.
+    CACHE_VERSION = 1
+
     @classmethod
-    def from_file(cls, filepath):
+    def from_file(cls, filepath, cache=None):
         """Needed for the `TextFile` abstract interface."""
-        return cls(filepath)
+        return cls(filepath, cache=cache)
 
     #@classmethod
     #def from_mpid(cls, material_id, api_key=None, endpoint=None):
@@ -121,10 +301,26 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
     #        pmgb = rest.get_bandstructure_by_material_id(material_id=material_id)
     #    return cls.from_string(s)
 
-    def __init__(self, filepath):
+    def __init__(self, filepath, cache=None):
+        """
+        Args:
+            filepath: Path to the DDB file.
+            cache: None or False to parse the text file. If True, the parsed data is saved in a binary
+                file next to the DDB (see cache_path). A string is interpreted as the directory
+                in which the cache is stored. The cache is reused if it is still valid
+                i.e. if file size, mtime or the content hash of the DDB did not change.
+        """
         super(DdbFile, self).__init__(filepath)
 
-        self._header = self._parse_header()
+        data = self._load_cache(cache) if cache else None
+        if data is not None:
+            self._header = data["header"]
+            self.__dict__["block_index"] = data["block_index"]
+            self.__dict__["_dynmat_arrays"] = data["dynmat_arrays"]
+            frac_coords = data["qpoints"]
+        else:
+            self._header = self._parse_header()
+            frac_coords = self._read_qpoints()
 
         self._structure = Structure.from_abivars(**self.header)
         # Add AbinitSpacegroup (needed in guessed_ngkpt)
@@ -132,9 +328,14 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         spgid, has_timerev, h = 0, True, self.header
         self._structure.set_abi_spacegroup(AbinitSpaceGroup(spgid, h.symrel, h.tnons, h.symafm, has_timerev))
 
-        frac_coords = self._read_qpoints()
         self._qpoints = KpointList(self.structure.lattice.reciprocal_lattice, frac_coords, weights=None, names=None)
 
+        if cache and data is None:
+            try:
+                self.write_cache(cache)
+            except Exception as exc:
+                logger.warning("Cannot write DDB cache for %s:\n%s" % (self.filepath, str(exc)))
+
     def __str__(self):
         """String representation."""
         return self.to_string()
@@ -282,25 +483,92 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         # 2nd derivatives (non-stat.)  - # elements :      36
         # qpt  2.50000000E-01  0.00000000E+00  0.00000000E+00   1.0
 
-        # Since there are multiple occurrences of qpt in the DDB file
-        # we use seen to remove duplicates.
-        self.seek(0)
-        tokens, seen = [], set()
-
-        for line in self:
-            line = line.strip()
-            if line.startswith("qpt") and line not in seen:
-                seen.add(line)
-                tokens.append(line.replace("qpt", ""))
-
-        qpoints, weights = [], []
-        for tok in tokens:
-            nums = list(map(float, tok.split()))
-            qpoints.append(nums[:3])
-            weights.append(nums[3])
+        # The q-points are extracted from the block index so that the data blocks are not read.
+        # Only the lines starting with qpt are considered (the first q-point of 3rd order blocks).
+        # Since the same q-point may appear in different blocks we use seen to remove duplicates.
+        qpoints, seen = [], set()
+        for entry in self.block_index:
+            qpt = entry["qpt"]
+            if qpt is None or tuple(qpt) in seen: continue
+            seen.add(tuple(qpt))
+            qpoints.append(qpt)
 
         return np.reshape(qpoints, (-1,3))
 
+    @lazy_property
+    def block_index(self):
+        """
+        List of dictionaries with the position of the DDB blocks in the file.
+        The index is built with a single pass over the file without storing the data.
+        Each dictionary contains the following keys:
+
+            "dord": String with the type of derivative e.g. "2nd derivatives (non-stat.)"
+            "nelements": Number of elements in the block.
+            "qpt": Reduced coordinates of the q-point given in the line starting with ``qpt``
+                (the first q-point for 3rd derivatives). None if the block has no q-point.
+            "qpts": List with the reduced coordinates of all the q-points in the head of the block
+                (three q-points for 3rd derivatives).
+            "start", "stop": Byte offsets delimiting the block in the file.
+        """
+        return self._build_block_index()
+
+    def _build_block_index(self):
+        index = []
+        entry, offset = None, 0
+
+        with open(self.filepath, mode="rb") as fh:
+            # skip until the beginning of the db
+            for bline in fh:
+                offset += len(bline)
+                if b"Number of data blocks" in bline: break
+            else:
+                return index
+
+            nqpt = 0
+            for bline in fh:
+                start, offset = offset, offset + len(bline)
+                if b"List of bloks and their characteristics" in bline:
+                    # Close the last block when we reach the last part of the file.
+                    if entry is not None: entry["stop"] = start
+                    break
+
+                if b"# elements" in bline:
+                    # New block.
+                    if entry is not None: entry["stop"] = start
+                    dord, nelements = bline.decode("utf-8").split("- # elements :")
+                    entry = dict(dord=dord.strip(), nelements=int(nelements), qpt=None, qpts=[],
+                                 start=start, stop=None)
+                    index.append(entry)
+                    # Number of q-point lines following the block type (see _split_ddb_block).
+                    nqpt = _DDB_BLOCK_NQPT_LINES.get(dord.split()[0] if dord.split() else None, None)
+
+                elif entry is not None and bline.strip():
+                    if nqpt is None:
+                        # Unknown type of derivative: assume the q-point is given on a single line starting with qpt.
+                        if bline.split()[0] != b"qpt": continue
+                    elif len(entry["qpts"]) >= nqpt:
+                        continue
+                    # 3rd derivatives: only the first line starts with qpt, the other two contain the coordinates.
+                    qpt = list(map(float, bline.replace(b"qpt", b"").split()[:3]))
+                    if entry["qpt"] is None: entry["qpt"] = qpt
+                    entry["qpts"].append(qpt)
+
+        # Remove last block if the file is truncated.
+        if index and index[-1]["stop"] is None: index.pop(-1)
+
+        return index
+
+    def _read_block(self, entry, fh=None):
+        """
+        Read the block associated to the ``entry`` of the block index.
+        Returns dictionary with "data" and "qpt" (see blocks).
+        """
+        if fh is None:
+            with open(self.filepath, mode="rb") as fh:
+                return self._read_block(entry, fh=fh)
+
+        return {"data": _read_ddb_block_lines(fh, entry), "qpt": entry["qpt"]}
+
     @lazy_property
     def computed_dynmat(self):
         """
@@ -316,35 +584,48 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         df_columns = "idir1 ipert1 idir2 ipert2 cvalue".split()
 
         dynmat = OrderedDict()
-        for block in self.blocks:
+        for qfrac, inds, cvalues in self._dynmat_arrays:
             # Build q-point object.
-            qpt = Kpoint(frac_coords=block["qpt"], lattice=self.structure.reciprocal_lattice, weight=None, name=None)
+            qpt = Kpoint(frac_coords=qfrac, lattice=self.structure.reciprocal_lattice, weight=None, name=None)
 
             # Build pandas dataframe with df_columns and (idir1, ipert1, idir2, ipert2) as index.
+            df_index = [tuple(p) for p in inds.tolist()]
+            dynmat[qpt] = pd.DataFrame(OrderedDict([
+                ("idir1", inds[:, 0]), ("ipert1", inds[:, 1]), ("idir2", inds[:, 2]), ("ipert2", inds[:, 3]),
+                ("cvalue", cvalues)]), index=df_index, columns=df_columns)
+
+        return dynmat
+
+    @lazy_property
+    def _dynmat_arrays(self):
+        """
+        List of tuples (qpt, inds, cvalues) with the entries of the dynamical matrix in each block.
+        inds is a [nelements, 4] array of integers with (idir1, ipert1, idir2, ipert2),
+        cvalues is a complex array with the corresponding values.
+        """
+        arrays = []
+        for block in self.blocks:
             # Each line in data represents an element of the dynamical matric
             # idir1 ipert1 idir2 ipert2 re_D im_D
-            df_rows, df_index = [], []
+            inds, cvalues = [], []
             for line in block["data"]:
                 line = line.strip()
                 if line.startswith("2nd derivatives") or line.startswith("qpt"):
                     continue
                 try:
                     toks = line.split()
-                    idir1, ipert1 = p1 = (int(toks[0]), int(toks[1]))
-                    idir2, ipert2 = p2 = (int(toks[2]), int(toks[3]))
+                    inds.append([int(toks[0]), int(toks[1]), int(toks[2]), int(toks[3])])
                     toks[4] = toks[4].replace("D", "E")
                     toks[5] = toks[5].replace("D", "E")
-                    cvalue = float(toks[4]) + 1j*float(toks[5])
+                    cvalues.append(float(toks[4]) + 1j*float(toks[5]))
                 except Exception as exc:
                     print("exception while parsing line:", line)
                     raise exc
 
-                df_index.append(p1 + p2)
-                df_rows.append(dict(idir1=idir1, ipert1=ipert1, idir2=idir2, ipert2=ipert2, cvalue=cvalue))
+            arrays.append((block["qpt"], np.reshape(np.array(inds, dtype=np.int64), (-1, 4)),
+                           np.array(cvalues, dtype=np.complex128)))
 
-            dynmat[qpt] = pd.DataFrame(df_rows, index=df_index, columns=df_columns)
-
-        return dynmat
+        return arrays
 
     @lazy_property
     def blocks(self):
@@ -356,38 +637,87 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         return self._read_blocks()
 
     def _read_blocks(self):
-        # skip until the beginning of the db
-        self.seek(0)
-        while "Number of data blocks" not in self._file.readline():
-            pass
+        with open(self.filepath, mode="rb") as fh:
+            return [self._read_block(entry, fh=fh) for entry in self.block_index]
 
-        blocks = []
-        block_lines = []
-        qpt = None
+    @lazy_property
+    def content_hash(self):
+        """MD5 hash (hexadecimal string) computed from the content of the file."""
+        import hashlib
+        md5 = hashlib.md5()
+        with open(self.filepath, mode="rb") as fh:
+            for chunk in iter(lambda: fh.read(2**20), b""):
+                md5.update(chunk)
+        return md5.hexdigest()
 
-        for line in self:
-            # skip empty lines
-            if line.isspace():
-                continue
+    def cache_path(self, cache=True):
+        """
+        Path of the binary cache. If ``cache`` is True, the cache is located next to the DDB file
+        else ``cache`` gives the directory where the cache is stored.
+        """
+        if cache is True:
+            return self.filepath + ".cache"
 
-            if "List of bloks and their characteristics" in line:
-                # add last block when we reach the last part of the file.
-                blocks.append({"data": block_lines, "qpt": qpt})
-                break
+        # Use the hash of the absolute path to avoid clashes between DDBs with the same basename.
+        import hashlib
+        key = hashlib.md5(os.path.abspath(self.filepath).encode("utf-8")).hexdigest()
+        return os.path.join(os.path.expanduser(cache), "%s_%s.cache" % (os.path.basename(self.filepath), key))
+
+    def write_cache(self, cache=True):
+        """
+        Save header, q-points, block index and dynamical matrix in binary format.
+        See ``cache_path`` for the meaning of ``cache``. Return path to the cache file.
+        """
+        path = self.cache_path(cache)
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname): os.makedirs(dirname)
+
+        stat = os.stat(self.filepath)
+        data = dict(
+            version=self.CACHE_VERSION,
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            content_hash=self.content_hash,
+            header=dict(self.header),
+            qpoints=np.reshape([q.frac_coords for q in self.qpoints], (-1, 3)),
+            block_index=self.block_index,
+            dynmat_arrays=self._dynmat_arrays,
+        )
+        _dump_cache_data(data, path)
 
-            line = line.rstrip()
-            # new block
-            if "# elements" in line:
-                if block_lines:
-                    blocks.append({"data": block_lines, "qpt": qpt})
-                block_lines = []
-                qpt = None
+        return path
 
-            block_lines.append(line)
-            if "qpt" in line:
-                qpt = list(map(float, line.split()[1:4]))
+    def _load_cache(self, cache):
+        """
+        Read data from the binary cache. Return None if the cache does not exist or it is not valid.
+        """
+        path = self.cache_path(cache)
+        if not os.path.exists(path): return None
+
+        try:
+            with open(path, mode="rb") as fh:
+                data = pickle.load(fh)
+        except Exception as exc:
+            logger.warning("Error while reading DDB cache %s:\n%s" % (path, str(exc)))
+            return None
+
+        if data.get("version") != self.CACHE_VERSION: return None
+        stat = os.stat(self.filepath)
+        if data["size"] != stat.st_size: return None
+        if data["mtime"] != stat.st_mtime:
+            # File has been touched or copied. Compare the content before invalidating the cache.
+            if data["content_hash"] != self.content_hash: return None
+            # Same content: store the new mtime so that the next open does not need to hash the file.
+            data["mtime"] = stat.st_mtime
+            try:
+                _dump_cache_data(data, path)
+            except Exception as exc:
+                logger.warning("Cannot update DDB cache %s:\n%s" % (path, str(exc)))
+
+        self.__dict__["content_hash"] = data["content_hash"]
+        data["header"] = AttrDict(**data["header"])
 
-        return blocks
+        return data
 
     @property
     def qpoints(self):
@@ -557,6 +887,38 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
 
         return phbands.view_phononwebsite(browser=browser, verbose=verbose, dryrun=dryrun)
 
+    def _run_anaddb(self, inp, workdir=None, manager=None, mpi_procs=1, verbose=0):
+        """
+        Execute anaddb with input ``inp`` and return the path of the directory with the output files.
+        If ``anaddb_cache`` is not None, results are taken from the cache if available.
+        Raise AnaddbError if the run does not complete.
+        """
+        cache = self.anaddb_cache
+        if cache is not None:
+            key = cache.get_key(self, inp)
+            # Copy the files so that the caller never sees an entry that may be evicted later.
+            path = cache.fetch(key, workdir=workdir)
+            if path is not None:
+                if verbose: print("Taking anaddb results from cache:", path)
+                return path
+
+        task = AnaddbTask.temp_shell_task(inp, ddb_node=self.filepath, workdir=workdir, manager=manager, mpi_procs=mpi_procs)
+
+        if verbose:
+            print("ANADDB INPUT:\n", inp)
+            print("workdir:", task.workdir)
+
+        # Run the task here.
+        task.start_and_wait(autoparal=False)
+
+        report = task.get_event_report()
+        if not report.run_completed:
+            raise self.AnaddbError(task=task, report=report)
+
+        if cache is not None: cache.store(key, task.workdir)
+
+        return task.workdir
+
     def anaget_phmodes_at_qpoint(self, qpoint=None, asr=2, chneut=1, dipdip=1, workdir=None, mpi_procs=1,
                                  manager=None, verbose=0, lo_to_splitting=False, directions=None, anaddb_kwargs=None):
         """
@@ -579,6 +941,24 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
 
         Return: |PhononBands| object.
         """
+        qpoint, inp, lo_to_splitting = self._get_phmodes_input(qpoint=qpoint, asr=asr, chneut=chneut, dipdip=dipdip,
+            lo_to_splitting=lo_to_splitting, directions=directions, anaddb_kwargs=anaddb_kwargs)
+
+        workdir = self._run_anaddb(inp, workdir=workdir, manager=manager, mpi_procs=mpi_procs, verbose=verbose)
+
+        with PhbstFile(os.path.join(workdir, "run.abo_PHBST.nc")) as ncfile:
+            if lo_to_splitting and qpoint.is_gamma():
+                ncfile.phbands.read_non_anal_from_file(os.path.join(workdir, "anaddb.nc"))
+
+            return ncfile.phbands
+
+    def _get_phmodes_input(self, qpoint=None, asr=2, chneut=1, dipdip=1, lo_to_splitting=False,
+                           directions=None, anaddb_kwargs=None):
+        """
+        Build the anaddb input for anaget_phmodes_at_qpoint.
+        Return: (qpoint, inp, lo_to_splitting) where qpoint is the |Kpoint| in the DDB file
+        and lo_to_splitting is the value obtained after the automatic detection.
+        """
         if qpoint is None:
             qpoint = self.qpoints[0]
             if len(self.qpoints) != 1:
@@ -604,23 +984,7 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
                                           lo_to_splitting=lo_to_splitting, directions=directions,
                                           anaddb_kwargs=anaddb_kwargs)
 
-        task = AnaddbTask.temp_shell_task(inp, ddb_node=self.filepath, workdir=workdir,
-                                          manager=manager, mpi_procs=mpi_procs)
-        if verbose:
-            print("ANADDB INPUT:\n", inp)
-            print("workdir:", task.workdir)
-
-        # Run the task here
-        task.start_and_wait(autoparal=False)
-        report = task.get_event_report()
-        if not report.run_completed:
-            raise self.AnaddbError(task=task, report=report)
-
-        with task.open_phbst() as ncfile:
-            if lo_to_splitting and qpoint.is_gamma():
-                ncfile.phbands.read_non_anal_from_file(os.path.join(task.workdir, "anaddb.nc"))
-
-            return ncfile.phbands
+        return qpoint, inp, lo_to_splitting
 
     def anaget_phbst_and_phdos_files(self, nqsmall=10, ndivsm=20, asr=2, chneut=1, dipdip=1, dos_method="tetra",
                                      lo_to_splitting="automatic", ngqpt=None, qptbounds=None, anaddb_kwargs=None, verbose=0,
@@ -653,6 +1017,20 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
             |PhbstFile| with the phonon band structure.
             |PhdosFile| with the the phonon DOS.
         """
+        inp, lo_to_splitting = self._get_phbst_and_phdos_input(
+            nqsmall=nqsmall, ndivsm=ndivsm, asr=asr, chneut=chneut, dipdip=dipdip, dos_method=dos_method,
+            lo_to_splitting=lo_to_splitting, ngqpt=ngqpt, qptbounds=qptbounds, anaddb_kwargs=anaddb_kwargs)
+
+        workdir = self._run_anaddb(inp, workdir=workdir, manager=manager, mpi_procs=mpi_procs, verbose=verbose)
+
+        return self._open_phbst_and_phdos_files(workdir, inp, lo_to_splitting)
+
+    def _get_phbst_and_phdos_input(self, nqsmall=10, ndivsm=20, asr=2, chneut=1, dipdip=1, dos_method="tetra",
+                                   lo_to_splitting="automatic", ngqpt=None, qptbounds=None, anaddb_kwargs=None):
+        """
+        Build the anaddb input for anaget_phbst_and_phdos_files.
+        Return: (inp, lo_to_splitting) where lo_to_splitting is the value obtained after the automatic detection.
+        """
         if ngqpt is None: ngqpt = self.guessed_ngqpt
 
         if lo_to_splitting == "automatic":
@@ -666,27 +1044,18 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
             asr=asr, chneut=chneut, dipdip=dipdip, dos_method=dos_method, lo_to_splitting=lo_to_splitting,
             anaddb_kwargs=anaddb_kwargs)
 
-        task = AnaddbTask.temp_shell_task(inp, ddb_node=self.filepath, workdir=workdir, manager=manager, mpi_procs=mpi_procs)
-
-        if verbose:
-            print("ANADDB INPUT:\n", inp)
-            print("workdir:", task.workdir)
-
-        # Run the task here.
-        task.start_and_wait(autoparal=False)
-
-        report = task.get_event_report()
-        if not report.run_completed:
-            raise self.AnaddbError(task=task, report=report)
+        return inp, lo_to_splitting
 
+    def _open_phbst_and_phdos_files(self, workdir, inp, lo_to_splitting):
+        """Open the PHBST and the PHDOS files produced by anaddb in ``workdir``."""
         # Open file and add metadata to phbands from DDB
         # TODO: in principle phbands.add_params?
-        phbst_file = task.open_phbst()
+        phbst_file = PhbstFile(os.path.join(workdir, "run.abo_PHBST.nc"))
         self._add_params(phbst_file.phbands)
         if lo_to_splitting:
-            phbst_file.phbands.read_non_anal_from_file(os.path.join(task.workdir, "anaddb.nc"))
+            phbst_file.phbands.read_non_anal_from_file(os.path.join(workdir, "anaddb.nc"))
 
-        phdos_file = None if inp["prtdos"] == 0 else task.open_phdos()
+        phdos_file = None if inp["prtdos"] == 0 else PhdosFile(os.path.join(workdir, "run.abo_PHDOS.nc"))
         #if phdos_file is not None: self._add_params(phdos_file.phdos)
 
         return phbst_file, phdos_file
@@ -806,7 +1175,7 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
                 In the later case, the value 0.001 eV is used as gaussian broadening
             ngqpt: Number of divisions for the ab-initio q-mesh in the DDB file. Auto-detected if None (default)
             verbose: Verbosity level.
-            num_cpus: Number of CPUs (threads) used to parallellize the calculation of the DOSes. Autodetected if None.
+            num_cpus: Number of anaddb processes executed in parallel to compute the DOSes. Autodetected if None.
             stream: File-like object used for printing.
 
         Return:
@@ -820,48 +1189,20 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         if num_cpus <= 0: num_cpus = 1
         num_cpus = min(num_cpus, len(nqsmalls))
 
-        def do_work(nqsmall):
-            phbst_file, phdos_file = self.anaget_phbst_and_phdos_files(
-                nqsmall=nqsmall, ndivsm=1, asr=asr, chneut=chneut, dipdip=dipdip, dos_method=dos_method, ngqpt=ngqpt)
-            phdos = phdos_file.phdos
-            phbst_file.close()
-            phdos_file.close()
-            return phdos
-
-        if num_cpus == 1:
-            # Sequential version
-            phdoses = [do_work(nqs) for nqs in nqsmalls]
-
-        else:
-            # Threads
-            if verbose:
-                print("Computing %d phonon DOS with %d threads" % (len(nqsmalls), num_cpus) )
-            phdoses = [None] * len(nqsmalls)
-
-            def worker():
-                while True:
-                    nqsm, phdos_index = q.get()
-                    phdos = do_work(nqsm)
-                    phdoses[phdos_index] = phdos
-                    q.task_done()
+        jobs = []
+        for nqsmall in nqsmalls:
+            inp, _ = self._get_phbst_and_phdos_input(
+                nqsmall=nqsmall, ndivsm=1, asr=asr, chneut=chneut, dipdip=dipdip, dos_method=dos_method,
+                lo_to_splitting="automatic", ngqpt=ngqpt, qptbounds=None, anaddb_kwargs=None)
+            jobs.append((self, inp))
 
-            from threading import Thread
-            try:
-                from Queue import Queue # py2k
-            except ImportError:
-                from queue import Queue # py3k
-
-            q = Queue()
-            for i in range(num_cpus):
-                t = Thread(target=worker)
-                t.daemon = True
-                t.start()
-
-            for i, nqsmall in enumerate(nqsmalls):
-                q.put((nqsmall, i))
+        if verbose:
+            print("Computing %d phonon DOS with %d anaddb processes" % (len(nqsmalls), num_cpus))
 
-            # block until all tasks are done
-            q.join()
+        phdoses = []
+        for workdir in run_anaddb_jobs(jobs, num_workers=num_cpus, verbose=verbose):
+            with PhdosFile(os.path.join(workdir, "run.abo_PHDOS.nc")) as phdos_file:
+                phdoses.append(phdos_file.phdos)
 
         # Compute relative difference wrt last phonon DOS. Be careful because the DOSes may be defined
         # on different frequency meshes ==> spline on the mesh of the last DOS.
@@ -897,21 +1238,10 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
             cprint("Dielectric tensor and Becs are not available in DDB: %s" % self.filepath, "yellow")
 
         inp = AnaddbInput(self.structure, anaddb_kwargs={"chneut": chneut})
-        task = AnaddbTask.temp_shell_task(inp, ddb_node=self.filepath, mpi_procs=mpi_procs, workdir=workdir, manager=manager)
-
-        if verbose:
-            print("ANADDB INPUT:\n", inp)
-            print("workdir:", task.workdir)
-
-        # Run the task here.
-        task.start_and_wait(autoparal=False)
-
-        report = task.get_event_report()
-        if not report.run_completed:
-            raise self.AnaddbError(task=task, report=report)
+        workdir = self._run_anaddb(inp, workdir=workdir, manager=manager, mpi_procs=mpi_procs, verbose=verbose)
 
         # Read data from the netcdf output file produced by anaddb.
-        with ETSF_Reader(os.path.join(task.workdir, "anaddb.nc")) as r:
+        with ETSF_Reader(os.path.join(workdir, "anaddb.nc")) as r:
             structure = r.read_structure()
             # TODO Replace with pymatgen tensors
             emacro = Tensor.from_cartesian_tensor(r.read_value("emacro_cart"), structure.lattice, space="r"),
@@ -942,20 +1272,9 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         inp = AnaddbInput.ifc(self.structure, ngqpt=ngqpt, ifcout=ifcout, q1shft=(0, 0, 0), asr=asr, chneut=chneut,
                               dipdip=dipdip, anaddb_kwargs=anaddb_kwargs)
 
-        task = AnaddbTask.temp_shell_task(inp, ddb_node=self.filepath, mpi_procs=mpi_procs, workdir=workdir, manager=manager)
+        workdir = self._run_anaddb(inp, workdir=workdir, manager=manager, mpi_procs=mpi_procs, verbose=verbose)
 
-        if verbose:
-            print("ANADDB INPUT:\n", inp)
-            print("workdir:", task.workdir)
-
-        # Run the task here.
-        task.start_and_wait(autoparal=False)
-
-        report = task.get_event_report()
-        if not report.run_completed:
-            raise self.AnaddbError(task=task, report=report)
-
-        return InteratomicForceConstants.from_file(os.path.join(task.workdir, 'anaddb.nc'))
+        return InteratomicForceConstants.from_file(os.path.join(workdir, 'anaddb.nc'))
 
     def anaget_dielectric_tensor_generator(self, asr=2, chneut=1, dipdip=1, workdir=None, mpi_procs=1,
                                            manager=None, verbose=0, anaddb_kwargs=None):
@@ -985,20 +1304,10 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         if anaddb_kwargs is None or 'dieflag' not in anaddb_kwargs:
             inp['dieflag'] = 1
 
-        task = AnaddbTask.temp_shell_task(inp, ddb_node=self.filepath, workdir=workdir, manager=manager, mpi_procs=mpi_procs)
-
-        if verbose:
-            print("ANADDB INPUT:\n", inp)
-            print("workdir:", task.workdir)
-
-        # Run the task here
-        task.start_and_wait(autoparal=False)
-        report = task.get_event_report()
-        if not report.run_completed:
-            raise self.AnaddbError(task=task, report=report)
+        workdir = self._run_anaddb(inp, workdir=workdir, manager=manager, mpi_procs=mpi_procs, verbose=verbose)
 
-        return DielectricTensorGenerator.from_files(os.path.join(task.workdir, "run.abo_PHBST.nc"),
-                                                    os.path.join(task.workdir, "anaddb.nc"))
+        return DielectricTensorGenerator.from_files(os.path.join(workdir, "run.abo_PHBST.nc"),
+                                                    os.path.join(workdir, "anaddb.nc"))
 
 
     def write(self, filepath):
@@ -1033,9 +1342,16 @@ class DdbFile(TextFile, Has_Structure, NotebookWriter):
         """
         if hasattr(qpt, "frac_coords"): qpt = qpt.frac_coords
 
-        for b in self.blocks:
-            if b['qpt'] is not None and np.allclose(b['qpt'], qpt):
-                return b["data"]
+        if "blocks" in self.__dict__:
+            # Blocks are already in memory (and may have been changed by replace_block_for_qpoint)
+            for b in self.blocks:
+                if b['qpt'] is not None and np.allclose(b['qpt'], qpt):
+                    return b["data"]
+        else:
+            # Use the index to read only this block.
+            for entry in self.block_index:
+                if entry['qpt'] is not None and np.allclose(entry['qpt'], qpt):
+                    return self._read_block(entry)["data"]
 
     def replace_block_for_qpoint(self, qpt, data):
         """
@@ -1138,6 +1454,205 @@ if ifc is not None:
         return self._write_nb_nbpath(nb, nbpath)
 
 
+# Number of lines with q-points after the "# elements" line of the block. Indexed by the first word of the block type.
+_DDB_BLOCK_NQPT_LINES = {"Total": 0, "1st": 0, "2nd": 1, "3rd": 3}
+
+
+def _ddb_block_nqpt_lines(lines):
+    """
+    Number of q-point lines in the head of the DDB block. ``lines`` are the first (non-empty) lines of the block.
+    """
+    dord = lines[0].split("- # elements")[0].split()
+    try:
+        return _DDB_BLOCK_NQPT_LINES[dord[0]]
+    except (KeyError, IndexError):
+        # Unknown type of derivative: assume the q-point is given on a single line starting with qpt.
+        return 1 if len(lines) > 1 and lines[1].split()[0] == "qpt" else 0
+
+
+def _split_ddb_block(lines):
+    """
+    Split the lines of a DDB block into the head (block type and q-points) and the elements.
+    Returns (head_lines, elements) where elements is a list of (key, line) and key is the tuple
+    with the integer indices of the element e.g. (idir1, ipert1, idir2, ipert2).
+    The number of q-point lines in the head is fixed by the type of derivative reported in the first line.
+    """
+    nhead = 1 + _ddb_block_nqpt_lines(lines)
+    head = lines[:nhead]
+    elements = [(tuple(int(t) for t in line.split()[:-2]), line) for line in lines[nhead:]]
+
+    return head, elements
+
+
+def _read_ddb_block_head(fh, entry):
+    """
+    Read only the head of the DDB block described by ``entry`` (see _split_ddb_block).
+    ``fh`` is a file object opened in binary mode.
+    """
+    fh.seek(entry["start"])
+    lines, nhead = [], None
+    while fh.tell() < entry["stop"]:
+        line = fh.readline().decode("utf-8").rstrip()
+        if not line.strip(): continue
+        lines.append(line)
+        if nhead is None and len(lines) == 2:
+            nhead = 1 + _ddb_block_nqpt_lines(lines)
+        if nhead is not None and len(lines) >= nhead: break
+
+    return _split_ddb_block(lines)[0]
+
+
+# Header variables that must be equal in the DDB files that are merged.
+_DDB_MERGE_CHECK_KEYS = ("natom", "ntypat", "nsppol", "nspden", "usepaw", "ixc", "occopt", "nkpt", "ecut",
+                         "acell", "rprim", "xred", "typat", "znucl")
+
+
+def merge_ddb_files(input_paths, output_path, check_header=True, verbose=0):
+    """
+    Merge a list of DDB files without calling mrgddb.
+
+    Blocks with the same type of derivative and the same q-point(s) are merged into a single block.
+    Duplicated elements are removed (the first occurrence is kept). The output file is written block by block
+    so that only one block at a time is kept in memory.
+
+    .. note::
+
+        The header of the output file is copied verbatim from the first file in ``input_paths``.
+        The headers of the other files are only used for the consistency check so variables
+        that are not listed in _DDB_MERGE_CHECK_KEYS (e.g. the reduced coordinates of the k-points)
+        are taken from the first file.
+
+    Args:
+        input_paths: List of paths to the DDB files. The header of the first file is used for the output file.
+        output_path: Path of the merged DDB file.
+        check_header: If True, check that the DDB files have been produced with the same
+            crystalline structure and compatible parameters (see _DDB_MERGE_CHECK_KEYS).
+        verbose: Verbosity level.
+
+    Return: Number of blocks written to output_path.
+    """
+    input_paths = list(input_paths)
+    if not input_paths:
+        raise ValueError("Empty list of DDB files")
+
+    # Read header and block index of each file.
+    header, groups = None, OrderedDict()
+    for path in input_paths:
+        with DdbFile(path) as ddb:
+            if header is None:
+                header = ddb.header
+            elif check_header:
+                errors = []
+                for key in _DDB_MERGE_CHECK_KEYS:
+                    v0, v1 = header.get(key), ddb.header.get(key)
+                    if np.shape(v0) != np.shape(v1) or not np.allclose(v0, v1):
+                        errors.append("%s: %s != %s" % (key, v0, v1))
+                if errors:
+                    raise DdbError("DDB file %s is not compatible with %s:\n%s" % (
+                                   path, input_paths[0], "\n".join(errors)))
+
+            # Group blocks according to the head (type of derivative and q-points)
+            with open(path, mode="rb") as fh:
+                for entry in ddb.block_index:
+                    head = _read_ddb_block_head(fh, entry)
+                    key = (entry["dord"],) + tuple(
+                        tuple(np.round([float(t) for t in l.replace("qpt", "").split()[:3]], 8)) for l in head[1:])
+                    if key not in groups: groups[key] = []
+                    groups[key].append((path, entry))
+
+    if verbose:
+        print("Merging %d DDB files: found %d blocks" % (len(input_paths), len(groups)))
+
+    with open(output_path, mode="wt") as fout:
+        for line in header.lines:
+            fout.write(line + "\n")
+        fout.write(" **** Database of total energy derivatives ****\n")
+        fout.write(" Number of data blocks={0:5}\n".format(len(groups)))
+        fout.write(" \n")
+
+        # Write the blocks. Only one merged block is kept in memory.
+        list_of_heads = []
+        for key, locs in groups.items():
+            head, elements, seen = None, [], set()
+            for path, entry in locs:
+                with open(path, mode="rb") as fh:
+                    block_head, block_elements = _split_ddb_block(_read_ddb_block_lines(fh, entry))
+                if head is None: head = block_head
+                for ekey, line in block_elements:
+                    if ekey in seen: continue
+                    seen.add(ekey)
+                    elements.append(line)
+
+            head[0] = head[0].split("- # elements :")[0] + "- # elements :%8d" % len(elements)
+            list_of_heads.append(head)
+            fout.write("\n".join(head + elements))
+            fout.write("\n \n")
+
+        fout.write(" List of bloks and their characteristics\n")
+        fout.write(" \n")
+        for head in list_of_heads:
+            fout.write("\n".join(head))
+            fout.write("\n \n")
+
+    return len(groups)
+
+
+def run_anaddb_jobs(jobs, num_workers=1, mpi_procs=1, manager=None, verbose=0):
+    """
+    Execute a list of anaddb jobs concurrently.
+
+    Each job is executed by a separated anaddb process and at most ``num_workers`` processes run at the same time.
+    The processes are submitted and waited for by a pool of python threads since the computation is
+    performed by the external executable. Results are taken from ``DdbFile.anaddb_cache`` if available.
+
+    Args:
+        jobs: List of (ddb, inp) tuples where ddb is a |DdbFile| (or the path to a DDB file) and inp an |AnaddbInput|.
+        num_workers: Maximum number of anaddb processes executed in parallel. Use all the CPUs if None.
+        mpi_procs: Number of MPI processes used by each anaddb run.
+        manager: |TaskManager| object. If None, the object is initialized from the configuration file.
+        verbose: Verbosity level.
+
+    Return:
+        List with the directories containing the output files of each job (same order as ``jobs``).
+
+    Raises:
+        The exception raised by the first job that failed (in submission order) once all jobs are completed.
+    """
+    jobs = list(jobs)
+    if num_workers is None: num_workers = get_ncpus()
+    num_workers = max(1, min(num_workers, len(jobs)))
+
+    def run_job(job):
+        ddb, inp = job
+        try:
+            if duck.is_string(ddb):
+                with DdbFile(ddb) as ddb_file:
+                    return ddb_file._run_anaddb(inp, manager=manager, mpi_procs=mpi_procs, verbose=verbose), None
+            else:
+                return ddb._run_anaddb(inp, manager=manager, mpi_procs=mpi_procs, verbose=verbose), None
+        except Exception as exc:
+            return None, exc
+
+    if num_workers == 1:
+        # Sequential version
+        results = [run_job(job) for job in jobs]
+    else:
+        if verbose:
+            print("Executing %d anaddb jobs with %d workers" % (len(jobs), num_workers))
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(num_workers)
+        try:
+            results = pool.map(run_job, jobs, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    for workdir, exc in results:
+        if exc is not None: raise exc
+
+    return [workdir for workdir, exc in results]
+
+
 class Becs(Has_Structure):
     """
     This object stores the Born effective charges and provides simple tools for data analysis.
@@ -1483,7 +1998,7 @@ class DdbRobot(Robot):
     #    return np.array(qpoints)
 
     def get_dataframe_at_qpoint(self, qpoint=None, units="eV", asr=2, chneut=1, dipdip=1, with_geo=True,
-            abspath=False, funcs=None):
+            abspath=False, funcs=None, num_cpus=1):
         """
 	Call anaddb to compute the phonon frequencies at a single q-point using the DDB files treated
 	by the robot and the given anaddb input arguments. LO-TO splitting is not included.
@@ -1499,6 +2014,7 @@ class DdbRobot(Robot):
             funcs: Function or list of functions to execute to add more data to the DataFrame.
                 Each function receives a |DdbFile| object and returns a tuple (key, value)
                 where key is a string with the name of column and value is the value to be inserted.
+            num_cpus: Number of anaddb processes executed in parallel. Autodetected if None.
 
         Return:
             |pandas-DataFrame|
@@ -1512,22 +2028,29 @@ class DdbRobot(Robot):
             if any(np.any(ddb.qpoints[0] != qpoint) for ddb in self.abifiles):
                 raise ValueError("All the q-points in the DDB files must be equal")
 
+        # Call anaddb to get the phonon frequencies. Note lo_to_splitting set to False.
+        jobs = [(ddb, ddb._get_phmodes_input(qpoint=qpoint, asr=asr, chneut=chneut, dipdip=dipdip,
+                 lo_to_splitting=False)[1]) for ddb in self.abifiles]
+        workdirs = run_anaddb_jobs(jobs, num_workers=num_cpus)
+
+        params_list = self._get_summaries("params", lambda ddb: ddb.params)
+
         rows, row_names = [], []
-        for i, (label, ddb) in enumerate(self.items()):
+        for i, ((label, ddb), workdir, params) in enumerate(zip(self.items(), workdirs, params_list)):
             row_names.append(label)
             d = OrderedDict()
             #d = {aname: getattr(ddb, aname) for aname in attrs}
             #d.update({"qpgap": mdf.get_qpgap(spin, kpoint)})
 
-            # Call anaddb to get the phonon frequencies. Note lo_to_splitting set to False.
-            phbands = ddb.anaget_phmodes_at_qpoint(qpoint=qpoint, asr=asr, chneut=chneut, dipdip=dipdip, lo_to_splitting=False)
+            with PhbstFile(os.path.join(workdir, "run.abo_PHBST.nc")) as ncfile:
+                phbands = ncfile.phbands
             # [nq, nmodes] array
             freqs = phbands.phfreqs[0, :] * phfactor_ev2units(units)
 
             d.update({"mode" + str(i): freqs[i] for i in range(len(freqs))})
 
             # Add convergence parameters
-            d.update(ddb.params)
+            d.update(params)
 
             # Add info on structure.
             if with_geo:
@@ -1540,9 +2063,10 @@ class DdbRobot(Robot):
         row_names = row_names if not abspath else self._to_relpaths(row_names)
         return pd.DataFrame(rows, index=row_names, columns=list(rows[0].keys()))
 
-    def anaget_phonon_plotters(self, **kwargs):
+    def anaget_phonon_plotters(self, num_cpus=1, **kwargs):
         r"""
         Invoke anaddb to compute phonon bands and DOS using the arguments passed via \*\*kwargs.
+        ``num_cpus`` gives the number of anaddb processes executed in parallel (autodetected if None).
         Collect results and return `namedtuple` with the following attributes:
 
             phbands_plotter: |PhononBandsPlotter| object.
@@ -1551,11 +2075,16 @@ class DdbRobot(Robot):
         if "workdir" in kwargs:
             raise ValueError("Cannot specify `workdir` when multiple DDB file are executed.")
 
+        # Build the anaddb inputs and execute anaddb.
+        run_kwargs = {k: kwargs.pop(k) for k in ("verbose", "mpi_procs", "manager") if k in kwargs}
+        inputs = [ddb._get_phbst_and_phdos_input(**kwargs) for ddb in self.abifiles]
+        workdirs = run_anaddb_jobs([(ddb, inp) for ddb, (inp, _) in zip(self.abifiles, inputs)],
+                                   num_workers=num_cpus, **run_kwargs)
+
         phbands_plotter, phdos_plotter = PhononBandsPlotter(), PhononDosPlotter()
 
-        for label, ddb in self.items():
-            # Invoke anaddb to get phonon bands and DOS.
-            phbst_file, phdos_file = ddb.anaget_phbst_and_phdos_files(**kwargs)
+        for (label, ddb), (inp, lo_to_splitting), workdir in zip(self.items(), inputs, workdirs):
+            phbst_file, phdos_file = ddb._open_phbst_and_phdos_files(workdir, inp, lo_to_splitting)
 
             # Phonon frequencies with non analytical contributions, if calculated, are saved in anaddb.nc
             # Those results should be fetched from there and added to the phonon bands.
@@ -7,7 +7,8 @@ import abipy.data as abidata
 
 from abipy import abilab
 from abipy.core.testing import AbipyTest
-from abipy.dfpt.ddb import DdbFile, DielectricTensorGenerator
+from abipy.dfpt.ddb import (DdbFile, DdbError, DielectricTensorGenerator, AnaddbCache, merge_ddb_files,
+    run_anaddb_jobs)
 from abipy.dfpt.anaddbnc import AnaddbNcFile
 from abipy.dfpt.phonons import PhononBands
 
@@ -140,6 +141,16 @@ class DdbTest(AbipyTest):
         for qpt, ref_qpt in zip(ddb.qpoints, ref_qpoints):
             assert qpt == ref_qpt
 
+        # Test block index and random access to blocks.
+        assert len(ddb.block_index) == 8
+        assert all(entry["dord"] == "2nd derivatives (non-stat.)" for entry in ddb.block_index)
+        assert ddb.block_index[0]["nelements"] == 60
+        with DdbFile(os.path.join(test_dir, "AlAs_444_nobecs_DDB")) as other:
+            lines = other.get_block_for_qpoint([0.5, 0.5, 0])
+            assert "blocks" not in other.__dict__
+            assert lines == ddb.blocks[6]["data"]
+            assert other.get_block_for_qpoint([0.345, 0.456, 0.567]) is None
+
         for qpoint in ddb.qpoints:
             phbands = ddb.anaget_phmodes_at_qpoint(qpoint=qpoint, verbose=1)
             assert phbands is not None and hasattr(phbands, "phfreqs")
@@ -305,6 +316,182 @@ class DdbTest(AbipyTest):
 
         robot.close()
 
+    def test_ddb_cache(self):
+        """Testing binary cache for DDB files."""
+        import shutil
+        from six.moves import cPickle as pickle
+        tmpdir = self.mkdtemp()
+        filepath = os.path.join(tmpdir, "AlAs_444_nobecs_DDB")
+        shutil.copy(os.path.join(test_dir, "AlAs_444_nobecs_DDB"), filepath)
+
+        with DdbFile(filepath, cache=True) as ddb:
+            assert os.path.exists(ddb.cache_path())
+            ref_qpoints, ref_header = ddb.qpoints, ddb.header
+            ref_dynmat = ddb.computed_dynmat
+
+        # Reopen from cache.
+        with DdbFile(filepath, cache=True) as ddb:
+            assert "block_index" in ddb.__dict__
+            assert ddb.qpoints == ref_qpoints
+            assert ddb.header.nkpt == ref_header.nkpt
+            self.assert_equal(ddb.header.symrel, ref_header.symrel)
+            for qpt, df in ref_dynmat.items():
+                self.assert_equal(ddb.computed_dynmat[qpt]["cvalue"].values, df["cvalue"].values)
+            assert ddb.get_block_for_qpoint([0.5, 0.5, 0])
+
+        # Cache in a different directory.
+        cache_dir = os.path.join(tmpdir, "cache")
+        with DdbFile(filepath, cache=cache_dir) as ddb:
+            assert os.path.dirname(ddb.cache_path(cache_dir)) == cache_dir
+            assert os.path.exists(ddb.cache_path(cache_dir))
+
+        # Touching the file does not invalidate the cache and the new mtime is saved.
+        stat = os.stat(filepath)
+        os.utime(filepath, (stat.st_atime, stat.st_mtime + 10))
+        with DdbFile(filepath, cache=True) as ddb:
+            assert "block_index" in ddb.__dict__
+        with open(ddb.cache_path(), "rb") as fh:
+            assert pickle.load(fh)["mtime"] == os.stat(filepath).st_mtime
+
+        # Cache is invalidated if the DDB changes.
+        with open(filepath, "at") as fh:
+            fh.write("\n")
+        with DdbFile(filepath, cache=True) as ddb:
+            # A new cache has been written.
+            assert ddb._load_cache(True) is not None
+            assert ddb.qpoints == ref_qpoints
+
+
+    def test_merge_ddb_files(self):
+        """Testing merge_ddb_files."""
+        ref_path = os.path.join(test_dir, "AlAs_444_nobecs_DDB")
+        with DdbFile(ref_path) as ref_ddb:
+            # Write DDB with the first three blocks and merge it with the full DDB.
+            partial_path = self.get_tmpname(text=True)
+            ref_ddb.blocks[:] = ref_ddb.blocks[:3]
+            ref_ddb.write(partial_path)
+
+        out_path = self.get_tmpname(text=True)
+        assert merge_ddb_files([partial_path, ref_path], out_path, verbose=1) == 8
+
+        with DdbFile(ref_path) as ref_ddb, DdbFile(out_path) as new_ddb:
+            assert new_ddb.qpoints == ref_ddb.qpoints
+            for qpt, df in ref_ddb.computed_dynmat.items():
+                assert set(new_ddb.computed_dynmat[qpt].index) == set(df.index)
+
+        # DDB with total energy, 1st and 3rd order derivatives.
+        nl_path = abidata.ref_file("refs/alas_nl_dfpt/AlAs_nl_dte_DDB")
+        assert merge_ddb_files([nl_path, nl_path], out_path) == 4
+        with DdbFile(nl_path) as ref_ddb, DdbFile(out_path) as new_ddb:
+            assert [e["nelements"] for e in new_ddb.block_index] == [e["nelements"] for e in ref_ddb.block_index]
+            assert [e["qpts"] for e in new_ddb.block_index] == [e["qpts"] for e in ref_ddb.block_index]
+            # 3rd derivatives have three q-points, qpt is the one given in the line starting with qpt.
+            assert [len(e["qpts"]) for e in ref_ddb.block_index] == [1, 0, 0, 3]
+            assert ref_ddb.block_index[3]["qpt"] == ref_ddb.block_index[3]["qpts"][0] == [0, 0, 0]
+            assert len(ref_ddb.qpoints) == 1
+
+        # Incompatible headers.
+        with self.assertRaises(DdbError):
+            merge_ddb_files([ref_path, os.path.join(test_dir, "ZnO_gamma_becs_DDB")], out_path)
+
+
+    def test_anaddb_cache(self):
+        """Testing AnaddbCache."""
+        cache = AnaddbCache(cache_dir=self.mkdtemp(), max_entries=1)
+        try:
+            DdbFile.anaddb_cache = cache
+            with DdbFile(os.path.join(test_dir, "AlAs_444_nobecs_DDB")) as ddb:
+                qpoint = ddb.qpoints[1]
+                phbands = ddb.anaget_phmodes_at_qpoint(qpoint=qpoint, verbose=1)
+                assert cache.num_hits == 0 and cache.num_misses == 1
+                assert len(cache.entries) == 1
+                # Second call takes results from the cache.
+                cached_phbands = ddb.anaget_phmodes_at_qpoint(qpoint=qpoint, verbose=1)
+                assert cache.num_hits == 1
+                self.assert_almost_equal(cached_phbands.phfreqs, phbands.phfreqs)
+                # Cache hits are copied to a new directory that is not removed by the eviction.
+                _, inp, _ = ddb._get_phmodes_input(qpoint=qpoint, asr=2, chneut=1, dipdip=1,
+                    lo_to_splitting=False, directions=None, anaddb_kwargs=None)
+                path = ddb._run_anaddb(inp)
+                assert cache.num_hits == 2
+                assert not path.startswith(cache.cache_dir)
+                assert os.path.exists(os.path.join(path, "run.abo_PHBST.nc"))
+
+                # Results are copied if workdir is specified.
+                workdir = self.mkdtemp()
+                ddb.anaget_phmodes_at_qpoint(qpoint=qpoint, workdir=workdir)
+                assert cache.num_hits == 3
+                assert os.path.exists(os.path.join(workdir, "run.abo_PHBST.nc"))
+                assert cache.fetch("foobar") is None
+
+                # Different input --> new entry and eviction of the old one.
+                ddb.anaget_phmodes_at_qpoint(qpoint=qpoint, asr=0)
+                assert cache.num_misses == 3
+                assert len(cache.entries) == 1
+                assert "Hits: 3" in cache.to_string(verbose=1)
+                # The copy of the evicted entry is still available.
+                assert os.path.exists(os.path.join(path, "run.abo_PHBST.nc"))
+
+            cache.clear()
+            assert not cache.entries
+        finally:
+            DdbFile.anaddb_cache = None
+
+
+    def test_run_anaddb_jobs(self):
+        """Testing run_anaddb_jobs with a fake anaddb executable."""
+        from abipy.abio.inputs import AnaddbInput
+        # The fake executable copies the input file to the output file.
+        # The run is completed unless the input contains the string `fail`.
+        bindir = self.mkdtemp()
+        fake_anaddb = os.path.join(bindir, "anaddb")
+        with open(fake_anaddb, "wt") as fh:
+            fh.write("""#!/bin/sh
+read input; read output
+cat "$input" > "$output"
+if grep -q fail "$input"; then exit 1; fi
+echo " Calculation completed." >> "$output"
+""")
+        os.chmod(fake_anaddb, 0o755)
+
+        old_path = os.environ["PATH"]
+        os.environ["PATH"] = bindir + os.pathsep + old_path
+        try:
+            ddb_path = os.path.join(test_dir, "AlAs_1qpt_DDB")
+            with DdbFile(ddb_path) as ddb:
+                jobs = [(ddb, AnaddbInput(ddb.structure, comment="job%d" % i)) for i in range(6)]
+                jobs.append((ddb_path, AnaddbInput(ddb.structure, comment="job6")))
+                for num_workers in (1, 3):
+                    workdirs = run_anaddb_jobs(jobs, num_workers=num_workers)
+                    assert len(workdirs) == len(jobs)
+                    # Results are returned in submission order.
+                    for i, workdir in enumerate(workdirs):
+                        with open(os.path.join(workdir, "run.abo"), "rt") as fh:
+                            assert "job%d" % i in fh.read()
+
+                # The cache is shared by the threads. Hits are copied so that they survive the eviction.
+                cache = AnaddbCache(cache_dir=self.mkdtemp(), max_entries=2)
+                cache_jobs = [(ddb, AnaddbInput(ddb.structure, comment="job%d" % i, anaddb_kwargs={"asr": i}))
+                              for i in range(4)]
+                try:
+                    DdbFile.anaddb_cache = cache
+                    for it in range(2):
+                        workdirs = run_anaddb_jobs(cache_jobs + cache_jobs, num_workers=3)
+                        for i, workdir in enumerate(workdirs):
+                            with open(os.path.join(workdir, "run.abo"), "rt") as fh:
+                                assert "job%d" % (i % 4) in fh.read()
+                    assert cache.num_hits + cache.num_misses == 4 * len(cache_jobs)
+                    assert len(cache.entries) == 2
+                finally:
+                    DdbFile.anaddb_cache = None
+
+                # Failures are propagated.
+                jobs.insert(2, (ddb, AnaddbInput(ddb.structure, comment="fail")))
+                with self.assertRaises(ddb.AnaddbError):
+                    run_anaddb_jobs(jobs, num_workers=3)
+        finally:
+            os.environ["PATH"] = old_path
+
 
 class DielectricTensorGeneratorTest(AbipyTest):
 
@@ -7,6 +7,7 @@ import pandas as pd
 import pymatgen.core.units as units
 
 from collections import OrderedDict, Iterable, defaultdict
+from functools import partial
 from tabulate import tabulate
 from monty.string import is_string, list_strings, marquee
 from monty.termcolor import cprint
@@ -408,6 +409,28 @@ class GsrReader(ElectronsReader):
         return EnergyTerms(**d)
 
 
+def _get_dataframe_row(gsr, with_geo=True, attrs=()):
+    """
+    Return OrderedDict with the data of the |GsrFile| used to build the rows of GsrRobot.get_dataframe.
+    Module-level function so that it can be executed by a pool of processes.
+    """
+    d = OrderedDict()
+
+    # Add info on structure.
+    if with_geo:
+        d.update(gsr.structure.get_dict4pandas(with_spglib=True))
+
+    for aname in attrs:
+        if aname == "nkpt":
+            value = len(gsr.ebands.kpoints)
+        else:
+            value = getattr(gsr, aname, None)
+            if value is None: value = getattr(gsr.ebands, aname, None)
+        d[aname] = value
+
+    return d
+
+
 class GsrRobot(Robot, RobotWithEbands):
     """
     This robot analyzes the results contained in multiple GSR.nc_ files.
@@ -417,7 +440,7 @@ class GsrRobot(Robot, RobotWithEbands):
     """
     EXT = "GSR"
 
-    def get_dataframe(self, with_geo=True, abspath=False, funcs=None, **kwargs):
+    def get_dataframe(self, with_geo=True, abspath=False, funcs=None, num_workers=1, executor=None, **kwargs):
         """
         Return a |pandas-DataFrame| with the most important GS results.
         and the filenames as index.
@@ -425,6 +448,10 @@ class GsrRobot(Robot, RobotWithEbands):
         Args:
             with_geo: True if structure info should be added to the dataframe
             abspath: True if paths in index should be absolute. Default: Relative to getcwd().
+            num_workers: Number of workers used to extract the data from the files. None to use all the CPUs.
+                The order of the rows does not depend on this value.
+            executor: "threads" or "processes". None (default) to use processes since the threads
+                read the netcdf files one at a time. With processes, ``funcs`` must be picklable.
 
         kwargs:
             attrs:
@@ -442,27 +469,16 @@ class GsrRobot(Robot, RobotWithEbands):
             "nsppol", "nspinor", "nspden",
         ] + kwargs.pop("attrs", [])
 
-        rows, row_names = [], []
-        for label, gsr in self.items():
-            row_names.append(label)
-            d = OrderedDict()
-
-            # Add info on structure.
-            if with_geo:
-                d.update(gsr.structure.get_dict4pandas(with_spglib=True))
-
-            for aname in attrs:
-                if aname == "nkpt":
-                    value = len(gsr.ebands.kpoints)
-                else:
-                    value = getattr(gsr, aname, None)
-                    if value is None: value = getattr(gsr.ebands, aname, None)
-                d[aname] = value
-
-            # Execute functions
-            if funcs is not None: d.update(self._exec_funcs(funcs, gsr))
-            rows.append(d)
+        key = "get_dataframe(with_geo=%s, attrs=%s)" % (with_geo, attrs)
+        rows = self._get_summaries(key, partial(_get_dataframe_row, with_geo=with_geo, attrs=attrs),
+                                   num_workers=num_workers, executor=executor)
+
+        # Execute functions
+        if funcs is not None:
+            for d, fd in zip(rows, self._exec_funcs_map(funcs, num_workers=num_workers, executor=executor)):
+                d.update(fd)
 
+        row_names = self.labels
         row_names = row_names if not abspath else self._to_relpaths(row_names)
         return pd.DataFrame(rows, index=row_names, columns=list(rows[0].keys()))
 
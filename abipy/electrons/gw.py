@@ -9,6 +9,7 @@ import numpy as np
 import pandas as pd
 
 from collections import namedtuple, OrderedDict, Iterable, defaultdict
+from functools import partial
 from six.moves import cStringIO
 from monty.string import list_strings, is_string, marquee
 from monty.collections import AttrDict, dict2namedtuple
@@ -32,6 +33,7 @@ logger = logging.getLogger(__name__)
 
 __all__ = [
     "QPState",
+    "QPTable",
     "SigresFile",
     "SigresPlotter",
     "SigresRobot",
@@ -181,6 +183,65 @@ class QPState(namedtuple("QPState", "spin kpoint band e0 qpe qpe_diago vxcme sig
             return _TIPS
 
 
+class QPTable(object):
+    """
+    Columnar version of a list of :class:`QPState` objects.
+    Each field of :class:`QPState` is stored in a |numpy-array| with one entry per (spin, kpoint, band)
+    so that the QP results can be filtered and converted to |pandas-DataFrame| without
+    building :class:`QPState` objects. Use :meth:`get_qplist` to get the list of QPState objects.
+    """
+
+    def __init__(self, columns):
+        """
+        Args:
+            columns: Mapping QPState field --> array with the values. All arrays must have the same length.
+        """
+        self.columns = OrderedDict((f, np.asarray(columns[f])) for f in QPState._fields)
+        nrows = set(len(v) for v in self.columns.values())
+        if len(nrows) != 1:
+            raise ValueError("Columns with different lengths: %s" % str(nrows))
+
+    def __len__(self):
+        return len(self.columns["band"])
+
+    def __getitem__(self, field):
+        """Return the column associated to ``field``. Accepts QPState fields and ``qpeme0``."""
+        if field == "qpeme0":
+            return self.columns["qpe"] - self.columns["e0"]
+        return self.columns[field]
+
+    def take(self, indices):
+        """Return new :class:`QPTable` with the rows selected by ``indices`` (integer array or boolean mask)."""
+        return self.__class__(OrderedDict((k, v[indices]) for k, v in self.columns.items()))
+
+    def get_qpstate(self, i):
+        """Build the :class:`QPState` associated to the i-th row."""
+        d = {k: v[i] for k, v in self.columns.items()}
+        d["spin"], d["band"] = int(d["spin"]), int(d["band"])
+        return QPState(**d)
+
+    def get_qplist(self):
+        """Build :class:`QPList` with the QPState objects stored in the table."""
+        return QPList([self.get_qpstate(i) for i in range(len(self))])
+
+    def get_dataframe(self, index=None, params=None):
+        """
+        Build |pandas-DataFrame| with the columns of the table plus ``qpeme0``.
+
+        Args:
+            index: Label used for all the rows. If None, the band indices are used.
+            params: Optional dictionary with parameters added to all the rows.
+        """
+        d = self.columns.copy()
+        d["qpeme0"] = self["qpeme0"]
+        if params:
+            for k, v in params.items():
+                d[k] = len(self) * [v]
+
+        index = len(self) * [index] if index is not None else self.columns["band"]
+        return pd.DataFrame(d, index=index, columns=list(d.keys()))
+
+
 def _get_fields_for_plot(with_fields, exclude_fields):
     """
     Return list of QPState fields to plot from input arguments.
@@ -976,8 +1037,6 @@ class SigresFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
 
         self._ebands = ebands = reader.ks_bands
 
-        qplist_spin = self.qplist_spin
-
         # TODO handle the case in which nkptgw < nkibz
         self.qpgaps = reader.read_qpgaps()
         self.qpenes = reader.read_qpenes()
@@ -1355,13 +1414,7 @@ class SigresFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
         Args:
             ignore_imag: Only real part is returned if ``ignore_imag``.
         """
-        df_list = []
-        for spin in range(self.nsppol):
-            for gwkpoint in self.gwkpoints:
-                df_sk = self.get_dataframe_sk(spin, gwkpoint, ignore_imag=ignore_imag)
-                df_list.append(df_sk)
-
-        return pd.concat(df_list)
+        return self.reader.read_qptable(ignore_imag=ignore_imag).get_dataframe(params=self.params)
 
     # FIXME: To maintain previous interface.
     to_dataframe = get_dataframe
@@ -1374,22 +1427,9 @@ class SigresFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
             ignore_imag: Only real part is returned if ``ignore_imag``.
             with_params: True to include convergence paramenters.
         """
-        rows, bands = [], []
-        # bstart and bstop depends on kpoint.
-        ik_gw = self.reader.gwkpt2seqindex(kpoint)
-        for band in range(self.gwbstart_sk[spin, ik_gw], self.gwbstop_sk[spin, ik_gw]):
-            bands.append(band)
-            # Build dictionary with the QP results.
-            qpstate = self.reader.read_qp(spin, kpoint, band, ignore_imag=ignore_imag)
-            d = qpstate.as_dict()
-            # Add other entries that may be useful when comparing different calculations.
-            if with_params:
-                d.update(self.params)
-            rows.append(d)
-
-        import pandas as pd
-        index = len(bands) * [index] if index is not None else bands
-        return pd.DataFrame(rows, index=index, columns=list(rows[0].keys()))
+        table = self.reader.read_qptable(spin=spin, kpoint=kpoint, ignore_imag=ignore_imag)
+        # Add other entries that may be useful when comparing different calculations.
+        return table.get_dataframe(index=index, params=self.params if with_params else None)
 
     #def plot_matrix_elements(self, mel_name, spin, kpoint, *args, **kwargs):
     #   matrix = self.reader.read_mel(mel_name, spin, kpoint):
@@ -1862,18 +1902,8 @@ class SigresReader(ETSF_Reader):
         Args:
             ignore_imag: Only real part is returned if ``ignore_imag``.
         """
-        qps_spin = self.nsppol * [None]
-
-        for spin in range(self.nsppol):
-            qps = []
-            for gwkpoint in self.gwkpoints:
-                ik = self.gwkpt2seqindex(gwkpoint)
-                for band in range(self.gwbstart_sk[spin, ik], self.gwbstop_sk[spin, ik]):
-                    qps.append(self.read_qp(spin, gwkpoint, band, ignore_imag=ignore_imag))
-
-            qps_spin[spin] = QPList(qps)
-
-        return tuple(qps_spin)
+        table = self.read_qptable(ignore_imag=ignore_imag)
+        return tuple(table.take(table["spin"] == spin).get_qplist() for spin in range(self.nsppol))
 
     def read_qplist_sk(self, spin, kpoint, ignore_imag=False):
         """
@@ -1882,11 +1912,56 @@ class SigresReader(ETSF_Reader):
         Args:
             ignore_imag: Only real part is returned if ``ignore_imag``.
         """
-        ik = self.gwkpt2seqindex(kpoint)
-        bstart, bstop = self.gwbstart_sk[spin, ik], self.gwbstop_sk[spin, ik]
+        return self.read_qptable(spin=spin, kpoint=kpoint, ignore_imag=ignore_imag).get_qplist()
 
-        return QPList([self.read_qp(spin, kpoint, band, ignore_imag=ignore_imag)
-                      for band in range(bstart, bstop)])
+    def read_qptable(self, spin=None, kpoint=None, ignore_imag=False):
+        """
+        Extract the QP results from the arrays stored in memory with fancy indexing.
+        Return :class:`QPTable` with one row per (spin, kpoint, band) computed in the GW run.
+
+        Args:
+            spin: Spin index. None to select all spins.
+            kpoint: GW k-point (|Kpoint| or index in gwkpoints). None to select all GW k-points.
+            ignore_imag: Only real part is returned if ``ignore_imag``.
+        """
+        spins = range(self.nsppol) if spin is None else [spin]
+        ikgws = range(len(self.gwkpoints)) if kpoint is None else [self.gwkpt2seqindex(kpoint)]
+        sk = [(s, ik) for s in spins for ik in ikgws]
+
+        # Build the (spin, ik_gw, band) indices of the rows. bstart and bstop depend on (spin, kpoint).
+        starts = np.array([self.gwbstart_sk[s, ik] for s, ik in sk], dtype=np.int)
+        nbs = np.array([self.gwbstop_sk[s, ik] for s, ik in sk], dtype=np.int) - starts
+        spin_rows = np.repeat(np.array([s for s, _ in sk], dtype=np.int), nbs)
+        ikgw_rows = np.repeat(np.array([ik for _, ik in sk], dtype=np.int), nbs)
+        band_rows = np.arange(nbs.sum()) - np.repeat(np.cumsum(nbs) - nbs, nbs) + np.repeat(starts, nbs)
+
+        # Map GW k-points to the index in the netcdf file.
+        kfile_rows = np.array([self.kpt2fileindex(k) for k in self.gwkpoints], dtype=np.int)[ikgw_rows]
+        gwkpoints = np.empty(len(self.gwkpoints), dtype=object)
+        for ik, k in enumerate(self.gwkpoints):
+            gwkpoints[ik] = k
+
+        # Must shift band index (see fortran code that allocates with mdbgw)
+        skb = (spin_rows, kfile_rows, band_rows)
+        skb_gw = (spin_rows, kfile_rows, band_rows - self.min_gwbstart)
+
+        def ri(a):
+            return np.real(a) if ignore_imag else a
+
+        return QPTable(OrderedDict([
+            ("spin", spin_rows),
+            ("kpoint", gwkpoints[ikgw_rows]),
+            ("band", band_rows),
+            ("e0", self.ks_bands.eigens[skb]),
+            ("qpe", ri(self._egw[skb])),
+            ("qpe_diago", ri(self._en_qp_diago[skb])),
+            # Note ib_gw index.
+            ("vxcme", self._vxcme[skb_gw]),
+            ("sigxme", self._sigxme[skb_gw]),
+            ("sigcmee0", ri(self._sigcmee0[skb_gw])),
+            ("vUme", self._vUme[skb_gw]),
+            ("ze0", ri(self._ze0[skb_gw])),
+        ]))
 
     #def read_qpene(self, spin, kpoint, band)
 
@@ -2013,6 +2088,28 @@ class SigresReader(ETSF_Reader):
     #    """Returns the QPState density in real space."""
 
 
+def _get_qpgaps_row(sigres, spin=0, kpoint=0, with_geo=False, attrs=()):
+    """
+    Return OrderedDict with the data of the |SigresFile| used to build the rows of SigresRobot.get_qpgaps_dataframe.
+    Module-level function so that it can be executed by a pool of processes.
+    """
+    d = OrderedDict()
+    for aname in attrs:
+        d[aname] = getattr(sigres, aname, None)
+
+    qpgap = sigres.get_qpgap(spin, kpoint)
+    d.update({"qpgap": qpgap})
+
+    # Add convergence parameters
+    d.update(sigres.params)
+
+    # Add info on structure.
+    if with_geo:
+        d.update(sigres.structure.get_dict4pandas(with_spglib=True))
+
+    return d
+
+
 class SigresRobot(Robot, RobotWithEbands):
     """
     This robot analyzes the results contained in multiple SIGRES.nc files.
@@ -2086,7 +2183,8 @@ class SigresRobot(Robot, RobotWithEbands):
 
         return table
 
-    def get_qpgaps_dataframe(self, spin=None, kpoint=None, with_geo=False, abspath=False, funcs=None, **kwargs):
+    def get_qpgaps_dataframe(self, spin=None, kpoint=None, with_geo=False, abspath=False, funcs=None,
+                             num_workers=1, executor=None, **kwargs):
         """
         Return a |pandas-DataFrame| with the QP gaps for all files in the robot.
 
@@ -2098,6 +2196,10 @@ class SigresRobot(Robot, RobotWithEbands):
             funcs: Function or list of functions to execute to add more data to the DataFrame.
                 Each function receives a |SigresFile| object and returns a tuple (key, value)
                 where key is a string with the name of column and value is the value to be inserted.
+            num_workers: Number of workers used to extract the data from the files. None to use all the CPUs.
+                The order of the rows does not depend on this value.
+            executor: "threads" or "processes". None (default) to use processes since the threads
+                read the netcdf files one at a time. With processes, ``funcs`` must be picklable.
         """
         # TODO: Ideally one should select the k-point for which we have the fundamental gap for the given spin
         # TODO: In principle the SIGRES might have different k-points
@@ -2110,27 +2212,21 @@ class SigresRobot(Robot, RobotWithEbands):
             #"tsmear", "nkibz",
         ] + kwargs.pop("attrs", [])
 
-        rows, row_names = [], []
-        for label, sigres in self.items():
-            row_names.append(label)
-            d = OrderedDict()
-            for aname in attrs:
-                d[aname] = getattr(sigres, aname, None)
-
-            qpgap = sigres.get_qpgap(spin, kpoint)
-            d.update({"qpgap": qpgap})
-
-            # Add convergence parameters
-            d.update(sigres.params)
-
-            # Add info on structure.
-            if with_geo:
-                d.update(sigres.structure.get_dict4pandas(with_spglib=True))
+        # repr(kpoint) rounds the coordinates so the key uses the index or the full reduced coordinates.
+        if duck.is_intlike(kpoint):
+            kkey = int(kpoint)
+        else:
+            kkey = tuple((np.round(getattr(kpoint, "frac_coords", kpoint), 8) + 0.0).tolist())
+        key = "get_qpgaps_dataframe(spin=%s, kpoint=%s, with_geo=%s, attrs=%s)" % (spin, kkey, with_geo, attrs)
+        rows = self._get_summaries(key, partial(_get_qpgaps_row, spin=spin, kpoint=kpoint, with_geo=with_geo,
+                                   attrs=attrs), num_workers=num_workers, executor=executor)
 
-            # Execute functions.
-            if funcs is not None: d.update(self._exec_funcs(funcs, sigres))
-            rows.append(d)
+        # Execute functions.
+        if funcs is not None:
+            for d, fd in zip(rows, self._exec_funcs_map(funcs, num_workers=num_workers, executor=executor)):
+                d.update(fd)
 
+        row_names = self.labels
         row_names = row_names if not abspath else self._to_relpaths(row_names)
         return pd.DataFrame(rows, index=row_names, columns=list(rows[0].keys()))
 
@@ -339,12 +339,13 @@ class ScrReader(ETSF_Reader):
             that can be quite expensive and memory demanding for large matrices!
         """
         if self.netcdf_name == "inverse_dielectric_function":
-            em1 = self.read_wggmat(kpoint)
-            e = np.linalg.inv(em1.wggmat[:self.nrew, :, :])
+            # Invert one frequency at a time so that only one [ng, ng] matrix is kept in memory.
+            e00 = np.array([np.linalg.inv(ggmat)[0, 0] for _, ggmat in
+                            self.iter_ggmats(kpoint, w_range=(0, self.nrew))])
         else:
             raise NotImplementedError("emacro_nlf with netcdf != InverseDielectricFunction")
 
-        return Function1D(np.real(self.wpoints[:self.nrew]).copy(), e[:, 0, 0])
+        return Function1D(np.real(self.wpoints[:self.nrew]).copy(), e00)
 
     def read_eelf(self, kpoint=(0, 0, 0)):
         """
@@ -361,31 +362,130 @@ class ScrReader(ETSF_Reader):
 
         return Function1D(emacro_lf.mesh.copy(), values)
 
-    def read_wggmat(self, kpoint, spin1=0, spin2=0, cls=None):
+    @lazy_property
+    def gvecs(self):
+        """[ng, 3] array with the G-vectors of the screening matrices in reduced coordinates."""
+        var = self.rootgrp.variables["reduced_coordinates_plane_waves_dielectric_function"]
+        # Use ik=0 because the basis set is not k-dependent.
+        ik0 = 0
+        return var[ik0, :]
+
+    def _get_slice(self, arg_range, n, what):
+        """Convert (start, stop) tuple or None to slice object. Check bounds."""
+        if arg_range is None: return slice(0, n)
+        start, stop = arg_range
+        if not 0 <= start < stop <= n:
+            raise ValueError("Invalid %s_range (%s, %s). Must be within [0, %d]" % (what, start, stop, n))
+        return slice(start, stop)
+
+    def read_wggmat(self, kpoint, spin1=0, spin2=0, cls=None, w_range=None, g_range=None, lazy=False):
         """
         Read data at the given k-point and return an instance of ``cls`` where
         ``cls`` is a subclass of :class:`_AwggMatrix`
+
+        Args:
+            kpoint: |Kpoint| object or integer with the index of the k-point.
+            spin1, spin2: Spin indices.
+            cls: Subclass of :class:`_AwggMatrix`. None to select it from the netcdf name.
+            w_range: (start, stop) tuple with the frequencies to read. None for all frequencies.
+            g_range: (start, stop) tuple with the G-vectors to read. The same range is used for G and G'.
+                None for all G-vectors.
+            lazy: If True, the matrix is read from file only when ``wggmat`` is accessed.
+                Diagonal, head and wings and slices along the frequency axis are then read
+                with hyperslabs without loading the full [nw, ng, ng] array.
         """
         cls = _AwggMatrix.class_from_netcdf_name(self.netcdf_name) if cls is None else cls
-
-        var = self.rootgrp.variables["reduced_coordinates_plane_waves_dielectric_function"]
-        # Use ik=0 because the basis set is not k-dependent.
-        ik0 = 0
-        gvecs = var[ik0, :]
-        #print("gvecs", gvecs)
-
         kpoint, ik = self.find_kpoint_fileindex(kpoint)
+        wslice = self._get_slice(w_range, self.nw, "w")
+        gslice = self._get_slice(g_range, self.ng, "g")
 
         # FIXME ecuteps is missing
-        # TODO: Gpshere.find is very slow if we don't take advantage of shells
         ecuteps = 2
-        gsphere = GSphere(ecuteps, self.structure.reciprocal_lattice, kpoint, gvecs)
+        gsphere = GSphere(ecuteps, self.structure.reciprocal_lattice, kpoint, self.gvecs[gslice])
+
+        source = (self, dict(kpoint=ik, spin1=spin1, spin2=spin2,
+                             w_range=(wslice.start, wslice.stop), g_range=(gslice.start, gslice.stop)))
+        if lazy:
+            return cls(self.wpoints[wslice], gsphere, None, source=source)
+
+        wggmat = self.read_wggmat_array(ik, spin1=spin1, spin2=spin2, w_range=w_range, g_range=g_range)
+        return cls(self.wpoints[wslice], gsphere, wggmat, inord="C", source=source)
+
+    def read_wggmat_array(self, kpoint, spin1=0, spin2=0, w_range=None, g_range=None):
+        """
+        Read the [nw, ng, ng] block of the matrix with a single hyperslab.
+        See :meth:`read_wggmat` for the meaning of the arguments.
+
+        Return: Complex array in C-order i.e. ``arr[iw, ig1, ig2]``.
+        """
+        _, ik = self.find_kpoint_fileindex(kpoint)
+        wslice = self._get_slice(w_range, self.nw, "w")
+        gslice = self._get_slice(g_range, self.ng, "g")
+        return self._read_block(ik, spin1, spin2, wslice, gslice, gslice).copy()
+
+    def _read_block(self, ik, spin1, spin2, wslice, gslice1, gslice2):
+        """
+        Read hyperslab from file. wslice, gslice1, gslice2 are slices or integers.
+        Return complex array with shape [nw, ng1, ng2] (integer indices are removed).
+        The array may be a non-contiguous view.
+        """
+        var = self.rootgrp.variables[self.netcdf_name]
+        # Exchange spin and G indices due to F --> C
+        values = var[ik, wslice, spin2, spin1, gslice2, gslice1, :]
+        # Reinterpret the (real, imag) pairs as complex numbers without copying the data.
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        values = values.view(np.complex128).reshape(values.shape[:-1])
+        if isinstance(gslice1, slice) and isinstance(gslice2, slice):
+            values = np.swapaxes(values, -1, -2)
+        return values
+
+    def iter_ggmats(self, kpoint, spin1=0, spin2=0, w_range=None, g_range=None):
+        """
+        Generator yielding (iw, ggmat) where ggmat is the [ng, ng] matrix at frequency index ``iw``.
+        Only one frequency is kept in memory. See :meth:`read_wggmat` for the meaning of the arguments.
+        """
+        _, ik = self.find_kpoint_fileindex(kpoint)
+        wslice = self._get_slice(w_range, self.nw, "w")
+        gslice = self._get_slice(g_range, self.ng, "g")
+        for iw in range(wslice.start, wslice.stop):
+            yield iw, self._read_block(ik, spin1, spin2, iw, gslice, gslice).copy()
+
+    def read_diagonal(self, kpoint, spin1=0, spin2=0, w_range=None, g_range=None, block_size=64):
+        r"""
+        Read the diagonal elements :math:`A_{G,G}(\omega)` without reading the full matrix.
+        The diagonal is read with square blocks of size ``block_size`` centered on the diagonal.
+
+        Return: [nw, ng] complex array.
+        """
+        _, ik = self.find_kpoint_fileindex(kpoint)
+        wslice = self._get_slice(w_range, self.nw, "w")
+        gslice = self._get_slice(g_range, self.ng, "g")
+        diag = np.empty((wslice.stop - wslice.start, gslice.stop - gslice.start), dtype=np.complex)
+        for start in range(gslice.start, gslice.stop, block_size):
+            bslice = slice(start, min(start + block_size, gslice.stop))
+            block = self._read_block(ik, spin1, spin2, wslice, bslice, bslice)
+            diag[:, start - gslice.start:bslice.stop - gslice.start] = np.diagonal(block, axis1=1, axis2=2)
+
+        return diag
 
-        # Exchange spin due to F --> C
-        values = self.rootgrp.variables[self.netcdf_name][ik, :, spin2, spin1, :, :, :]
-        wggmat = values[:, :, :, 0] + 1j * values[:, :, :, 1]
+    def read_head_wings(self, kpoint, spin1=0, spin2=0, w_range=None, g_range=None):
+        r"""
+        Read the head :math:`A_{0,0}(\omega)` and the wings :math:`A_{0,G'}(\omega)`, :math:`A_{G,0}(\omega)`
+        with hyperslabs.
+
+        Return: (head, wing_row, wing_col) where head is a [nw] array and wing_row, wing_col are [nw, ng] arrays.
+            The wings include the head.
+        Raises: `ValueError` if G = 0 is not in g_range.
+        """
+        _, ik = self.find_kpoint_fileindex(kpoint)
+        wslice = self._get_slice(w_range, self.nw, "w")
+        gslice = self._get_slice(g_range, self.ng, "g")
+        ig0 = GSphere(2, self.structure.reciprocal_lattice, [0, 0, 0], self.gvecs[gslice]).index([0, 0, 0])
+        ig0 += gslice.start
 
-        return cls(self.wpoints, gsphere, wggmat, inord="F")
+        wing_row = self._read_block(ik, spin1, spin2, wslice, ig0, gslice).copy()
+        wing_col = self._read_block(ik, spin1, spin2, wslice, gslice, ig0).copy()
+        return wing_row[:, ig0 - gslice.start].copy(), wing_row, wing_col
 
     def find_kpoint_fileindex(self, kpoint):
         """
@@ -399,13 +499,11 @@ class ScrReader(ETSF_Reader):
 
         return self.kpoints[ik], ik
 
-    def read_wslice(self, kpoint, ig1=0, ig2=0, spin1=0, spin2=0):
+    def read_wslice(self, kpoint, ig1=0, ig2=0, spin1=0, spin2=0, w_range=None):
         """Read slice along the frequency dimension."""
         kpoint, ik = self.find_kpoint_fileindex(kpoint)
-        var = self.rootgrp.variables[self.netcdf_name]
-        values = var[ik, :, spin2, spin1, ig2, ig1, :]  # Exchange G indices F --> C
-
-        return values[:, 0] + 1j * values[:, 1]
+        wslice = self._get_slice(w_range, self.nw, "w")
+        return self._read_block(ik, spin1, spin2, wslice, ig1, ig2).copy()
 
 
 class _AwggMatrix(object):
@@ -426,27 +524,30 @@ class _AwggMatrix(object):
     netcdf_name = "_AwggMatrix"
     latex_name = "Unknown"
 
-    def __init__(self, wpoints, gsphere, wggmat, inord="C"):
+    def __init__(self, wpoints, gsphere, wggmat, inord="C", source=None):
         """"
         Args:
             gsphere: |GSphere| with G-vectors and k-point object.
             wpoints: Complex frequency points in Hartree.
-            wggmat: [nw, ng, ng] complex array.
+            wggmat: [nw, ng, ng] complex array. None if the data should be read from ``source`` when needed.
             inord: storage order of ``wggmat``. If inord == "F", ``wggmat`` is in
                 in Fortran column-major order. Default: "C" i.e. C row-major order.
+            source: (reader, kwargs) tuple used to read the data from file with
+                the methods of :class:`ScrReader`. None if the data is in memory.
         """
         self.wpoints = np.array(wpoints, dtype=np.complex)
         self.gsphere = gsphere
-        self.wggmat = np.reshape(wggmat, (self.nw, self.ng, self.ng))
-
-        if inord.lower() == "f":
-            # Fortran to C.
-            for iw, _ in enumerate(wpoints):
-                self.wggmat[iw] = self.wggmat[iw].T.copy()
-
-        for i in (1, 2):
-            assert len(gsphere) == wggmat.shape[-i]
-        assert len(self.wpoints) == len(self.wggmat)
+        self._source = source
+        self._wggmat = None
+
+        if wggmat is not None:
+            wggmat = np.reshape(wggmat, (self.nw, self.ng, self.ng))
+            if inord.lower() == "f":
+                # Fortran to C.
+                wggmat = np.swapaxes(wggmat, 1, 2).copy()
+            self._wggmat = wggmat
+        elif source is None:
+            raise ValueError("source must be specified if wggmat is None")
 
         # Find number of real/imaginary frequencies.
         self.nrew = self.nw
@@ -529,6 +630,14 @@ class _AwggMatrix(object):
             return self.wpoints[self.nrew:]
         return []
 
+    @property
+    def wggmat(self):
+        """[nw, ng, ng] complex array. Read from file on first access if the object has been built lazily."""
+        if self._wggmat is None:
+            reader, kwargs = self._source
+            self._wggmat = reader.read_wggmat_array(**kwargs)
+        return self._wggmat
+
     @property
     def wggmat_realw(self):
         """The slice of wggmat along the real axis."""
@@ -564,6 +673,58 @@ class _AwggMatrix(object):
         """Return a latex string that can be used in matplotlib plots."""
         return _latex_symbol_cplxmode(self.latex_name, cplx_mode)
 
+    def get_wslice(self, gvec1, gvec2=None):
+        r"""
+        Return [nw] array with :math:`A_{G1,G2}(\omega)`. If the matrix is not in memory,
+        only the slice along the frequency axis is read from file.
+        """
+        ig1 = self.gindex(gvec1)
+        ig2 = ig1 if gvec2 is None else self.gindex(gvec2)
+        if self._wggmat is not None:
+            return self._wggmat[:, ig1, ig2]
+
+        reader, kwargs = self._source
+        g0 = kwargs["g_range"][0]
+        return reader.read_wslice(kwargs["kpoint"], ig1=ig1 + g0, ig2=ig2 + g0, spin1=kwargs["spin1"],
+                                  spin2=kwargs["spin2"], w_range=kwargs["w_range"])
+
+    def get_ggmat(self, iw):
+        """
+        Return the [ng, ng] matrix at the frequency index ``iw``. If the matrix is not in memory,
+        only this frequency is read from file.
+        """
+        if self._wggmat is not None:
+            return self._wggmat[iw]
+
+        reader, kwargs = self._source
+        iw = range(self.nw)[iw] + kwargs["w_range"][0]
+        return reader.read_wggmat_array(**dict(kwargs, w_range=(iw, iw + 1)))[0]
+
+    def get_diagonal(self):
+        r"""
+        Return [nw, ng] array with the diagonal elements :math:`A_{G,G}(\omega)`.
+        If the matrix is not in memory, only the blocks along the diagonal are read from file.
+        """
+        if self._wggmat is not None:
+            return np.diagonal(self._wggmat, axis1=1, axis2=2).copy()
+
+        reader, kwargs = self._source
+        return reader.read_diagonal(**kwargs)
+
+    def get_head_wings(self):
+        r"""
+        Return (head, wing_row, wing_col) with the head :math:`A_{0,0}(\omega)` ([nw] array),
+        and the wings :math:`A_{0,G'}(\omega)`, :math:`A_{G,0}(\omega)` ([nw, ng] arrays).
+        If the matrix is not in memory, only the wings are read from file.
+        """
+        if self._wggmat is not None:
+            ig0 = self.gsphere.index([0, 0, 0])
+            wing_row, wing_col = self._wggmat[:, ig0, :].copy(), self._wggmat[:, :, ig0].copy()
+            return wing_row[:, ig0].copy(), wing_row, wing_col
+
+        reader, kwargs = self._source
+        return reader.read_head_wings(**kwargs)
+
     @add_fig_kwargs
     def plot_freq(self, gvec1, gvec2=None, waxis="real", cplx_mode="re-im", ax=None, fontsize=12, **kwargs):
         r"""
@@ -590,12 +751,12 @@ class _AwggMatrix(object):
         if waxis == "real":
             if self.nrew == 0: return fig
             xx = self.real_wpoints.real * pmgu.Ha_to_eV
-            yy = self.wggmat_realw[:, ig1, ig2]
+            yy = self.get_wslice(ig1, ig2)[:self.nrew]
 
         elif waxis == "imag":
             if self.nimw == 0: return fig
             xx = self.imag_wpoints.imag * pmgu.Ha_to_eV
-            yy = self.wggmat_imagw[:, ig1, ig2]
+            yy = self.get_wslice(ig1, ig2)[self.nrew:]
 
         else:
             raise ValueError("Wrong value for waxis: %s" % str(waxis))
@@ -648,7 +809,7 @@ class _AwggMatrix(object):
         plotter = ArrayPlotter()
         for iw in wpos:
             label = r"%s $\omega=%s$" % (self.latex_label(cplx_mode), self.wpoints[iw])
-            data = data_from_cplx_mode(cplx_mode, self.wggmat[iw])
+            data = data_from_cplx_mode(cplx_mode, self.get_ggmat(iw))
             plotter.add_array(label, data)
 
         return plotter.plot(show=False, **kwargs)
@@ -124,6 +124,18 @@ class TestSigresFile(AbipyTest):
 
         full_df = sigres.to_dataframe()
 
+        # Columnar QP table must be consistent with read_qp.
+        table = sigres.reader.read_qptable()
+        assert len(table) == len(full_df) == sum(len(qps) for qps in sigres.qplist_spin)
+        sk_table = sigres.reader.read_qptable(spin=0, kpoint=ik)
+        assert np.all(sk_table["band"] == df.index.values)
+        self.assert_equal(sk_table["qpe"], df["qpe"].values)
+        qp = sigres.reader.read_qp(0, sigres.gwkpoints[ik], 5)
+        row = np.where(sk_table["band"] == 5)[0][0]
+        assert sk_table.get_qpstate(row) == qp
+        assert sk_table["kpoint"][row] is sigres.gwkpoints[ik]
+        self.assert_almost_equal(sk_table["qpeme0"][row], qp.qpeme0)
+
         marker = sigres.get_marker("qpeme0")
         assert marker and len(marker.x)
 
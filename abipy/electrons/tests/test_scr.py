@@ -113,6 +113,33 @@ class ScrFileTest(AbipyTest):
             for cplx_mode in ("re", "im", "abs", "angle"):
                 str(em1.latex_label(cplx_mode))
 
+            # Hyperslabs and lazy access.
+            lazy_em1 = ncfile.reader.read_wggmat(kpoint, lazy=True)
+            self.assert_equal(lazy_em1.get_diagonal(), np.diagonal(em1.wggmat, axis1=1, axis2=2))
+            self.assert_equal(ncfile.reader.read_diagonal(kpoint, block_size=2), lazy_em1.get_diagonal())
+            head, wing_row, wing_col = lazy_em1.get_head_wings()
+            self.assert_equal(head, em1.wggmat[:, 0, 0])
+            self.assert_equal(wing_row, em1.wggmat[:, 0, :])
+            self.assert_equal(wing_col, em1.wggmat[:, :, 0])
+            self.assert_equal(lazy_em1.get_wslice(1, 2), em1.wggmat[:, 1, 2])
+            self.assert_equal(lazy_em1.get_ggmat(-1), em1.wggmat[-1])
+            assert lazy_em1._wggmat is None
+            self.assert_equal(lazy_em1.wggmat, em1.wggmat)
+
+            sub = ncfile.reader.read_wggmat(kpoint, w_range=(28, 33), g_range=(2, 7), lazy=True)
+            assert sub.nw == 5 and sub.nrew == 2 and sub.nimw == 3 and sub.ng == 5
+            self.assert_equal(sub.get_diagonal(), np.diagonal(em1.wggmat[28:33, 2:7, 2:7], axis1=1, axis2=2))
+            self.assert_equal(sub.get_wslice(1, 3), em1.wggmat[28:33, 3, 5])
+            self.assert_equal(sub.wggmat, em1.wggmat[28:33, 2:7, 2:7])
+            with self.assertRaises(ValueError):
+                sub.get_head_wings()
+            with self.assertRaises(ValueError):
+                ncfile.reader.read_wggmat(kpoint, g_range=(0, em1.ng + 1))
+
+            ggmats = list(ncfile.reader.iter_ggmats(kpoint, w_range=(3, 6)))
+            assert [iw for iw, _ in ggmats] == [3, 4, 5]
+            self.assert_equal(ggmats[1][1], em1.wggmat[4])
+
             if self.has_matplotlib():
                 # ncfile plot methods
                 assert ncfile.plot_emacro(show=False)
@@ -371,6 +371,91 @@ class QpTempList(list):
         return fig
 
 
+class QpTempTable(object):
+    """
+    Columnar version of :class:`QpTempList`.
+    Stores the QP results for all the (spin, kpoint, band) states in |numpy-array|
+    so that the data can be selected and converted to |pandas-DataFrame| without
+    building :class:`QpTempState` objects. Temperature-dependent columns have shape [nrows, ntemp].
+    """
+    # Columns depending on T.
+    TDEP_FIELDS = ("qpe", "ze0")
+
+    def __init__(self, tmesh, columns):
+        """
+        Args:
+            tmesh: Temperature mesh in Kelvin.
+            columns: Mapping field --> array with the values for the spin, kpoint, band, e0, qpe, ze0 fields.
+        """
+        self.tmesh = tmesh
+        self.columns = OrderedDict((f, np.asarray(columns[f])) for f in ("spin", "kpoint", "band", "e0", "qpe", "ze0"))
+
+    @property
+    def ntemp(self):
+        """Number of temperatures."""
+        return len(self.tmesh)
+
+    def __len__(self):
+        return len(self.columns["band"])
+
+    def __getitem__(self, field):
+        """
+        Return the column associated to ``field``.
+        Accepts the fields of :class:`QpTempState` as well as ``qpeme0``, ``re_qpe`` and ``imag_qpe``.
+        """
+        if field == "qpeme0":
+            return self.columns["qpe"] - self.columns["e0"][:, None]
+        if field == "re_qpe":
+            return self.columns["qpe"].real
+        if field == "imag_qpe":
+            return self.columns["qpe"].imag
+        if field == "tmesh":
+            return np.tile(self.tmesh, (len(self), 1))
+        return self.columns[field]
+
+    def take(self, indices):
+        """Return new table with the rows selected by ``indices`` (integer array or boolean mask)."""
+        return self.__class__(self.tmesh, OrderedDict((k, v[indices]) for k, v in self.columns.items()))
+
+    def get_qpstate(self, i):
+        """Build the :class:`QpTempState` associated to the i-th row."""
+        d = {k: v[i] for k, v in self.columns.items()}
+        d["spin"], d["band"] = int(d["spin"]), int(d["band"])
+        return QpTempState(tmesh=self.tmesh, **d)
+
+    def get_qplist(self):
+        """Build :class:`QpTempList` with the states stored in the table."""
+        return QpTempList([self.get_qpstate(i) for i in range(len(self))])
+
+    def get_dataframe(self, itemp=None, index=None, params=None):
+        """
+        Build |pandas-DataFrame| with one row for each state and temperature.
+        The columns are the same as the ones produced by :meth:`QpTempState.get_dataframe`.
+
+        Args:
+            itemp: Temperature index. If None, all temperatures are included.
+            index: Label used for all the rows. If None, the temperature index is used.
+            params: Optional (Ordered) dictionary with extra parameters.
+        """
+        # Normalize negative indices so that the rows are labelled with the actual temperature index.
+        itemps = np.arange(self.ntemp) if itemp is None else np.array([range(self.ntemp)[itemp]])
+        nt = len(itemps)
+        od = OrderedDict()
+        for k in "tmesh e0 qpe qpeme0 ze0 spin kpoint band".split():
+            if k in ("e0", "spin", "kpoint", "band"):
+                od[k] = np.repeat(self.columns[k], nt)
+            else:
+                od[k] = self[k][:, itemps].ravel()
+
+        nrows = len(self) * nt
+        if params is not None:
+            for k, v in params.items():
+                od[k] = nrows * [v]
+
+        index = nrows * [index] if index is not None else np.tile(itemps, len(self))
+        return pd.DataFrame(od, index=index, columns=list(od.keys()))
+
+
 class EphSelfEnergy(object):
     r"""
     Electron self-energy due to phonon interaction :math:`\Sigma_{nk}(\omega,T)`
@@ -763,12 +848,8 @@ class SigEPhFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
             with_params: False to exclude calculation parameters from the dataframe.
             ignore_imag: only real part is returned if ``ignore_imag``.
         """
-        df_list = []; app = df_list.append
-        for spin in range(self.nsppol):
-            for ikc, kpoint in enumerate(self.sigma_kpoints):
-                app(self.get_dataframe_sk(spin, ikc, with_params=with_params, ignore_imag=ignore_imag))
-
-        return pd.concat(df_list)
+        table = self.reader.read_qptable(ignore_imag=ignore_imag)
+        return table.get_dataframe(params=self.params if with_params else None)
 
     def get_dataframe_sk(self, spin, kpoint, itemp=None, index=None, with_params=True, ignore_imag=False):
         """
@@ -782,17 +863,9 @@ class SigEPhFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
             with_params: False to exclude calculation parameters from the dataframe.
             ignore_imag: Only real part is returned if ``ignore_imag``.
         """
-        ikc = self.sigkpt2index(kpoint)
-        rows = []
-        for band in range(self.bstart_sk[spin, ikc], self.bstop_sk[spin, ikc]):
-            # Read QP data.
-            qp = self.reader.read_qp(spin, ikc, band, ignore_imag=ignore_imag)
-            # Convert to dataframe and add other entries useful when comparing different calculations.
-            rows.append(qp.get_dataframe(params=self.params if with_params else None))
-
-        df = pd.concat(rows)
-        if itemp is not None: df = df[df["tmesh"] == self.tmesh[itemp]]
-        return df
+        table = self.reader.read_qptable(spin=spin, kpoint=kpoint, ignore_imag=ignore_imag)
+        # Add other entries useful when comparing different calculations.
+        return table.get_dataframe(itemp=itemp, index=index, params=self.params if with_params else None)
 
     #def get_dirgaps_dataframe(self):
 
@@ -879,15 +952,13 @@ class SigEPhFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
 
         # Read QP energies from file (real + imag part) and compute corrections if ks_ebands_kpath.
         # nctkarr_t("qp_enes", "dp", "two, ntemp, max_nbcalc, nkcalc, nsppol")
-        qpes = self.reader.read_value("qp_enes", cmode="c") * units.Ha_to_eV
+        qpes = self.reader.qp_arrays["qpe"].copy()
 
         if ks_ebands_kpath is not None:
             if ks_ebands_kpath.structure != self.structure:
                 cprint("sigres.structure and ks_ebands_kpath.structures differ. Check your files!", "red")
             # nctkarr_t("ks_enes", "dp", "max_nbcalc, nkcalc, nsppol")
-            ks_enes = self.reader.read_value("ks_enes") * units.Ha_to_eV
-            for itemp in range(self.ntemp):
-                qpes[:, :, :, itemp] -= ks_enes
+            qpes -= self.reader.qp_arrays["e0"][..., None]
 
         # Note there's no guarantee that the sigma_kpoints and the corrections have the same k-point index.
         # Be careful because the order of the k-points and the band range stored in the SIGRES file may differ ...
@@ -903,35 +974,36 @@ class SigEPhFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
         cell = (self.structure.lattice.matrix, self.structure.frac_coords, self.structure.atomic_numbers)
         has_timrev = has_timrev_from_kptopt(self.reader.read_value("kptopt"))
 
-        qp_ebands_kpath_t, qp_ebands_kmesh_t, interpolators_t = [], [], []
+        # Fit all temperatures and the real/imaginary parts with a single interpolator:
+        # star functions and H(k,k') do not depend on T so (reim, itemp) are treated as extra right-hand sides.
+        # qpdata[nsppol, nkcalc, 2 * ntemp * nb] with blocks of nb bands ordered as [reim, itemp].
         itemp_list = list(range(self.ntemp)) if itemp_list is None else duck.list_ints(itemp_list)
-        for itemp in itemp_list:
-            skw_reim = []
-            for reim in ("real", "imag"):
-                qpdata = qpes[:, :, bstart:bstop, itemp]
-                qpdata = getattr(qpdata, reim).copy()
-
-                skw = SkwInterpolator(lpratio, gw_kcoords, qpdata, self.ebands.fermie, self.ebands.nelect,
-                                      cell, fm_symrel, has_timrev,
-                                      filter_params=filter_params, verbose=verbose)
-                skw_reim.append(skw)
-
-                if ks_ebands_kpath is None:
-                    # Interpolate QP energies.
-                    if reim == "real":
-                        eigens_kpath = skw.interp_kpts(kfrac_coords).eigens
-                    else:
-                        lw_kpath = skw.interp_kpts(kfrac_coords).eigens
-                else:
-                    # Interpolate QP energies corrections and add them to KS.
-                    ref_eigens = ks_ebands_kpath.eigens[:, :, bstart:bstop]
-                    qp_corrs = skw.interp_kpts_and_enforce_degs(kfrac_coords, ref_eigens, atol=ks_degatol).eigens
-                    if reim == "real":
-                        eigens_kpath = qp_corrs if only_corrections else ref_eigens + qp_corrs
-                    else:
-                        lw_kpath = qp_corrs
+        qpdata = qpes[:, :, bstart:bstop][..., itemp_list]
+        nsppol, nkcalc, nb, nt = qpdata.shape
+        qpdata = np.stack([qpdata.real, qpdata.imag])
+        qpdata = np.reshape(np.transpose(qpdata, (1, 2, 0, 4, 3)), (nsppol, nkcalc, 2 * nt * nb))
 
-            interpolators_t.append(skw_reim)
+        skw = SkwInterpolator(lpratio, gw_kcoords, qpdata, self.ebands.fermie, self.ebands.nelect,
+                              cell, fm_symrel, has_timrev,
+                              filter_params=filter_params, verbose=verbose)
+
+        # Evaluate all temperatures on the k-path in one call.
+        if ks_ebands_kpath is None:
+            # Interpolate QP energies.
+            vals_kpath = skw.interp_kpts(kfrac_coords).eigens
+        else:
+            # Interpolate QP energies corrections and add them to KS.
+            ref_eigens = ks_ebands_kpath.eigens[:, :, bstart:bstop]
+            vals_kpath = skw.interp_kpts_and_enforce_degs(kfrac_coords, ref_eigens, atol=ks_degatol).eigens
+        vals_kpath = np.reshape(vals_kpath, (nsppol, len(kfrac_coords), 2, nt, nb))
+
+        qp_ebands_kpath_t, qp_ebands_kmesh_t = [], []
+        for it, itemp in enumerate(itemp_list):
+            lw_kpath = vals_kpath[:, :, 1, it].copy()
+            if ks_ebands_kpath is None or only_corrections:
+                eigens_kpath = vals_kpath[:, :, 0, it].copy()
+            else:
+                eigens_kpath = ref_eigens + vals_kpath[:, :, 0, it]
 
             # Build new ebands object with k-path.
             kpts_kpath = Kpath(self.structure.reciprocal_lattice, kfrac_coords, weights=None, names=knames)
@@ -982,7 +1054,7 @@ class SigEPhFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
             qp_ebands_kmesh_t.append(newt)
 
         return TdepElectronBands(self.tmesh[itemp_list], ks_ebands_kpath, qp_ebands_kpath_t,
-                                 ks_ebands_kmesh, qp_ebands_kmesh_t, interpolators_t)
+                                 ks_ebands_kmesh, qp_ebands_kmesh_t, skw)
 
     @add_fig_kwargs
     def plot_qpgaps_t(self, qp_kpoints=0, ax_list=None, plot_qpmks=True, fontsize=8, **kwargs):
@@ -1281,8 +1353,8 @@ class SigEPhRobot(Robot, RobotWithEbands):
         """
         df_list = []; app = df_list.append
         for label, ncfile in self.items():
-            df = ncfile.get_dataframe_sk(spin, kpoint, index=None,
-                                         with_params=with_params, ignore_imag=ignore_imag)
+            app(ncfile.get_dataframe_sk(spin, kpoint, index=None,
+                                        with_params=with_params, ignore_imag=ignore_imag))
         return pd.concat(df_list)
 
     def get_dataframe(self, with_params=True, ignore_imag=False):
@@ -1296,11 +1368,28 @@ class SigEPhRobot(Robot, RobotWithEbands):
         """
         df_list = []; app = df_list.append
         for label, ncfile in self.items():
-            for spin in range(ncfile.nsppol):
-                for ikc, kpoint in enumerate(ncfile.sigma_kpoints):
-                    app(ncfile.get_dataframe_sk(spin, ikc, with_params=with_params, ignore_imag=ignore_imag))
+            app(ncfile.get_dataframe(with_params=with_params, ignore_imag=ignore_imag))
         return pd.concat(df_list)
 
+    def get_qpfield_conv_skb(self, field, spin, kpoint, band, itemp=None, abifiles=None):
+        """
+        Return |numpy-array| with the values of the QP ``field`` for the given (spin, kpoint, band)
+        extracted from the files treated by the robot. No :class:`QpTempState` is built.
+        Shape is [nfiles, ntemp] if itemp is None else [nfiles].
+
+        Args:
+            field: Name of the QP field e.g. "qpe", "re_qpe", "imag_qpe", "ze0", "qpeme0".
+            spin: Spin index.
+            kpoint: K-point in self-energy. Accepts |Kpoint|, vector or index.
+            band: Band index.
+            itemp: Temperature index. None for all temperatures.
+            abifiles: List of files. If None, all the files in the robot are used.
+        """
+        abifiles = self.abifiles if abifiles is None else abifiles
+        values = np.array([ncfile.reader.read_qptable(spin=spin, kpoint=kpoint, band=band)[field][0]
+                          for ncfile in abifiles])
+        return values if itemp is None else values[:, itemp]
+
     @add_fig_kwargs
     def plot_selfenergy_conv(self, spin, kpoint, band, itemp=0, sortby=None, hue=None,
                              colormap="jet", xlims=None, fontsize=8, **kwargs):
@@ -1539,26 +1628,21 @@ class SigEPhRobot(Robot, RobotWithEbands):
         ikc = nc0.sigkpt2index(kpoint)
         kpoint = nc0.sigma_kpoints[ikc]
 
-        # Sort and read QP data.
+        # Sort files.
         if hue is None:
             labels, ncfiles, params = self.sortby(sortby, unpack=True)
-            qplist = [ncfile.reader.read_qp(spin, kpoint, band) for ncfile in ncfiles]
         else:
             groups = self.group_and_sortby(hue, sortby)
-            qplist_group = []
-            for g in groups:
-                lst = [ncfile.reader.read_qp(spin, kpoint, band) for ncfile in g.abifiles]
-                qplist_group.append(lst)
 
         for ix, (ax, what) in enumerate(zip(ax_list, what_list)):
             if hue is None:
                 # Extract QP data.
-                yvals = [getattr(qp, what)[itemp] for qp in qplist]
+                yvals = self.get_qpfield_conv_skb(what, spin, kpoint, band, itemp=itemp, abifiles=ncfiles)
                 ax.plot(params, yvals, marker=nc0.marker_spin[spin])
             else:
-                for g, qplist in zip(groups, qplist_group):
+                for g in groups:
                     # Extract QP data.
-                    yvals = [getattr(qp, what)[itemp] for qp in qplist]
+                    yvals = self.get_qpfield_conv_skb(what, spin, kpoint, band, itemp=itemp, abifiles=g.abifiles)
                     label = "%s: %s" % (self._get_label(hue), g.hvalue)
                     ax.plot(g.xvalues, yvals, marker=nc0.marker_spin[spin],
                             label=label if ix == 0 else None)
@@ -1675,7 +1759,7 @@ class TdepElectronBands(object): # pragma: no cover
     Provides methods to plot renormalized band structures with linewidths.
     """
     def __init__(self, tmesh, ks_ebands_kpath, qp_ebands_kpath_t,
-                 ks_ebands_kmesh, qp_ebands_kmesh_t, interpolators_t):
+                 ks_ebands_kmesh, qp_ebands_kmesh_t, interpolator):
         """
         Args:
             tmesh: Array of temperatures in K.
@@ -1683,12 +1767,12 @@ class TdepElectronBands(object): # pragma: no cover
             qp_ebands_kpath_t: List of QP(T) bands on k-path (empty if not available).
             ks_ebands_kmesh: KS bands on k-mesh (None if not available).
             qp_ebands_kmesh_t: List of QP(T) bands on k-mesh (empty if not available).
-            interpolators_t: [ntemp, 2] interpolators for real/imaginary part.
+            interpolator: |SkwInterpolator| for the real and imaginary parts at all temperatures.
+                Values are packed along the band axis in blocks ordered as [reim, itemp].
         """
         self.tmesh = np.array(tmesh)
         self.ntemp = self.tmesh.size
-        self.interpolators_t = np.reshape(interpolators_t, (self.ntemp, 2))
-        assert len(self.interpolators_t) == self.ntemp
+        self.interpolator = interpolator
 
         self.ks_ebands_kpath = ks_ebands_kpath
         self.qp_ebands_kpath_t = qp_ebands_kpath_t
@@ -1991,11 +2075,72 @@ class SigmaPhReader(ElectronsReader):
             kpoint: K-point in self-energy. Accepts |Kpoint|, vector or index.
             ignore_imag: Only real part is returned if ``ignore_imag``.
         """
-        ikc = self.sigkpt2index(kpoint)
-        bstart, bstop = self.bstart_sk[spin, ikc], self.bstop_sk[spin, ikc]
+        return self.read_qptable(spin=spin, kpoint=kpoint, ignore_imag=ignore_imag).get_qplist()
+
+    @lazy_property
+    def qp_arrays(self):
+        """
+        Dictionary with the QP arrays read from file (energies in eV). Each array is read in one call.
+
+            qpe[nsppol, nkcalc, max_nbcalc, ntemp]: complex QP energies.
+            ze0[nsppol, nkcalc, max_nbcalc, ntemp]: renormalization factors.
+            e0[nsppol, nkcalc, max_nbcalc]: KS energies.
+
+        Band indices are shifted by bstart_sk.
+        """
+        return dict(
+            # nctkarr_t("qp_enes", "dp", "two, ntemp, max_nbcalc, nkcalc, nsppol")
+            qpe=self.read_value("qp_enes", cmode="c") * units.Ha_to_eV,
+            # nctkarr_t("ze0_vals", "dp", "ntemp, max_nbcalc, nkcalc, nsppol")
+            ze0=self.read_value("ze0_vals"),
+            # nctkarr_t("ks_enes", "dp", "max_nbcalc, nkcalc, nsppol")
+            e0=self.read_value("ks_enes") * units.Ha_to_eV,
+        )
 
-        return QpTempList([self.read_qp(spin, ikc, band, ignore_imag=ignore_imag)
-                           for band in range(bstart, bstop)])
+    def read_qptable(self, spin=None, kpoint=None, band=None, ignore_imag=False):
+        """
+        Return :class:`QpTempTable` with the QP results for the selected (spin, kpoint, band) states.
+        The data is extracted from :attr:`qp_arrays` with fancy indexing.
+
+        Args:
+            spin: Spin index. None to select all spins.
+            kpoint: K-point in self-energy. Accepts |Kpoint|, vector or index. None to select all k-points.
+            band: Band index. None to select all bands computed for the given (spin, kpoint).
+            ignore_imag: Only real part is returned if ``ignore_imag``.
+        """
+        if band is not None:
+            if spin is None or kpoint is None:
+                raise ValueError("spin and kpoint must be specified when band is not None.")
+            spin, ikc, ib, kpoint = self.get_sigma_skb_kpoint(spin, kpoint, band)
+            sk = [(spin, ikc)]
+            starts, nbs = np.array([band], dtype=np.int), np.array([1], dtype=np.int)
+        else:
+            spins = range(self.nsppol) if spin is None else [spin]
+            ikcs = range(self.nkcalc) if kpoint is None else [self.sigkpt2index(kpoint)]
+            sk = [(s, ikc) for s in spins for ikc in ikcs]
+            starts = np.array([self.bstart_sk[s, ikc] for s, ikc in sk], dtype=np.int)
+            nbs = np.array([self.nbcalc_sk[s, ikc] for s, ikc in sk], dtype=np.int)
+
+        # Build the (spin, ikc, band) indices of the rows.
+        spin_rows = np.repeat(np.array([s for s, _ in sk], dtype=np.int), nbs)
+        ikc_rows = np.repeat(np.array([ikc for _, ikc in sk], dtype=np.int), nbs)
+        band_rows = np.arange(nbs.sum()) - np.repeat(np.cumsum(nbs) - nbs, nbs) + np.repeat(starts, nbs)
+        skb = (spin_rows, ikc_rows, band_rows - self.bstart_sk[spin_rows, ikc_rows])
+
+        kpoints = np.empty(len(self.sigma_kpoints), dtype=object)
+        for ikc, k in enumerate(self.sigma_kpoints):
+            kpoints[ikc] = k
+
+        arrs = self.qp_arrays
+        qpe = arrs["qpe"][skb]
+        return QpTempTable(self.tmesh, OrderedDict([
+            ("spin", spin_rows),
+            ("kpoint", kpoints[ikc_rows]),
+            ("band", band_rows),
+            ("e0", arrs["e0"][skb]),
+            ("qpe", np.real(qpe) if ignore_imag else qpe),
+            ("ze0", arrs["ze0"][skb]),
+        ]))
 
     def read_sigeph_skb(self, spin, kpoint, band):
         """
@@ -2053,45 +2198,7 @@ class SigmaPhReader(ElectronsReader):
         Return :class:`QpTempState` for the given (spin, kpoint, band).
         Only real part is returned if ``ignore_imag``.
         """
-        spin, ikc, ib, kpoint = self.get_sigma_skb_kpoint(spin, kpoint, band)
-
-        def ri(a):
-            return np.real(a) if ignore_imag else a
-
-        # complex(dpc),allocatable :: qp_enes(:,:)
-        # qp_enes(ntemp, max_nbcalc)
-        # (Complex) QP energies computed with the non-adiabatic formalism.
-        # nctkarr_t("qp_enes", "dp", "two, ntemp, max_nbcalc, nkcalc, nsppol")
-        var = self.read_variable("qp_enes")
-        qpe = (var[spin, ikc, ib, :, 0] + 1j * var[spin, ikc, ib, :, 1]) * units.Ha_to_eV
-
-        #var = self.read_variable("qpadb_enes")
-        #qpe_adb = var[spin, ikc, ib, :] * units.Ha_to_eV
-
-        # nctkarr_t("dw_vals", "dp", "ntemp, max_nbcalc, nkcalc, nsppol"),
-        # Debye-Waller term (static).
-
-        # complex(dpc),allocatable :: vals_e0ks(:,:)
-        # vals_e0ks(ntemp, max_nbcalc)
-        # Sigma_eph(omega=eKS, kT, band) for fixed (kcalc, spin).
-        # TODO: Add Fan0 instead of computing Sigma - DW?
-
-        # nctkarr_t("ks_enes", "dp", "max_nbcalc, nkcalc, nsppol"),
-        #nctkarr_t("ze0_vals", "dp", "ntemp, max_nbcalc, nkcalc, nsppol"), &
-        e0 = self.read_variable("ks_enes")[spin, ikc, ib] * units.Ha_to_eV
-        ze0 = self.read_variable("ze0_vals")[spin, ikc, ib]
-
-        return QpTempState(
-            spin=spin,
-            kpoint=kpoint,
-            band=band,
-            tmesh=self.tmesh,
-            e0=e0,
-            qpe=ri(qpe),
-            #sigxme=self._sigxme[spin, ikc, ib_file],
-            #sigcmee0=ri(self._sigcmee0[spin, ikc, ib_file]),
-            ze0=ze0,
-        )
+        return self.read_qptable(spin=spin, kpoint=kpoint, band=band, ignore_imag=ignore_imag).get_qpstate(0)
 
     def read_allqps(self, ignore_imag=False):
         """
@@ -2100,13 +2207,5 @@ class SigmaPhReader(ElectronsReader):
         Args:
             ignore_imag: Only real part is returned if ``ignore_imag``.
         """
-        qps_spin = self.nsppol * [None]
-
-        for spin in range(self.nsppol):
-            qps = []
-            for ikc, kpoint in enumerate(self.sigma_kpoints):
-                for band in range(self.bstart_sk[spin, ikc], self.bstop_sk[spin, ikc]):
-                    qps.append(self.read_qp(spin, ikc, band, ignore_imag=ignore_imag))
-            qps_spin[spin] = QpTempList(qps)
-
-        return tuple(qps_spin)
+        table = self.read_qptable(ignore_imag=ignore_imag)
+        return tuple(table.take(table["spin"] == spin).get_qplist() for spin in range(self.nsppol))
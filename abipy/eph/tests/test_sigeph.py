@@ -6,6 +6,7 @@ import collections
 import numpy as np
 import abipy.data as abidata
 
+from pymatgen.core.units import Ha_to_eV
 from abipy.core.testing import AbipyTest
 from abipy import abilab
 
@@ -79,6 +80,31 @@ class SigEPhFileTest(AbipyTest):
         data = sigeph.get_dataframe()
         assert "ze0" in data
 
+        # Test QpTempTable
+        table = sigeph.reader.read_qptable()
+        assert len(table) == sum(len(qps) for qps in sigeph.qplist_spin)
+        assert len(data) == len(table) * sigeph.ntemp
+        assert table["qpe"].shape == (len(table), sigeph.ntemp)
+        self.assert_equal(table["qpeme0"], table["qpe"] - table["e0"][:, None])
+        sk_table = sigeph.reader.read_qptable(spin=0, kpoint=1)
+        assert all(k is sigeph.sigma_kpoints[1] for k in sk_table["kpoint"])
+        qp = sk_table.get_qpstate(0)
+        assert qp.band == sigeph.bstart_sk[0, 1] and qp.tmesh is sigeph.tmesh
+        self.assert_equal(qp.qpe, sigeph.reader.read_qp(0, 1, qp.band).qpe)
+        # Compare with the values read directly from the netcdf variables.
+        qp = sk_table.get_qpstate(len(sk_table) - 1)
+        ib = qp.band - sigeph.bstart_sk[0, 1]
+        assert ib > 0
+        self.assert_almost_equal(qp.qpe, sigeph.reader.read_value("qp_enes", cmode="c")[0, 1, ib] * Ha_to_eV)
+        self.assert_almost_equal(qp.e0, sigeph.reader.read_value("ks_enes")[0, 1, ib] * Ha_to_eV)
+        self.assert_almost_equal(qp.ze0, sigeph.reader.read_value("ze0_vals")[0, 1, ib])
+        # Negative temperature indices are normalized.
+        df = table.get_dataframe(itemp=-1)
+        assert len(df) == len(table) and np.all(df.index == sigeph.ntemp - 1)
+        self.assert_equal(df["qpe"].values, table["qpe"][:, -1])
+        with self.assertRaises(ValueError):
+            sigeph.reader.read_qptable(spin=0, kpoint=1, band=100)
+
         if self.has_matplotlib():
             # Test sigeph plot methods.
             assert sigeph.plot_qpgaps_t(show=False)
@@ -231,6 +257,16 @@ class SigEPhFileTest(AbipyTest):
 
             data = robot.get_dataframe()
             assert "qpe" in data
+            data_sk = robot.get_dataframe_sk(spin=0, kpoint=0)
+            assert len(data_sk) == 2 * len(robot.abifiles[0].get_dataframe_sk(spin=0, kpoint=0))
+
+            ze0 = robot.get_qpfield_conv_skb("ze0", spin=0, kpoint=0, band=3)
+            assert ze0.shape == (2, robot.abifiles[0].ntemp)
+            re_qpe = robot.get_qpfield_conv_skb("re_qpe", spin=0, kpoint=0, band=3, itemp=1)
+            reader = robot.abifiles[0].reader
+            ib = 3 - reader.bstart_sk[0, 0]
+            self.assert_almost_equal(re_qpe, reader.read_value("qp_enes", cmode="c")[0, 0, ib, 1].real * Ha_to_eV)
+            self.assert_almost_equal(ze0[:, 0], reader.read_value("ze0_vals")[0, 0, ib, 0])
 
             # Test plot methods
             if self.has_matplotlib():
@@ -22,7 +22,7 @@ from pymatgen.io.abinit.works import *
 from pymatgen.io.abinit.flows import (Flow, G0W0WithQptdmFlow, bandstructure_flow, PhononFlow,
     g0w0_flow, phonon_flow, phonon_conv_flow, NonLinearCoeffFlow)
 from pymatgen.io.abinit.abitimer import AbinitTimerParser, AbinitTimerSection
-from pymatgen.io.abinit.abiinspect import GroundStateScfCycle, D2DEScfCycle
+from pymatgen.io.abinit.abiinspect import GroundStateScfCycle, D2DEScfCycle, Relaxation
 
 from abipy.flowtk.works import *
 
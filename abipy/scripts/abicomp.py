@@ -9,7 +9,6 @@ from __future__ import unicode_literals, division, print_function, absolute_impo
 import sys
 import os
 import argparse
-import numpy as np
 
 from pprint import pprint
 from monty.functools import prof_main
@@ -389,6 +388,7 @@ def abicomp_getattr(options):
         # Plot values.
         from abipy.tools.plotting import get_ax_fig_plt
         ax, fig, plt = get_ax_fig_plt()
+        import numpy as np
         xs = np.arange(len(options.paths[1:]))
         ax.plot(xs, values)
         ax.set_ylabel(attr_name)
@@ -425,7 +425,18 @@ def abicomp_ddb(options):
     Compare multiple DDB files. Assume DDB files with a list of q-points in the IBZ
     corresponding to homogeneous sampling i.e. files that have been merged with mrgddb.
     """
-    return _invoke_robot(options)
+    if options.anaddb_cache:
+        # Reuse the results of previous anaddb runs.
+        from abipy.dfpt.ddb import AnaddbCache
+        abilab.DdbFile.anaddb_cache = AnaddbCache()
+
+    retcode = _invoke_robot(options)
+
+    if options.anaddb_cache:
+        # Print number of hits and misses.
+        print(abilab.DdbFile.anaddb_cache)
+
+    return retcode
 
 
 def abicomp_phbst(options):
@@ -911,6 +922,8 @@ def get_parser(with_epilog=False):
     p_gsr = subparsers.add_parser('gsr', parents=robot_parents, help=abicomp_gsr.__doc__)
     p_hist = subparsers.add_parser('hist', parents=robot_parents, help=abicomp_hist.__doc__)
     p_ddb = subparsers.add_parser('ddb', parents=robot_parents, help=abicomp_ddb.__doc__)
+    p_ddb.add_argument("--anaddb-cache", default=False, action="store_true",
+            help="Store the results of anaddb in ~/.abinit/abipy/anaddb_cache and reuse them if available.")
     p_phbst = subparsers.add_parser('phbst', parents=robot_parents, help=abicomp_phbst.__doc__)
     p_sigres = subparsers.add_parser('sigres', parents=robot_parents, help=abicomp_sigres.__doc__)
     p_mdf = subparsers.add_parser('mdf', parents=robot_parents, help=abicomp_mdf.__doc__)
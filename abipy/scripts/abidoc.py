@@ -143,7 +143,7 @@ def main():
         print_vlist(vlist, options)
 
     elif options.command == "find":
-        vlist = [v for v in database.values() if options.varname in v.varname]
+        vlist = [database[name] for name in database if options.varname in name]
         print("Find results:\n")
         print_vlist(vlist, options)
 
@@ -7,7 +7,6 @@ from __future__ import unicode_literals, division, print_function, absolute_impo
 import sys
 import os
 import argparse
-import numpy as np
 
 from pprint import pprint
 from tabulate import tabulate
@@ -15,14 +14,10 @@ from warnings import warn
 from monty.string import marquee
 from monty.functools import prof_main
 from monty.termcolor import cprint
-from pymatgen.io.vasp.outputs import Xdatcar
 from abipy import abilab
-from abipy.core.symmetries import AbinitSpaceGroup
-from abipy.core.kpoints import Ktables, Kpoint
-from abipy.core.structure import diff_structures
-from abipy.iotools.visualizer import Visualizer
-from abipy.iotools.xsf import xsf_write_structure
-from abipy.abio import factories
+
+# Note: heavy modules (numpy, pymatgen, abipy.core.structure ...) are imported
+# in the branch of the command that needs them to reduce the startup time.
 
 
 #def remove_equivalent_atoms(structure):
@@ -135,6 +130,7 @@ Use `-v` to increase verbosity level (can be supplied multiple times e.g -vv).
 """
 
 def get_parser(with_epilog=False):
+    from abipy.iotools.visualizer import Visualizer
 
     # Parent parser for commands that need to know the filepath
     path_selector = argparse.ArgumentParser(add_help=False)
@@ -458,6 +454,8 @@ def main():
             print("FILE does not contain Abinit symmetry operations.")
             print("Calling Abinit in --dry-run mode with chkprim = 0 to get space group.")
             from abipy.data.hgh_pseudos import HGH_TABLE
+            from abipy.abio import factories
+            from abipy.core.structure import diff_structures
             gsinp = factories.gs_input(structure, HGH_TABLE, spin_mode="unpolarized")
             gsinp["chkprim"] = 0
             abistructure = gsinp.abiget_spacegroup(tolsym=options.tolsym)
@@ -477,6 +475,7 @@ def main():
     elif options.command == "supercell":
         structure = abilab.Structure.from_file(options.filepath)
 
+        import numpy as np
         options.scaling_matrix = np.array(options.scaling_matrix)
         if len(options.scaling_matrix) == 9:
             options.scaling_matrix.shape = (3, 3)
@@ -649,6 +648,7 @@ def main():
 
     elif options.command == "ktables":
         structure = abilab.Structure.from_file(options.filepath)
+        from abipy.core.kpoints import Ktables
         k = Ktables(structure, options.mesh, options.is_shift, not options.no_time_reversal)
         print(k)
         print("")
@@ -664,6 +664,7 @@ def main():
     elif options.command == "abikmesh":
         structure = abilab.Structure.from_file(options.filepath)
         from abipy.data.hgh_pseudos import HGH_TABLE
+        from abipy.abio import factories
         gsinp = factories.gs_input(structure, HGH_TABLE, spin_mode="unpolarized")
         ibz = gsinp.abiget_ibz(ngkpt=options.ngkpt, shiftk=options.shiftk, kptopt=options.kptopt)
         for i, (k, w) in enumerate(zip(ibz.points, ibz.weights)):
@@ -681,6 +682,7 @@ def main():
             cprint("Your file does not contain Abinit symmetry operations.", "yellow")
             cprint("Will call spglib to obtain the space group (assuming time-reversal: %s)" %
                    (not options.no_time_reversal), "yellow")
+            from abipy.core.symmetries import AbinitSpaceGroup
             spgrp = AbinitSpaceGroup.from_structure(structure, has_timerev=not options.no_time_reversal,
                         symprec=options.symprec, angle_tolerance=options.angle_tolerance)
         print()
@@ -698,6 +700,7 @@ def main():
         if structure.abi_spacegroup is None:
             structure.spgset_abi_spacegroup(has_timerev=not options.no_time_reversal)
 
+        from abipy.core.kpoints import Kpoint
         kpoint = Kpoint(options.kpoint, structure.reciprocal_lattice)
         kstar = kpoint.compute_star(structure.abi_spacegroup, wrap_tows=True)
         print("Found %s points in the star of %s\n" % (len(kstar), repr(kpoint)))
@@ -772,6 +775,7 @@ def main():
                 structures = hist.structures
 
         elif "XDATCAR" in filepath:
+            from pymatgen.io.vasp.outputs import Xdatcar
             structures = Xdatcar(filepath).structures
             if not structures:
                 raise RuntimeError("Your Xdatcar contains only one structure. Due to a bug "
@@ -780,6 +784,7 @@ def main():
         else:
             raise ValueError("Don't know how to handle file %s" % filepath)
 
+        from abipy.iotools.xsf import xsf_write_structure
         xsf_write_structure(sys.stdout, structures)
 
     else:
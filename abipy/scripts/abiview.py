@@ -8,13 +8,10 @@ from __future__ import unicode_literals, division, print_function, absolute_impo
 import sys
 import os
 import argparse
-import numpy as np
 
 from monty.functools import prof_main
 from monty.termcolor import cprint
 from abipy import abilab
-from abipy.iotools.visualizer import Visualizer
-from abipy.tools.plotting import MplExpose
 
 
 def handle_overwrite(path, options):
@@ -98,6 +95,7 @@ def abiview_ebands(options):
     Plot electronic bands if file contains high-symmetry k-path or DOS if k-sampling.
     Accept any file with ElectronBands e.g. GSR.nc, WFK.nc, ...
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         if options.xmgrace:
             outpath = options.filepath + ".agr"
@@ -124,6 +122,7 @@ def abiview_fatbands(options):
     Plot electronic fatbands bands if file contains high-symmetry k-path
     or PJDOS if k-sampling. Requires FATBANDS.nc file.
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
 
@@ -143,6 +142,7 @@ def abiview_optic(options):
     """
     Plot optical spectra produced by optic code. Requires OPTIC.nc file.
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
 
@@ -162,6 +162,7 @@ def abiview_ddb(options):
     """
     Invoke Anaddb to compute phonon bands and DOS from the DDB, plot the results.
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as ddb:
         print(ddb.to_string(verbose=options.verbose))
 
@@ -211,6 +212,7 @@ asr = {asr}, chneut = {chneut}, dipdip = {dipdip}, lo_to_splitting = {lo_to_spli
 
 def abiview_phbands(options):
     """Plot phonon bands. Accept any file with PhononBands e.g. PHBST.nc, ..."""
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         if options.xmgrace:
             outpath = options.filepath + ".agr"
@@ -235,6 +237,7 @@ def abiview_phbands(options):
 
 def abiview_phdos(options):
     """Plot phonon DOS. Require PHDOS.nc file."""
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         phdos = abifile.phdos
         print(abifile.to_string(verbose=options.verbose))
@@ -250,6 +253,7 @@ def abiview_scr(options):
     """
     Plot screening results computed by GW code. Requires SCR.nc file.
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
         with MplExpose(slide_mode=options.slide_mode, slide_timeout=options.slide_timeout) as e:
@@ -267,6 +271,7 @@ def abiview_sigres(options):
     """
     Plot the QP results. Requires SIGRES.nc file.
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
         with MplExpose(slide_mode=options.slide_mode, slide_timeout=options.slide_timeout) as e:
@@ -283,6 +288,7 @@ def abiview_mdf(options):
     Plot the macroscopic dielectric functions computed by the Bethe-Salpeter code.
     Requires MDF.nc file.
     """
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
         with MplExpose(slide_mode=options.slide_mode, slide_timeout=options.slide_timeout) as e:
@@ -313,6 +319,7 @@ def abiview_denpot(options):
 
 def abiview_gruns(options):
     """Plot Grunesein parameters. Requires GRUNS.nc file."""
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
         with MplExpose(slide_mode=options.slide_mode, slide_timeout=options.slide_timeout) as e:
@@ -324,6 +331,7 @@ def abiview_gruns(options):
 
 def abiview_eph(options):
     """Plot Eliashberg function. Requires EPH.nc file."""
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
         with MplExpose(slide_mode=options.slide_mode, slide_timeout=options.slide_timeout) as e:
@@ -339,6 +347,7 @@ def abiview_eph(options):
 
 def abiview_sigeph(options):
     """Plot e-ph self-energy. Requires SIGEPH.nc file."""
+    from abipy.tools.plotting import MplExpose
     with abilab.abiopen(options.filepath) as abifile:
         print(abifile.to_string(verbose=options.verbose))
         with MplExpose(slide_mode=options.slide_mode, slide_timeout=options.slide_timeout) as e:
@@ -420,6 +429,7 @@ Use `-v` to increase verbosity level (can be supplied multiple times e.g -vv).
 #abiview.py denpot out_DEN.nc --chgcar     ==>  Convert DEN file into CHGCAR fileformat.
 
 def get_parser(with_epilog=False):
+    from abipy.iotools.visualizer import Visualizer
 
     # Parent parser for common options.
     copts_parser = argparse.ArgumentParser(add_help=False)
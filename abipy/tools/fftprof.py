@@ -16,6 +16,7 @@ from abipy.tools.plotting import add_fig_kwargs, get_ax_fig_plt
 
 __all__ = [
     "FFTBenchmark",
+    "benchmark_mesh_fft",
 ]
 
 _color_fftalg = {
@@ -373,3 +374,46 @@ class FFTProf(object):
 
             bench = FFTBenchmark.from_file(prof_file)
             bench.plot()
+
+
+def benchmark_mesh_fft(shape, nband=1, backends=("numpy", "scipy", "pyfftw"), nthreads=None, repeat=3):
+    """
+    Benchmark the FFT backends of |Mesh3D| with a batch of ``nband`` complex arrays.
+    Backends whose library is not installed are skipped.
+
+    Args:
+        shape: Divisions of the FFT mesh.
+        nband: Number of arrays transformed in a single call.
+        backends: List with the name of the backends.
+        nthreads: Number of threads used by the backends.
+        repeat: The wall-time is the minimum over ``repeat`` executions of the G --> R and R --> G transforms.
+
+    Return: |pandas-DataFrame| with the wall-time in seconds of the forward and backward transforms.
+    """
+    import time
+    import pandas as pd
+    from abipy.core.mesh3d import Mesh3D
+
+    rows = []
+    for backend in backends:
+        mesh = Mesh3D(shape, np.eye(3), fft_backend=backend, fft_nthreads=nthreads)
+        fg = mesh.crandom(extra_dims=nband)
+        try:
+            # The first call initializes the backend (and the plans).
+            mesh.fft_r2g(mesh.fft_g2r(fg))
+        except ImportError:
+            continue
+
+        g2r_times, r2g_times = [], []
+        for i in range(repeat):
+            start = time.time()
+            fr = mesh.fft_g2r(fg)
+            g2r_times.append(time.time() - start)
+            start = time.time()
+            mesh.fft_r2g(fr)
+            r2g_times.append(time.time() - start)
+
+        rows.append(dict(backend=backend, shape=tuple(mesh.shape), nband=nband,
+                         g2r_time=min(g2r_times), r2g_time=min(r2g_times)))
+
+    return pd.DataFrame(rows, columns=["backend", "shape", "nband", "g2r_time", "r2g_time"])
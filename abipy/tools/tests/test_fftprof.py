@@ -3,10 +3,11 @@
 from __future__ import division, print_function, absolute_import, unicode_literals
 
 import os
+import numpy as np
 import abipy.data as abidata
 
 from abipy.core.testing import AbipyTest
-from abipy.tools.fftprof import FFTBenchmark
+from abipy.tools.fftprof import FFTBenchmark, benchmark_mesh_fft
 
 
 class FftProfTest(AbipyTest):
@@ -32,3 +33,9 @@ class FftProfTest(AbipyTest):
         if self.has_matplotlib():
             #test0.plot_ax()
             assert bench.plot(show=False)
+
+    def test_benchmark_mesh_fft(self):
+        """Testing benchmark of the Mesh3D FFT backends."""
+        df = benchmark_mesh_fft((8, 8, 8), nband=2, backends=["numpy", "scipy"], repeat=1)
+        assert "numpy" in df["backend"].values
+        assert np.all(df["g2r_time"] >= 0)
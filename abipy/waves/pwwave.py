@@ -190,8 +190,8 @@ class WaveFunction(object):
             :math:`u(r)` on the real space FFT box.
         """
         mesh = self.mesh if mesh is None else mesh
-        ug_mesh = self.get_ug_mesh(mesh=mesh)
-        return mesh.fft_g2r(ug_mesh, fg_ishifted=False)
+        # Real FFTs are used if istwfk == 2.
+        return self.gsphere.fft_g2r(mesh, self.ug)
 
     def to_string(self, verbose=0):
         """String representation."""
@@ -261,10 +261,9 @@ class PWWaveFunction(WaveFunction):
         """
         space = space.lower()
 
-        if space == "g":
-            return np.real(np.vdot(self.ug, self.ug))
-        elif space == "gsphere":
-            return np.real(np.vdot(self.ug, self.ug))
+        if space in ("g", "gsphere"):
+            # Take into account the G-vectors that are not stored if istwfk > 1.
+            return np.real(self.gsphere.vdot(self.ug, self.ug))
         elif space == "r":
             return np.vdot(self.ur, self.ur) / self.mesh.size
         else:
@@ -290,7 +289,7 @@ class PWWaveFunction(WaveFunction):
             ug2_mesh = other.gsphere.tofftmesh(self.mesh, other.ug) if other is not self else ug1_mesh
             return np.vdot(ug1_mesh, ug2_mesh)
         elif space == "gsphere":
-            return np.vdot(self.ug, other.ug)
+            return self.gsphere.vdot(self.ug, other.ug)
         elif space == "r":
             return np.vdot(self.ur, other.ur) / self.mesh.size
         else:
@@ -4,6 +4,7 @@ from __future__ import print_function, division, unicode_literals, absolute_impo
 import numpy as np
 import abipy.data as abidata
 
+from abipy.core import Density
 from abipy.core.testing import AbipyTest
 from abipy.waves import WfkFile
 
@@ -86,6 +87,26 @@ class TestWFKFile(AbipyTest):
 
         wave.export_ur2(".xsf")
 
+        # Block reads.
+        waves = wfk.get_waves(spin, kpoint, band_range=(0, 4))
+        assert len(waves) == 4 and [w.band for w in waves] == [0, 1, 2, 3]
+        assert waves[0] == wave and waves[1] == other_wave
+        assert len(wfk.get_waves(spin, kpoint)) == wfk.nband_sk[spin, 0]
+        with self.assertRaises(ValueError):
+            wfk.get_waves(spin, kpoint, band_range=(0, wfk.nband_sk[spin, 0] + 1))
+
+        ug_block = wfk.reader.read_ug_block(spin, 1)
+        assert ug_block.shape == (wfk.nband_sk[spin, 1], wfk.nspinor, wfk.npwarr[1])
+        self.assert_equal(ug_block[2], wfk.reader.read_ug(spin, 1, 2))
+
+        # Stream the blocks with a small memory cap (one band per block).
+        blocks = list(wfk.reader.iter_ug_blocks(kpoints=[0, 1], band_range=(1, 4), max_mb=1e-6))
+        assert [(b[0], b[1], b[2], len(b[3])) for b in blocks] == \
+            [(0, 0, 1, 1), (0, 0, 2, 1), (0, 0, 3, 1), (0, 1, 1, 1), (0, 1, 2, 1), (0, 1, 3, 1)]
+        nwaves = sum(wfk.nband_sk[0, ik] for ik in range(wfk.nkpt))
+        assert len(list(wfk.iter_waves())) == nwaves
+        assert [w.band for w in wfk.iter_waves(kpoints=[0], band_range=(2, 5), max_mb=1e-6)] == [2, 3, 4]
+
         if self.has_matplotlib():
             assert wave.plot_line(0, 1, num=100, show=False)
             assert wave.plot_line([0, 0, 0], [2, 2, 2], num=100, with_krphase=True, show=False)
@@ -100,3 +121,19 @@ class TestWFKFile(AbipyTest):
             wfk.write_notebook(nbpath=self.get_tmpname(text=True))
 
         wfk.close()
+
+    def test_get_density(self):
+        """Testing the computation of the density from the WFK file."""
+        with WfkFile(abidata.ref_file("si_scf_WFK.nc")) as wfk:
+            # Compare with the density computed by Abinit. Use small blocks.
+            den = wfk.get_density(max_mb=0.05)
+            ref_den = Density.from_file(abidata.ref_file("si_DEN.nc"))
+            assert den.nspden == 1 and den.mesh.shape == ref_den.mesh.shape
+            self.assert_almost_equal(den.datar, ref_den.datar)
+            self.assert_almost_equal(den.get_nelect(), 8)
+
+            # Band-resolved densities.
+            den = wfk.get_density(band_range=(0, 1), use_occupations=False)
+            self.assert_almost_equal(den.get_nelect(), 2)
+            den = wfk.get_density(band_range=(4, 6), use_occupations=False, symmetrize=False)
+            self.assert_almost_equal(den.get_nelect(), 4)
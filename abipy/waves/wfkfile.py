@@ -7,7 +7,7 @@ import numpy as np
 
 from monty.functools import lazy_property
 from monty.string import marquee # is_string, list_strings,
-from abipy.core import Mesh3D, GSphere, Structure
+from abipy.core import Mesh3D, GSphere, Structure, Density
 from abipy.core.mixins import AbinitNcFile, Has_Header, Has_Structure, Has_ElectronBands, NotebookWriter
 from abipy.iotools import ETSF_Reader, Visualizer
 from abipy.electrons.ebands import ElectronsReader
@@ -158,6 +158,134 @@ class WfkFile(AbinitNcFile, Has_Header, Has_Structure, Has_ElectronBands, Notebo
 
         return wave
 
+    def get_waves(self, spin, kpoint, band_range=None):
+        """
+        Read a contiguous block of bands with a single netcdf read.
+        Much faster than calling :meth:`get_wave` for each band.
+
+        Args:
+            spin: spin index. Must be in (0, 1)
+            kpoint: Either :class:`Kpoint` instance or integer giving the sequential index in the IBZ (C-convention).
+            band_range: (start, stop) tuple or range object with the bands e.g. `band_range=(0, 5)`
+                to read [0, 1, 2, 3, 4]. None for all the bands.
+
+        Return: List of :class:`PWWaveFunction` objects.
+        """
+        ik = self.kindex(kpoint)
+        if spin not in range(self.nsppol) or ik not in range(self.nkpt):
+            raise ValueError("Wrong (spin, kpt) indices")
+
+        start, _ = self.reader._get_band_range(spin, ik, band_range)
+        return self._build_waves(spin, ik, start, self.reader.read_ug_block(spin, ik, band_range=band_range))
+
+    def iter_waves(self, spins=None, kpoints=None, band_range=None, max_mb=None):
+        """
+        Generator yielding :class:`PWWaveFunction` objects. The coefficients are read
+        in blocks of bands at fixed (spin, k-point), see :meth:`WFK_Reader.iter_ug_blocks`.
+
+        Args:
+            spins: List of spin indices. None for all spins.
+            kpoints: List of :class:`Kpoint` objects or integers. None for all k-points.
+            band_range: (start, stop) tuple or range object with the bands. None for all the bands.
+            max_mb: Maximum size in Mb of the blocks read from file. None to read all the bands at once.
+        """
+        for spin, ik, band_start, ug_block in self.reader.iter_ug_blocks(spins=spins, kpoints=kpoints,
+                                                                        band_range=band_range, max_mb=max_mb):
+            for wave in self._build_waves(spin, ik, band_start, ug_block):
+                yield wave
+
+    def _build_waves(self, spin, ik, band_start, ug_block):
+        """Build the list of :class:`PWWaveFunction` from a block of coefficients."""
+        waves = []
+        for i, ug_skb in enumerate(ug_block):
+            wave = PWWaveFunction(self.structure, self.nspinor, spin, band_start + i, self.gspheres[ik], ug_skb)
+            wave.set_mesh(self.fft_mesh)
+            waves.append(wave)
+        return waves
+
+    def get_density(self, spins=None, kpoints=None, band_range=None, use_occupations=True,
+                    symmetrize=True, max_mb=100):
+        r"""
+        Compute the electron density :math:`\rho(r) = \sum_{nk} w_k f_{nk} |u_{nk}(r)|^2 / \Omega`
+        from the wavefunctions stored in the file. The sum can be restricted to a set of
+        spins, k-points and bands to obtain partial densities.
+
+        The wavefunctions are read and transformed to real space in blocks at fixed (spin, k-point)
+        so that the memory required does not depend on the number of k-points and bands.
+
+        Args:
+            spins: List of spin indices. None for all spins.
+            kpoints: List of :class:`Kpoint` objects or integers. None for all k-points.
+            band_range: (start, stop) tuple or range object with the bands. None for all the bands.
+            use_occupations: If True, the states are weighted with the occupation factors
+                reported in the file. If False, each state is fully occupied (band-resolved densities).
+            symmetrize: True if the density computed with the k-points in the IBZ
+                should be symmetrized with the operations of the space group.
+            max_mb: Maximum size in Mb of the wavefunctions in real space processed at once.
+
+        Return: |Density| object. Only the total density is computed if nspinor == 2.
+
+        .. note::
+
+            For PAW calculations, the density does not include the on-site contributions.
+        """
+        mesh, nspinor = self.fft_mesh, self.nspinor
+        nsppol = self.nsppol
+        spins = range(nsppol) if spins is None else spins
+        kinds = range(self.nkpt) if kpoints is None else [self.kindex(k) for k in kpoints]
+        weights = self.kpoints.weights
+        occfacts = self.ebands.occfacts
+        full_occ = 2.0 if nsppol == 1 and nspinor == 1 else 1.0
+
+        # Number of bands in real space that fit in max_mb (complex numbers, nspinor components).
+        nbatch = max(1, int(max_mb * 1024**2 / (nspinor * mesh.size * 16)))
+
+        rhor = np.zeros((nsppol, mesh.size))
+        for spin in spins:
+            for ik in kinds:
+                start, stop = self.reader._get_band_range(spin, ik, band_range)
+                if use_occupations:
+                    # Exclude the empty states at the top.
+                    occupied = np.nonzero(occfacts[spin, ik, start:stop])[0]
+                    if len(occupied) == 0: continue
+                    stop = start + occupied[-1] + 1
+
+                gsphere = self.gspheres[ik]
+                for _, _, band_start, ug_block in self.reader.iter_ug_blocks(spins=[spin], kpoints=[ik],
+                        band_range=(start, stop), max_mb=max_mb):
+                    for i in range(0, len(ug_block), nbatch):
+                        ug = ug_block[i:i + nbatch]
+                        nb = len(ug)
+                        # Batched FFT G --> R of the [nb, nspinor] block (real FFTs if istwfk == 2).
+                        ur = gsphere.fft_g2r(mesh, ug).reshape(nb, nspinor, mesh.size)
+                        ur2 = (ur.real ** 2 + ur.imag ** 2) if np.iscomplexobj(ur) else ur ** 2
+                        ur2 = ur2.sum(axis=1)
+                        if use_occupations:
+                            b0 = band_start + i
+                            occ = occfacts[spin, ik, b0:b0 + nb]
+                        else:
+                            occ = np.full(nb, full_occ)
+                        rhor[spin] += np.dot(weights[ik] * occ, ur2)
+
+        if symmetrize:
+            abispg = self.structure.abi_spacegroup
+            if abispg is None:
+                raise ValueError("Cannot symmetrize the density since structure does not have abi_spacegroup")
+            # Average over the operations of the group (in G-space, see Mesh3D.symmetrize_fr).
+            rhor = rhor.reshape((nsppol,) + mesh.shape)
+            if nsppol == 1:
+                rhor = mesh.symmetrize_fr(rhor, abispg.symrel, abispg.tnons)
+            else:
+                # The magnetization changes sign under the antiferromagnetic operations.
+                total = mesh.symmetrize_fr(rhor[0] + rhor[1], abispg.symrel, abispg.tnons)
+                mag = mesh.symmetrize_fr(rhor[0] - rhor[1], abispg.symrel, abispg.tnons, signs=abispg.symafm)
+                rhor = np.array([total + mag, total - mag]) / 2
+
+        # Density in e/Ang^3 as in Density.
+        rhor /= self.structure.volume
+        return Density(nspinor=1, nsppol=nsppol, nspden=nsppol, datar=rhor.reshape((nsppol,) + mesh.shape),
+                       structure=self.structure, iorder="c")
+
     def export_ur2(self, filepath, spin, kpoint, band, visu=None):
         """
         Export :math:`|u(r)|^2` on file filename.
@@ -372,12 +500,78 @@ class WFK_Reader(ElectronsReader):
 
     def read_ug(self, spin, kpoint, band):
         """Read the Fourier components of the wavefunction."""
+        return self.read_ug_block(spin, kpoint, band_range=(band, band + 1))[0]
+
+    def _get_band_range(self, spin, ik, band_range):
+        """
+        Convert ``band_range`` to a (start, stop) tuple with the contiguous set of bands at (spin, ik).
+        None means all the bands available in the file.
+        """
+        nband = self.nband_sk[spin, ik]
+        if band_range is None: return 0, nband
+        if hasattr(band_range, "step"):
+            # range object.
+            if band_range.step != 1:
+                raise ValueError("Only contiguous band ranges are supported, got step: %s" % band_range.step)
+            band_range = (band_range.start, band_range.stop)
+
+        start, stop = band_range
+        if not 0 <= start < stop <= nband:
+            raise ValueError("Invalid band_range (%s, %s) for spin: %s, ik: %s, nband: %s" % (
+                start, stop, spin, ik, nband))
+        return start, stop
+
+    def read_ug_block(self, spin, kpoint, band_range=None):
+        """
+        Read the Fourier components of a contiguous block of bands with a single hyperslab.
+
+        Args:
+            spin: Spin index.
+            kpoint: :class:`Kpoint` object or integer.
+            band_range: (start, stop) tuple or range object with the bands to read e.g.
+                `band_range=(0, 5)` to read [0, 1, 2, 3, 4]. None to read all the bands.
+
+        Return: Complex array of shape [nband, nspinor, npw_k].
+        """
         ik = self.kindex(kpoint)
-        npw_k, istwfk = self.npwarr[ik], self.istwfk[ik]
+        npw_k = self.npwarr[ik]
         if self.cplex_ug != 2:
             raise NotImplementedError("")
 
-        # Read data from file (we don't store the full block full block in memory!).
+        start, stop = self._get_band_range(spin, ik, band_range)
         var = self.rootgrp.variables["coefficients_of_wavefunctions"]
-        value = var[spin, ik, band, :, :npw_k, :]
-        return value[..., 0] + 1j*value[..., 1]  # Build complex array
+        value = var[spin, ik, start:stop, :, :npw_k, :]
+        # Reinterpret the (real, imag) pairs as complex numbers without copying the data.
+        value = np.ascontiguousarray(value, dtype=np.float64)
+        return value.view(np.complex128).reshape(value.shape[:-1])
+
+    def iter_ug_blocks(self, spins=None, kpoints=None, band_range=None, max_mb=None):
+        """
+        Generator yielding the Fourier components of the wavefunctions, one (spin, k-point) at a time.
+
+        Args:
+            spins: List of spin indices. None for all spins.
+            kpoints: List of :class:`Kpoint` objects or integers. None for all k-points.
+            band_range: (start, stop) tuple or range object with the bands to read. None for all the bands.
+            max_mb: Maximum size in Mb of the blocks. If the bands at a given (spin, k-point)
+                do not fit, they are read in several chunks. None to read all the bands at once.
+
+        Yields: (spin, ik, band_start, ug_block) tuples where ug_block is a complex array
+            of shape [nb, nspinor, npw_k] with the coefficients of the bands [band_start, band_start + nb).
+        """
+        spins = range(self.nsppol) if spins is None else spins
+        kpoints = range(len(self.kpoints)) if kpoints is None else kpoints
+
+        for spin in spins:
+            for kpoint in kpoints:
+                ik = self.kindex(kpoint)
+                start, stop = self._get_band_range(spin, ik, band_range)
+                nb = stop - start
+                if max_mb is not None:
+                    # Each band requires nspinor * npw_k complex numbers.
+                    # The netcdf buffer is reinterpreted as complex array without copying.
+                    band_mb = self.nspinor * self.npwarr[ik] * 16 / 1024**2
+                    nb = max(1, min(nb, int(max_mb / band_mb)))
+
+                for bstart in range(start, stop, nb):
+                    yield spin, ik, bstart, self.read_ug_block(spin, ik, band_range=(bstart, min(bstart + nb, stop)))
@@ -2,7 +2,9 @@
 """Test manager files."""
 from __future__ import print_function, division, unicode_literals, absolute_import
 
+import sys
 import os
+import subprocess
 import abipy.data as abidata
 from abipy import abilab
 
@@ -41,4 +43,53 @@ class AbilabTest(AbipyTest):
         abilab.enable_notebook(with_seaborn=True)
         assert abilab.in_notebook()
         abilab.disable_notebook()
-        assert not abilab.in_notebook()
\ No newline at end of file
+        assert not abilab.in_notebook()
+
+    def test_lazy_imports(self):
+        """Testing lazy imports in abilab"""
+        # Run the code in a new interpreter to start with a clean sys.modules.
+        def run_python(code):
+            out = subprocess.check_output([sys.executable, "-c", code])
+            return out.decode("utf-8").split()
+
+        heavy_modules = ["abipy.dfpt.ddb", "abipy.eph.sigeph", "abipy.abio.factories",
+                         "abipy.abio.abivars_db", "abipy.waves", "abipy.dynamics.hist"]
+
+        code = "import sys; import abipy.abilab; print(' '.join(m for m in %s if m in sys.modules))" % heavy_modules
+        assert run_python(code) == []
+
+        # Open a GSR file. Only the modules needed by GsrFile should be imported.
+        code = ("import sys; import abipy.abilab as abilab; abilab.abiopen(%r).close();"
+                "print(' '.join(m for m in %s if m in sys.modules))" % (abidata.ref_file("si_scf_GSR.nc"), heavy_modules))
+        assert run_python(code) == []
+
+        # Star imports export the lazy objects as well.
+        code = "from abipy.abilab import *; print(DdbFile.__name__, abiopen.__name__, SigEPhRobot.__name__)"
+        assert run_python(code) == ["DdbFile", "abiopen", "SigEPhRobot"]
+
+        # Importing abilab should not import pymatgen, pandas or matplotlib.
+        code = ("import sys; import abipy.abilab; print(' '.join(m for m in %s if m in sys.modules))" %
+                ["pymatgen", "pandas", "matplotlib", "abipy.flowtk", "abipy.core.structure"])
+        assert run_python(code) == []
+
+        # Report the import time of abilab (not checked since it depends on the machine).
+        if sys.version_info >= (3, 7):
+            out = subprocess.check_output([sys.executable, "-X", "importtime", "-c", "import abipy.abilab"],
+                                          stderr=subprocess.STDOUT).decode("utf-8")
+            # import time: self [us] | cumulative | imported package
+            times = {l.split("|")[2].strip(): int(l.split("|")[1]) for l in out.splitlines()
+                     if l.startswith("import time:") and l.split("|")[1].strip().isdigit()}
+            assert "abipy.abilab" in times
+            print("Import time of abipy.abilab: %.3f s (cumulative)" % (times["abipy.abilab"] * 1e-6))
+
+        # Objects are imported on first access and cached in the module namespace.
+        assert "DdbFile" in dir(abilab)
+        assert abilab.DdbFile is abilab.abifile_subclass_from_filename("out_DDB")
+        assert "DdbFile" in abilab.__dict__
+        from abipy.abilab import SigEPhFile
+        assert SigEPhFile is abilab.abifile_subclass_from_filename("out_SIGEPH.nc")
+        with self.assertRaises(AttributeError):
+            abilab.foobar
+
+        assert abilab.Robot.class_for_ext("DDB") is abilab.DdbRobot
+        assert "SIGEPH" in abilab.Robot.get_supported_extensions()
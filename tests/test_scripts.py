@@ -31,6 +31,98 @@ def test_if_all_scripts_are_tested():
     assert len(not_tested) == 0
 
 
+def get_imported_modules(script, *args):
+    """
+    Execute ``script`` with arguments ``args`` in a new interpreter.
+    Return the set with the names of the modules in sys.modules when the script exits.
+    """
+    import subprocess
+    import tempfile
+    fd, path = tempfile.mkstemp(text=True)
+    os.close(fd)
+    code = "\n".join([
+        "import sys, runpy",
+        "sys.argv = %r" % ([script] + list(args)),
+        "try:",
+        "    runpy.run_path(%r, run_name='__main__')" % script,
+        "except SystemExit:",
+        "    pass",
+        "with open(%r, 'wt') as fh: fh.write('\\n'.join(sys.modules))" % path,
+    ])
+    try:
+        with open(os.devnull, "wt") as devnull:
+            subprocess.check_call([sys.executable, "-c", code], stdout=devnull, stderr=devnull)
+        with open(path, "rt") as fh:
+            return set(fh.read().split())
+    finally:
+        os.remove(path)
+
+
+def get_import_times(script, *args):
+    """
+    Run ``script`` with ``python -X importtime`` (requires py >= 3.7).
+    Return dictionary mapping the name of the modules imported at the top level
+    (i.e. not by other modules) to the cumulative import time in seconds.
+    """
+    import subprocess
+    p = subprocess.Popen([sys.executable, "-X", "importtime", script] + list(args),
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, err = p.communicate()
+    times = {}
+    for line in err.decode("utf-8").splitlines():
+        # import time: self [us] | cumulative | imported package
+        # Modules imported by other modules are indented by two spaces per level.
+        if not line.startswith("import time:"): continue
+        tokens = line[len("import time:"):].split("|")
+        if len(tokens) != 3 or not tokens[1].strip().isdigit(): continue
+        if tokens[2].startswith("   "): continue
+        times[tokens[2].strip()] = float(tokens[1]) * 1e-6
+
+    return times
+
+
+class StartupImportsTest(AbipyTest):
+    """Test the modules imported by the scripts before parsing the command line."""
+
+    scripts = ["abiopen.py", "abistruct.py", "abicomp.py", "abiview.py"]
+
+    # Reference budget in seconds for the imports executed by `script --help`.
+    # The budgets are only reported since the import time depends on the machine.
+    budgets = {
+        "abiopen.py": 0.5,
+        "abistruct.py": 0.5,
+        "abicomp.py": 0.5,
+        "abiview.py": 0.5,
+    }
+
+    # These modules should be imported only by the subcommands that need them.
+    heavy_modules = ["pymatgen", "pandas", "matplotlib", "abipy.flowtk", "abipy.core.structure"]
+
+    def test_imported_modules(self):
+        """Testing modules imported by `script --help`"""
+        for script in self.scripts:
+            modules = get_imported_modules(os.path.join(script_dir, script), "--help")
+            assert "abipy" in modules
+            for mod in self.heavy_modules:
+                assert mod not in modules, "%s imports %s" % (script, mod)
+
+    def test_import_times(self):
+        """Reporting import time of `script --help` with -X importtime"""
+        if sys.version_info < (3, 7):
+            raise self.SkipTest("-X importtime requires py >= 3.7")
+
+        for script in self.scripts:
+            times = get_import_times(os.path.join(script_dir, script), "--help")
+            assert "abipy" in times
+            total = sum(times.values())
+            abipy_time = sum(t for mod, t in times.items() if mod == "abipy" or mod.startswith("abipy."))
+            print("%s: cumulative import time: %.3f s (abipy: %.3f s, budget: %.3f s)%s" % (
+                script, total, abipy_time, self.budgets[script],
+                "" if total <= self.budgets[script] else " OVER BUDGET"))
+            for mod, t in sorted(times.items(), key=lambda item: -item[1])[:5]:
+                print("    %s: %.3f s" % (mod, t))
+
+
 class ScriptTest(AbipyTest):
     loglevel = "--loglevel=ERROR"
     verbose = "-vv"